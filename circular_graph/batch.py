@@ -0,0 +1,246 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any, Literal
+import multiprocessing
+import os
+from circular_graph.layout import CompiledLayout
+from circular_graph.modular_graph import modular_graph
+
+# Per-process state of the workers, set once by init_worker
+WORKER_STATE = {}
+
+
+# * worker initializer
+def init_worker(
+    layout: CompiledLayout,
+    kind: str,
+    graph_options: dict,
+    job_options: dict | None = None,
+) -> None:
+    """Store the shared rendering inputs in the worker process.
+
+    Called once per worker process: with the 'fork' start method the layout
+    is inherited copy-on-write, otherwise it is unpickled once per worker
+    rather than once per job.
+
+    Args:
+        layout (CompiledLayout): Layout shared by every job.
+        kind (str): Visualization mode forwarded to modular_graph.
+        graph_options (dict): Extra keyword arguments forwarded to modular_graph.
+        job_options (dict | None, optional): Extra inputs of a custom job (see
+            render_many). Defaults to None.
+
+    Returns:
+        None
+    """
+    WORKER_STATE["layout"] = layout
+    WORKER_STATE["kind"] = kind
+    WORKER_STATE["graph_options"] = graph_options
+    WORKER_STATE["job_options"] = job_options or {}
+
+
+# * helper function to build a graph in a worker
+def build_graph(data: dict) -> modular_graph:
+    """Create the graph of one dataset against the layout of the worker.
+
+    Args:
+        data (dict): Data map of the graph (see modular_graph).
+
+    Returns:
+        modular_graph: Graph sharing the layout of the worker (not rendered yet).
+    """
+    layout = WORKER_STATE["layout"]
+    return modular_graph(
+        layout.graph_json,
+        data,
+        layout.piscines_list,
+        layout.checkpoints_list,
+        layout.mandatory_list,
+        kind=WORKER_STATE["kind"],
+        layout=layout,
+        **WORKER_STATE["graph_options"],
+    )
+
+
+# * worker job
+def render_job(key: Any, data: dict) -> tuple[Any, str]:
+    """Render one dataset against the layout of the worker.
+
+    Args:
+        key (Any): Identifier of the dataset, returned unchanged.
+        data (dict): Data map of the graph (see modular_graph).
+
+    Returns:
+        tuple[Any, str]: (key, svg_text)
+    """
+    return key, build_graph(data).graph_svg_text
+
+
+# * helper function to iterate over keyed datasets
+def iter_keyed_data(data_maps: Mapping | Iterable) -> Iterator[tuple[Any, dict]]:
+    """Yield (key, data) pairs from the supported data_maps shapes.
+
+    Args:
+        data_maps (Mapping | Iterable): {key: data}, an iterable of (key, data)
+            tuples, or an iterable of data maps (keyed by position).
+
+    Returns:
+        Iterator[tuple[Any, dict]]: (key, data) pairs.
+    """
+    if isinstance(data_maps, Mapping):
+        yield from data_maps.items()
+        return
+    for index, item in enumerate(data_maps):
+        if isinstance(item, tuple):
+            yield item
+        else:
+            yield index, item
+
+
+def render_many(
+    graph_json: str | CompiledLayout,
+    data_maps: Mapping | Iterable,
+    piscines_list: list[str] | None = None,
+    checkpoints_list: list[str] | None = None,
+    mandatory_list: list[str] | None = None,
+    kind: Literal["classic", "custom"] = "classic",
+    max_workers: int | None = None,
+    max_tasks_per_child: int | None = None,
+    max_pending: int | None = None,
+    ordered: bool = False,
+    job: Callable[[Any, dict], Any] = render_job,
+    job_options: dict | None = None,
+    **graph_options,
+) -> Iterator[tuple[Any, str]]:
+    """Render one module graph per dataset over a pool of processes.
+
+    The layout is compiled once and shipped to every worker when it starts, so
+    only the data maps travel with the jobs. Results are yielded as soon as
+    they are ready (completion order, not submission order), unless `ordered`.
+
+    Args:
+        graph_json (str | CompiledLayout): JSON string describing the graph layout,
+            or an already compiled layout (the lists are then taken from it).
+        data_maps (Mapping | Iterable): {key: data}, an iterable of (key, data)
+            tuples or an iterable of data maps (keys are then their positions).
+            Consumed lazily.
+        piscines_list (list[str] | None, optional): List of  "piscines".
+        checkpoints_list (list[str] | None, optional): List of checkpoints.
+        mandatory_list (list[str] | None, optional): List of mandatory projects.
+        kind (Literal['classic','custom'], optional): Visualization mode. Defaults to "classic".
+        max_workers (int | None, optional): Number of worker processes. Defaults to
+            the number of CPUs.
+        max_tasks_per_child (int | None, optional): Recycle the workers to bound
+            their memory: a new pool is started after every
+            `max_workers * max_tasks_per_child` jobs, so each worker runs that
+            many jobs on average. The full pool is not waited for: its workers
+            finish their queued jobs and exit while the new pool runs the next
+            ones, so the CPUs stay busy across the switch at the cost of up to
+            `2 * max_workers` processes (and their memory) until the old pool
+            has drained. With fork, the new workers are forked while the threads
+            of the draining pool are alive. Defaults to None (workers are never
+            replaced).
+        max_pending (int | None, optional): Maximum number of submitted jobs not yet
+            yielded, bounding the memory used by queued data and results.
+            Defaults to 4 jobs per worker.
+        ordered (bool, optional): Yield the results in input order. Results that
+            complete before an earlier one are held, within the `max_pending`
+            window. Defaults to False.
+        job (Callable[[Any, dict], Any], optional): Module-level function run in the
+            workers for each (key, data) pair, whose results are yielded instead of
+            (key, svg_text). It can use build_graph and the `job_options` stored in
+            WORKER_STATE. Defaults to render_job.
+        job_options (dict | None, optional): Extra inputs of `job`, sent once to
+            every worker. Defaults to None.
+        **graph_options: Extra keyword arguments for modular_graph (e.g. color_key,
+            event_mode, precision).
+
+    Raises:
+        ValueError: If the lists are missing while `graph_json` is a string, or if
+            max_workers or max_tasks_per_child is lower than 1.
+
+    Returns:
+        Iterator[tuple[Any, str]]: (key, svg_text) pairs in completion order (input
+        order if `ordered`).
+    """
+    if isinstance(graph_json, CompiledLayout):
+        layout = graph_json
+        graph_options.setdefault("precision", layout.precision)
+    else:
+        if piscines_list is None or checkpoints_list is None or mandatory_list is None:
+            raise ValueError(
+                "piscines_list, checkpoints_list and mandatory_list are required "
+                "when graph_json is not a CompiledLayout."
+            )
+        layout = CompiledLayout(
+            graph_json,
+            piscines_list,
+            checkpoints_list,
+            mandatory_list,
+            precision=graph_options.get("precision"),
+        )
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    if max_tasks_per_child is not None and max_tasks_per_child < 1:
+        raise ValueError("max_tasks_per_child must be at least 1.")
+    if max_pending is None:
+        max_pending = 4 * max_workers
+
+    # fork shares the layout copy-on-write. Workers are recycled by replacing
+    # the whole pool rather than with ProcessPoolExecutor(max_tasks_per_child=),
+    # which needs Python >= 3.11, cannot be combined with fork and can deadlock
+    # when a worker exits.
+    methods = multiprocessing.get_all_start_methods()
+    start_method = "fork" if "fork" in methods else "spawn"
+    pool_options = {
+        "max_workers": max_workers,
+        "mp_context": multiprocessing.get_context(start_method),
+        "initializer": init_worker,
+        "initargs": (layout, kind, graph_options, job_options),
+    }
+    jobs_per_pool = None
+    if max_tasks_per_child is not None:
+        jobs_per_pool = max_workers * max_tasks_per_child
+    # pools with running jobs: the current one and the previous one, draining
+    pools = deque()
+    # futures in submission order if ordered: the oldest is yielded first
+    pending = deque() if ordered else set()
+    submitted = 0
+    try:
+        for key, data in iter_keyed_data(data_maps):
+            # pools are started only if jobs remain
+            if not pools or submitted == jobs_per_pool:
+                if pools:
+                    # the full pool exits once its queued jobs are done, while
+                    # the next one already runs the following jobs
+                    pools[-1].shutdown(wait=False)
+                if len(pools) == 2:
+                    pools.popleft().shutdown()
+                pools.append(ProcessPoolExecutor(**pool_options))
+                submitted = 0
+            future = pools[-1].submit(job, key, data)
+            submitted += 1
+            if ordered:
+                pending.append(future)
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                continue
+            pending.add(future)
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            if ordered:
+                yield pending.popleft().result()
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for pool in pools:
+            pool.shutdown()
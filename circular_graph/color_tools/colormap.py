@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from .color_conversion import hex_to_rgb, is_valid_hex_color
+
+
+class Colormap:
+    def __init__(self, colors: list[str]):
+        """Build a colormap from evenly spaced gradient stops.
+
+        The stops are parsed once. Each mapping call then builds a lookup table
+        of the distinct ratios it is given, computes their colors in one
+        vectorized pass and indexes the table back, so the hex formatting runs
+        once per distinct color rather than once per value.
+
+        The colors are exactly those of interpolate_color (same arithmetic,
+        channels truncated): a fixed-size table would quantize the ratios and
+        shift some channels by one unit.
+
+        Args:
+            colors (list[str]): Two or more hex colors, from the 0% stop to the
+                100% stop (e.g. ['#FFD700', '#32CD32', '#1E90FF']).
+
+        Raises:
+            ValueError: If less than two colors are given or if a color is not a
+                valid hex color.
+        """
+        if len(colors) < 2:
+            raise ValueError("A colormap needs at least two colors.")
+        for color in colors:
+            if not is_valid_hex_color(color):
+                raise ValueError(
+                    f"Invalid color: {color}. Must be like #RRGGBB or #RGB."
+                )
+
+        self.colors = list(colors)
+        self.stops = np.array(
+            [
+                hex_to_rgb(
+                    color
+                    if len(color) == 7
+                    else "#" + "".join(c * 2 for c in color[1:])
+                )
+                for color in colors
+            ],
+            dtype=np.float64,
+        )
+        # Ratios where a segment ends (a ratio on a boundary belongs to the
+        # segment before it, like `ratio <= 0.5` in interpolate_color)
+        self.segments = len(colors) - 1
+        self.boundaries = np.arange(1, self.segments) / self.segments
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to normalize values
+    def ratios(
+        self,
+        values: np.ndarray | pd.Series | list,
+        max_value: int | float | np.ndarray,
+    ) -> np.ndarray:
+        """Return the positions of values on the gradient, normalized by max_value.
+
+        Values are clipped to [0, max_value]; missing values map to 0.
+
+        Args:
+            values (np.ndarray | pd.Series | list): Values to map.
+            max_value (int | float | np.ndarray): Value corresponding to the end of
+                the gradient, or one value per column of a 2D `values` array.
+
+        Returns:
+            np.ndarray: Ratios in [0, 1], same shape as values.
+        """
+        values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+        max_value = np.asarray(max_value, dtype=np.float64)
+        values = np.maximum(np.minimum(values, max_value), 0.0)
+        return np.divide(
+            values,
+            max_value,
+            out=np.zeros(np.broadcast(values, max_value).shape),
+            where=max_value != 0,
+        )
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to interpolate the stops
+    def ratio_packed_rgb(self, ratios: np.ndarray) -> np.ndarray:
+        """Map ratios to packed 0xRRGGBB integers.
+
+        Args:
+            ratios (np.ndarray): Ratios in [0, 1] (see ratios).
+
+        Returns:
+            np.ndarray: uint32 array, same shape as ratios.
+        """
+        ratios = np.asarray(ratios, dtype=np.float64)
+        segment = np.searchsorted(self.boundaries, ratios, side="left")
+        # Scale to 0-1 within the segment
+        local = (ratios - segment / self.segments) * self.segments
+        start = self.stops[segment]
+        end = self.stops[segment + 1]
+        # Truncate toward zero like int() in interpolate_color
+        rgb = (start + (end - start) * local[..., np.newaxis]).astype(np.int64)
+        return ((rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]).astype(
+            np.uint32
+        )
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * mapping function from ratios to hex colors
+    def ratio_hex(self, ratios: np.ndarray | list) -> np.ndarray:
+        """Map ratios to hex color strings through a table of their distinct values.
+
+        Args:
+            ratios (np.ndarray | list): Ratios in [0, 1] (see ratios).
+
+        Returns:
+            np.ndarray: Array of hex color strings ('#rrggbb'), same shape as ratios.
+        """
+        ratios = np.asarray(ratios, dtype=np.float64)
+        table, codes = np.unique(ratios, return_inverse=True)
+        table_hex = np.array(
+            [
+                "#{:06x}".format(packed)
+                for packed in self.ratio_packed_rgb(table).tolist()
+            ],
+            dtype=object,
+        )
+        return table_hex[codes.reshape(ratios.shape)]
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * mapping function to hex colors
+    def to_hex(
+        self,
+        values: np.ndarray | pd.Series | list,
+        max_value: int | float | np.ndarray,
+    ) -> np.ndarray:
+        """Map values to hex color strings in one vectorized call.
+
+        Args:
+            values (np.ndarray | pd.Series | list): Values to map.
+            max_value (int | float | np.ndarray): Value corresponding to the end of
+                the gradient, or one value per column of a 2D `values` array.
+
+        Returns:
+            np.ndarray: Array of hex color strings ('#rrggbb'), same shape as values.
+        """
+        return self.ratio_hex(self.ratios(values, max_value))
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * mapping function to packed RGB
+    def to_packed_rgb(
+        self,
+        values: np.ndarray | pd.Series | list,
+        max_value: int | float | np.ndarray,
+    ) -> np.ndarray:
+        """Map values to packed 0xRRGGBB integers in one vectorized call.
+
+        Args:
+            values (np.ndarray | pd.Series | list): Values to map.
+            max_value (int | float | np.ndarray): Value corresponding to the end of
+                the gradient, or one value per column of a 2D `values` array.
+
+        Returns:
+            np.ndarray: uint32 array, same shape as values.
+        """
+        return self.ratio_packed_rgb(self.ratios(values, max_value))
@@ -1,15 +1,77 @@
-from bs4 import BeautifulSoup as bs
+from functools import lru_cache
 from IPython.display import display
 from IPython.display import HTML
 from .color_conversion import is_valid_hex_color
 
+# Size of the legend (user units)
+LEGEND_WIDTH = 640
+LEGEND_HEIGHT = 140
 
-def create_gradient_html(
-    start_color_hex, mid_color_hex, end_color_hex, min_val, max_val
-):
+# Legend drawn with SVG primitives and system fonts only, so that it renders
+# without any network access. The ids are the ones updated client-side by
+# updateGradientLegend (see tools.renderer_utils), which looks them up within
+# the graph the legend belongs to.
+LEGEND_TEMPLATE = (
+    '<g id="gradient-legend" font-family="Inter, system-ui, sans-serif" fill="#6B7280">'
+    '<defs><linearGradient id="{gradient_id}" x1="0" y1="0" x2="1" y2="0">'
+    '<stop offset="0%" stop-color="{start_color}" />'
+    '<stop offset="50%" stop-color="{mid_color}" />'
+    '<stop offset="100%" stop-color="{end_color}" />'
+    "</linearGradient></defs>"
+    '<text x="320" y="28" text-anchor="middle" font-size="20" font-weight="600">Value scale</text>'
+    '<rect id="gradient-bar" x="8" y="44" width="624" height="44" rx="6" stroke="#9CA3AF" '
+    'fill="url(#{gradient_id})" data-min="{min_val}" data-max="{max_val}" />'
+    '<g font-size="14">'
+    '<circle id="start-swatch" cx="15" cy="105" r="7" stroke="#9CA3AF" fill="{start_color}" />'
+    '<text x="28" y="110" font-weight="500">Min</text>'
+    '<text id="start-value" x="8" y="132">{min_label}</text>'
+    '<circle id="mid-swatch" cx="284" cy="105" r="7" stroke="#9CA3AF" fill="{mid_color}" />'
+    '<text x="326" y="110" text-anchor="middle" font-weight="500">Middle</text>'
+    '<text id="mid-value" x="320" y="132" text-anchor="middle">{mid_label}</text>'
+    '<circle id="end-swatch" cx="625" cy="105" r="7" stroke="#9CA3AF" fill="{end_color}" />'
+    '<text x="612" y="110" text-anchor="end" font-weight="500">Max</text>'
+    '<text id="end-value" x="632" y="132" text-anchor="end">{max_label}</text>'
+    "</g></g>"
+)
+
+STANDALONE_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+    'width="100%" style="max-width: {width}px; display: block; margin: 0 auto;">'
+    "{legend}</svg>"
+)
+
+
+# * helper function to format a bound of the legend
+def format_bound(value: int | float) -> str:
+    """Format a value of the legend (no trailing '.0' for integers).
+
+    Args:
+        value (int | float): Value to format.
+
+    Returns:
+        str: The value with no decimals if integral, two decimals otherwise.
     """
-    Generates and optionally displays an HTML file displaying a color gradient
-    using BeautifulSoup. Accepts hex color codes. (Hover effect removed)
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.2f}"
+
+
+###############################################################################################
+###############################################################################################
+
+
+@lru_cache(maxsize=256)
+def gradient_legend_svg(
+    start_color_hex: str,
+    mid_color_hex: str,
+    end_color_hex: str,
+    min_val: int | float,
+    max_val: int | float,
+    standalone: bool = True,
+) -> str:
+    """Return the gradient legend as SVG markup.
+
+    The markup is filled from a string template and cached per colors and
+    bounds; it has no external dependency (no stylesheet, script or font to
+    fetch).
 
     Args:
         start_color_hex (str): Hex code for the start color (e.g., '#3B82F6').
@@ -17,13 +79,17 @@ def create_gradient_html(
         end_color_hex (str): Hex code for the end color (e.g., '#EF4444').
         min_val (float or int): The minimum value for the gradient scale.
         max_val (float or int): The maximum value for the gradient scale.
+        standalone (bool, optional): If True, return an `<svg>` document;
+            otherwise a `<g>` fragment of LEGEND_WIDTH x LEGEND_HEIGHT units
+            drawn at the origin, to embed in another SVG (e.g. inside a
+            `<g transform="translate(x, y)">`). Defaults to True.
 
     Raises:
         ValueError: If min_val is not less than max_val or if hex codes are invalid.
         TypeError: If min_val or max_val are not numbers.
 
     Returns:
-        None: Displays the generated HTML in a Jupyter Notebook.
+        str: SVG markup of the legend.
     """
     # --- Input Validation ---
     if not isinstance(min_val, (int, float)):
@@ -32,139 +98,65 @@ def create_gradient_html(
         raise TypeError("max_val must be a number.")
     if min_val > max_val:
         raise ValueError("min_val must be less than max_val.")
-    if not is_valid_hex_color(start_color_hex):
-        raise ValueError(
-            f"Invalid start_color_hex: {start_color_hex}. Must be like #RRGGBB or #RGB."
-        )
-    if not is_valid_hex_color(mid_color_hex):
-        raise ValueError(
-            f"Invalid mid_color_hex: {mid_color_hex}. Must be like #RRGGBB or #RGB."
-        )
-    if not is_valid_hex_color(end_color_hex):
-        raise ValueError(
-            f"Invalid end_color_hex: {end_color_hex}. Must be like #RRGGBB or #RGB."
-        )
+    for name, color in (
+        ("start_color_hex", start_color_hex),
+        ("mid_color_hex", mid_color_hex),
+        ("end_color_hex", end_color_hex),
+    ):
+        if not is_valid_hex_color(color):
+            raise ValueError(f"Invalid {name}: {color}. Must be like #RRGGBB or #RGB.")
+
+    legend = LEGEND_TEMPLATE.format(
+        # one id per palette, so that legends of different palettes can share a page
+        gradient_id="legend_gradient_"
+        + "".join(
+            color.lstrip("#")
+            for color in (start_color_hex, mid_color_hex, end_color_hex)
+        ),
+        start_color=start_color_hex,
+        mid_color=mid_color_hex,
+        end_color=end_color_hex,
+        min_val=min_val,
+        max_val=max_val,
+        min_label=format_bound(min_val),
+        mid_label=format_bound((min_val + max_val) / 2),
+        max_label=format_bound(max_val),
+    )
+    if not standalone:
+        return legend
+    return STANDALONE_TEMPLATE.format(
+        width=LEGEND_WIDTH, height=LEGEND_HEIGHT, legend=legend
+    )
+
 
-    # Calculate middle value
-    mid_val = (min_val + max_val) / 2
-    # Format values nicely (remove trailing .0 if integer)
-    min_val_str = f"{min_val:.0f}" if float(min_val).is_integer() else f"{min_val:.2f}"
-    mid_val_str = f"{mid_val:.0f}" if float(mid_val).is_integer() else f"{mid_val:.2f}"
-    max_val_str = f"{max_val:.0f}" if float(max_val).is_integer() else f"{max_val:.2f}"
-
-    # --- Base HTML Structure ---
-    # Removed tooltip CSS, tooltip div, relative wrapper, data attributes, and script block
-    base_html = """
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Color Gradient</title>
-        <script src="https://cdn.tailwindcss.com"></script>
-        <link rel="preconnect" href="https://fonts.googleapis.com">
-        <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-        <style>
-            body {{ font-family: 'Inter', sans-serif; }}
-            /* Style for the tooltip */
-            #gradient-tooltip {{
-                position: absolute;
-                display: none; /* Hidden by default */
-                padding: 4px 8px;
-                background-color: rgba(0, 0, 0, 0.7);
-                color: white;
-                border-radius: 4px;
-                font-size: 0.8rem;
-                white-space: nowrap;
-                z-index: 10;
-                pointer-events: none; /* Prevent tooltip from interfering with mouse events */
-                transform: translate(-50%, -120%); /* Position above and centered on cursor */
-            }}
-        </style>
-    </head>
-    <body class="bg-gray-100 dark:bg-gray-900 min-h-screen flex items-center justify-center p-4">
-        <div class="p-6 sm:p-8 rounded-lg w-full max-w-2xl">
-            <h1 class="text-xl sm:text-2xl font-semibold text-gray-800 dark:text-white mb-6 text-center">Value scale</h1>
-            <div class="relative mb-2">
-                <div id="gradient-bar"
-                    class="h-10 sm:h-12 w-full rounded-md border border-gray-300 dark:border-gray-700 cursor-crosshair"
-                    data-min="{min_val}"
-                    data-max="{max_val}">
-                </div>
-                <div id="gradient-tooltip"></div>
-            </div>
-            <div class="flex justify-between text-xs sm:text-sm text-gray-600 dark:text-gray-300 px-1">
-                <div class="text-left">
-                    <span class="font-medium">Min</span>
-                    <div id="start-value"></div>
-                    <div id="start-swatch" class="w-4 h-4 rounded-full inline-block border border-gray-400 dark:border-gray-600 align-middle ml-1"></div>
-                </div>
-                <div class="text-center">
-                    <span class="font-medium">Middle</span>
-                    <div id="mid-value"></div>
-                    <div id="mid-swatch" class="w-4 h-4 rounded-full inline-block border border-gray-400 dark:border-gray-600 align-middle ml-1"></div>
-                </div>
-                <div class="text-right">
-                    <span class="font-medium">Max</span>
-                    <div id="end-value"></div>
-                    <div id="end-swatch" class="w-4 h-4 rounded-full inline-block border border-gray-400 dark:border-gray-600 align-middle ml-1"></div>
-                </div>
-            </div>
-        </div>
-        <script>
-            const gradientBar = document.getElementById('gradient-bar');
-            const tooltip = document.getElementById('gradient-tooltip');
-        </script>
-    </body>
-    </html>
-"""
-
-    # --- Parse and Modify HTML with BeautifulSoup ---
-    soup = bs(base_html, "html.parser")
-
-    # Update Title
-    if soup.title:
-        # Updated title to reflect non-interactive nature
-        soup.title.string = f"Color Gradient: {min_val_str} to {max_val_str}"
-
-    # Update Gradient Bar - Apply inline style for gradient
-    gradient_bar = soup.find(id="gradient-bar")
-    if gradient_bar:
-        gradient_style = f"background: linear-gradient(to right, {start_color_hex}, {mid_color_hex}, {end_color_hex});"
-        existing_style = gradient_bar.get("style", "")
-        gradient_bar["style"] = (
-            f"{existing_style}{';' if existing_style else ''}{gradient_style}"
+###############################################################################################
+###############################################################################################
+
+
+def create_gradient_html(
+    start_color_hex, mid_color_hex, end_color_hex, min_val, max_val
+):
+    """
+    Displays the gradient legend (see gradient_legend_svg) in a Jupyter Notebook.
+
+    Args:
+        start_color_hex (str): Hex code for the start color (e.g., '#3B82F6').
+        mid_color_hex (str): Hex code for the middle color (e.g., '#A855F7').
+        end_color_hex (str): Hex code for the end color (e.g., '#EF4444').
+        min_val (float or int): The minimum value for the gradient scale.
+        max_val (float or int): The maximum value for the gradient scale.
+
+    Raises:
+        ValueError: If min_val is not less than max_val or if hex codes are invalid.
+        TypeError: If min_val or max_val are not numbers.
+
+    Returns:
+        None: Displays the generated SVG in a Jupyter Notebook.
+    """
+    display(
+        HTML(
+            gradient_legend_svg(
+                start_color_hex, mid_color_hex, end_color_hex, min_val, max_val
+            )
         )
-        # Remove cursor-crosshair if present (though removed from base_html already)
-        existing_classes = gradient_bar.get("class", [])
-        if "cursor-crosshair" in existing_classes:
-            existing_classes.remove("cursor-crosshair")
-        gradient_bar["class"] = existing_classes
-
-    # Update Values
-    start_val_div = soup.find(id="start-value")
-    if start_val_div:
-        start_val_div.string = min_val_str
-    mid_val_div = soup.find(id="mid-value")
-    if mid_val_div:
-        mid_val_div.string = mid_val_str
-    end_val_div = soup.find(id="end-value")
-    if end_val_div:
-        end_val_div.string = max_val_str
-
-    # Update Color Swatches - Apply inline style for background color
-    start_swatch = soup.find(id="start-swatch")
-    if start_swatch:
-        start_swatch["style"] = f"background-color: {start_color_hex};"
-
-    mid_swatch = soup.find(id="mid-swatch")
-    if mid_swatch:
-        mid_swatch["style"] = f"background-color: {mid_color_hex};"
-
-    end_swatch = soup.find(id="end-swatch")
-    if end_swatch:
-        end_swatch["style"] = f"background-color: {end_color_hex};"
-
-    # Get the modified HTML as a string
-    final_html = soup.prettify()
-    display(HTML(final_html))
+    )
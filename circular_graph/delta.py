@@ -0,0 +1,61 @@
+from circular_graph.modular_graph import modular_graph
+from circular_graph.tools.json_values import to_native
+
+
+def diff(previous_graph: modular_graph, new_graph: modular_graph) -> dict:
+    """Compute the patch turning the rendering of a graph into another one.
+
+    Only the bound data and colors are compared: no XML is built or parsed.
+    The patch is applied client-side by the `applyGraphDelta(root, delta)`
+    function returned by `circular_graph.tools.renderer_utils.delta_applier_script`.
+
+    Args:
+        previous_graph (modular_graph): Graph currently displayed.
+        new_graph (modular_graph): Graph to display, built from the same graph_json,
+            lists and options.
+
+    Raises:
+        ValueError: If the graphs do not share the same skeleton (graph_json,
+            lists, precision, kind, keys or tooltip_mode differ).
+
+    Returns:
+        dict: JSON-serializable patch keyed by node id:
+            - 'layout': fingerprint of the skeleton (see modular_graph.layout_fingerprint)
+            - 'fills': {node id: new fill color}
+            - 'tooltips': {node id: new tooltip}, as written in the document
+              (data values with native types for the data island, see
+              modular_graph.tooltip_value)
+            - 'legend': {'min', 'max', 'colors'}, only if the legend changed
+    """
+    layout = new_graph.layout_fingerprint()
+    if previous_graph.layout_fingerprint() != layout:
+        raise ValueError(
+            "Graphs must be built from the same graph_json, lists and options to be compared."
+        )
+
+    previous_bindings = previous_graph.bind_data(with_tooltips=False)
+    new_bindings = new_graph.bind_data(with_tooltips=False)
+    default = {} if new_graph.kind == "custom" else 0
+    fills = {}
+    tooltips = {}
+    for node, previous, new in zip(
+        new_graph.layout.nodes, previous_bindings, new_bindings
+    ):
+        name = node["name"]
+        if new["fill"] != previous["fill"]:
+            fills[name] = new["fill"]
+        value = new_graph.data.get(name, default)
+        if value != previous_graph.data.get(name, default):
+            tooltips[name] = new_graph.tooltip_value(value)
+
+    delta = {"layout": layout, "fills": fills, "tooltips": tooltips}
+    if (
+        new_graph.max_value != previous_graph.max_value
+        or new_graph.gradient_colors != previous_graph.gradient_colors
+    ):
+        delta["legend"] = {
+            "min": 0,
+            "max": to_native(new_graph.max_value),
+            "colors": list(new_graph.gradient_colors),
+        }
+    return delta
@@ -0,0 +1,363 @@
+from xml.etree import ElementTree as ET2
+from collections.abc import Iterable, Mapping
+from typing import Literal
+import re
+from circular_graph.batch import iter_keyed_data
+from circular_graph.layout import CompiledLayout
+from circular_graph.modular_graph import modular_graph
+from circular_graph.tools.renderer_utils import grid_info_card_script
+from circular_graph.tools.svg_writer import SVGTreeBuilder, SVG_NS, XLINK_NS
+
+# id of the grid root, listened to by the info-card script
+GRID_ID = "graph_grid"
+
+SVG = f"{{{SVG_NS}}}"
+XLINK_HREF = f"{{{XLINK_NS}}}href"
+URL_REFERENCE = re.compile(r"url\(#([^)]+)\)")
+# per-node handlers, replaced by the listeners of the grid
+HANDLER_ATTRIBUTES = ("onpointerenter", "onpointerleave")
+
+
+# * helper function to move the shared parts of a panel to the grid
+def extract_shared(root, defs, shared_ids, gradients, styles):
+    """Remove the parts of a rendered panel shared by the whole grid.
+
+    Icon symbols and filters are kept once in the grid <defs>; piscine
+    gradients are deduplicated by their stops; <style> blocks are deduplicated
+    and scoped to a class of the panels using them. Titles, scripts and the
+    info card are dropped (the grid has its own).
+
+    Args:
+        root (Element): <svg> root of the panel.
+        defs (Element): <defs> of the grid.
+        shared_ids (set): Ids of the symbols and filters already in `defs`.
+        gradients (dict): Stops of the shared gradients -> gradient id.
+        styles (dict): CSS of the panels (scoped to `#canevas`) -> class name.
+
+    Returns:
+        tuple[dict, str | None, Element | None]: The panel gradient ids mapped to
+        the shared ones, the style class of the panel and its info card.
+    """
+    gradient_ids = {}
+    style_class = None
+    info_card = None
+    for child in list(root):
+        if child.tag == f"{SVG}defs":
+            for item in child:
+                if item.tag == f"{SVG}radialGradient":
+                    stops = tuple(tuple(sorted(stop.attrib.items())) for stop in item)
+                    shared_id = gradients.get(stops)
+                    if shared_id is None:
+                        shared_id = f"piscine_gradient_{len(gradients)}"
+                        gradients[stops] = shared_id
+                        defs.append(item)
+                    gradient_ids[item.get("id")] = shared_id
+                    item.set("id", shared_id)
+                elif item.get("id") not in shared_ids:
+                    shared_ids.add(item.get("id"))
+                    defs.append(item)
+        elif child.tag == f"{SVG}style":
+            style_class = styles.setdefault(child.text, f"graph_style_{len(styles)}")
+        elif child.tag == f"{SVG}g" and child.get("id") == "info_card":
+            info_card = child
+        elif child.tag not in (f"{SVG}title", f"{SVG}script"):
+            continue
+        root.remove(child)
+    return gradient_ids, style_class, info_card
+
+
+###############################################################################################
+###############################################################################################
+
+
+# * helper function to separate the nodes of a panel from its static elements
+def split_nodes(element, names, nodes):
+    """Move the content groups out of the static elements of a panel.
+
+    The static groups holding the contents carry no transform, so the contents
+    keep their position once drawn after the static elements.
+
+    Args:
+        element (Element): Element to strip of its content groups.
+        names (set): Ids of the content groups (content names).
+        nodes (list): Receives the removed content groups, in document order.
+
+    Returns:
+        None
+    """
+    for child in list(element):
+        if child.tag == f"{SVG}g" and child.get("id") in names:
+            element.remove(child)
+            nodes.append(child)
+        else:
+            split_nodes(child, names, nodes)
+
+
+###############################################################################################
+###############################################################################################
+
+
+# * helper function to namespace the ids of a panel
+def namespace_ids(root, prefix, gradient_ids, shared_ids):
+    """Prefix the ids of a panel and the references to them.
+
+    References to the shared symbols, filters and gradients point to the grid
+    <defs>; the per-node handlers are dropped.
+
+    Args:
+        root (Element): <svg> root of the panel, shared parts removed.
+        prefix (str): Prefix of the ids of the panel.
+        gradient_ids (dict): Panel gradient ids -> shared gradient ids.
+        shared_ids (set): Ids of the symbols and filters of the grid.
+
+    Returns:
+        None
+    """
+
+    def resolve(element_id):
+        if element_id in gradient_ids:
+            return gradient_ids[element_id]
+        return element_id if element_id in shared_ids else prefix + element_id
+
+    for element in root.iter():
+        for name in HANDLER_ATTRIBUTES:
+            element.attrib.pop(name, None)
+        for name, value in list(element.attrib.items()):
+            if name == "id":
+                element.set(name, prefix + value)
+            elif name == XLINK_HREF and value.startswith("#"):
+                element.set(name, "#" + resolve(value[1:]))
+            elif "url(#" in value:
+                element.set(
+                    name,
+                    URL_REFERENCE.sub(lambda m: f"url(#{resolve(m.group(1))})", value),
+                )
+
+
+###############################################################################################
+###############################################################################################
+
+
+def compose_grid(
+    graphs: Mapping[str, modular_graph] | Iterable[modular_graph],
+    columns: int = 3,
+    gap: int = 100,
+    title_size: int = 60,
+) -> str:
+    """Compose several graphs into a single SVG document (small multiples).
+
+    Each graph becomes a nested <svg> panel whose ids are prefixed with
+    `panel<n>-`. Icon symbols, filters, piscine gradients and <style> blocks are
+    emitted once for the whole grid, and a single info card is moved to the
+    hovered panel by one grid-level script. The static elements (arcs, lines,
+    labels...) are emitted once per distinct layout and referenced by the
+    panels with <use>, the contents being drawn above them. Panels sharing a
+    CompiledLayout (see grid_from_data) share all the geometry computations.
+
+    Args:
+        graphs (Mapping[str, modular_graph] | Iterable[modular_graph]): Graphs to
+            compose, keyed by the title displayed above their panel (no titles for
+            an iterable).
+        columns (int, optional): Number of panels per row. Defaults to 3.
+        gap (int, optional): Space between panels, in SVG units. Defaults to 100.
+        title_size (int, optional): Font size of the panel titles. Defaults to 60.
+
+    Raises:
+        ValueError: If columns is lower than 1, if the graphs do not share the same
+            kind (and keys for custom graphs), or if a graph uses
+            tooltip_mode='island', metrics or snapshots.
+
+    Returns:
+        str: SVG document (empty string if every graph is empty).
+    """
+    if columns < 1:
+        raise ValueError("columns must be at least 1.")
+    if isinstance(graphs, Mapping):
+        panels = [(str(title), graph) for title, graph in graphs.items()]
+    else:
+        panels = [(None, graph) for graph in graphs]
+    panels = [(title, graph) for title, graph in panels if graph.layout.graph]
+    if not panels:
+        return ""
+    first = panels[0][1]
+    for _, graph in panels:
+        if graph.kind != first.kind or graph.keys != first.keys:
+            raise ValueError(
+                "The graphs of a grid must share the same kind and data keys."
+            )
+        if graph.tooltip_mode == "island" or graph.marks_nodes():
+            raise ValueError(
+                "The graphs of a grid cannot use tooltip_mode='island', metrics "
+                "or snapshots."
+            )
+
+    cell = max(graph.layout.svg_size for _, graph in panels)
+    title_height = 2 * title_size if any(title for title, _ in panels) else 0
+    rows = -(-len(panels) // columns)
+    width = min(columns, len(panels)) * (cell + gap) - gap
+    height = rows * (cell + title_height + gap) - gap
+
+    grid = ET2.Element(
+        f"{SVG}svg",
+        {
+            "style": "display: block; margin: 0 auto; ",
+            "viewBox": f"0 0 {width} {height}",
+            "id": GRID_ID,
+            "fill": "none",
+        },
+    )
+    ET2.SubElement(grid, f"{SVG}title").text = "Module graphs"
+    style = ET2.SubElement(grid, f"{SVG}style")
+    defs = ET2.SubElement(grid, f"{SVG}defs")
+    shared_ids = set()
+    gradients = {}
+    styles = {}
+    statics = {}
+    info_card = None
+    first_panel = None
+
+    for index, (title, graph) in enumerate(panels):
+        builder = SVGTreeBuilder()
+        graph.write_document(builder)
+        root = builder.close()
+        gradient_ids, style_class, card = extract_shared(
+            root, defs, shared_ids, gradients, styles
+        )
+        if info_card is None:
+            info_card = card
+        prefix = f"panel{index}-"
+        root.set("id", prefix + root.get("id"))
+
+        # static elements, shared by the panels of the same layout and styles
+        nodes = []
+        split_nodes(root, set(graph.layout.node_indices), nodes)
+        key = (
+            "".join(ET2.tostring(child, encoding="unicode") for child in root),
+            style_class,
+        )
+        static_id = statics.get(key)
+        if static_id is None:
+            static_id = f"static_layout_{len(statics)}"
+            statics[key] = static_id
+            static = ET2.SubElement(defs, f"{SVG}g", {"id": static_id})
+            if style_class is not None:
+                static.set("class", style_class)
+            static.extend(root)
+            namespace_ids(static, f"{static_id}-", gradient_ids, shared_ids)
+            static.set("id", static_id)
+        for child in list(root):
+            root.remove(child)
+        ET2.SubElement(root, f"{SVG}use", {XLINK_HREF: f"#{static_id}"})
+        for node in nodes:
+            namespace_ids(node, prefix, gradient_ids, shared_ids)
+            root.append(node)
+
+        x = (index % columns) * (cell + gap)
+        y = (index // columns) * (cell + title_height + gap)
+        if title:
+            ET2.SubElement(
+                grid,
+                f"{SVG}text",
+                {
+                    "x": str(x + cell / 2),
+                    "y": str(y + title_size),
+                    "text-anchor": "middle",
+                    "font-family": "Inter",
+                    "font-size": str(title_size),
+                    "fill": "grey",
+                },
+            ).text = title
+        del root.attrib["style"]
+        root.set("x", str(x))
+        root.set("y", str(y + title_height))
+        root.set("width", str(cell))
+        root.set("height", str(cell))
+        if style_class is not None:
+            root.set("class", style_class)
+        grid.append(root)
+        if first_panel is None:
+            first_panel = root
+
+    # panel styles, scoped to the class of the panels using them
+    if styles:
+        style.text = "\n".join(
+            css.replace("#canevas", f"#{GRID_ID} .{class_name}")
+            for css, class_name in styles.items()
+        )
+    else:
+        grid.remove(style)
+    first_panel.append(info_card)
+    ET2.SubElement(grid, f"{SVG}script", {"type": "text/javascript"}).text = (
+        grid_info_card_script(first.kind, first.keys, GRID_ID)
+    )
+    return ET2.tostring(grid, encoding="unicode")
+
+
+###############################################################################################
+###############################################################################################
+
+
+def grid_from_data(
+    graph_json: str | CompiledLayout,
+    data_maps: Mapping | Iterable,
+    piscines_list: list[str] | None = None,
+    checkpoints_list: list[str] | None = None,
+    mandatory_list: list[str] | None = None,
+    kind: Literal["classic", "custom"] = "classic",
+    columns: int = 3,
+    **graph_options,
+) -> str:
+    """Compose one panel per dataset of the same graph into a single SVG document.
+
+    The layout is compiled once and shared by every panel (see compose_grid).
+
+    Args:
+        graph_json (str | CompiledLayout): JSON string describing the graph layout,
+            or an already compiled layout (the lists are then taken from it).
+        data_maps (Mapping | Iterable): {title: data}, an iterable of (title, data)
+            tuples or an iterable of data maps (titles are then their positions).
+        piscines_list (list[str] | None, optional): List of  "piscines".
+        checkpoints_list (list[str] | None, optional): List of checkpoints.
+        mandatory_list (list[str] | None, optional): List of mandatory projects.
+        kind (Literal['classic','custom'], optional): Visualization mode. Defaults to "classic".
+        columns (int, optional): Number of panels per row. Defaults to 3.
+        **graph_options: Extra keyword arguments for modular_graph (e.g. color_key,
+            css_classes, precision).
+
+    Raises:
+        ValueError: If the lists are missing while `graph_json` is a string, or if
+            the panels cannot be composed (see compose_grid).
+
+    Returns:
+        str: SVG document.
+    """
+    if isinstance(graph_json, CompiledLayout):
+        layout = graph_json
+        graph_options.setdefault("precision", layout.precision)
+    else:
+        if piscines_list is None or checkpoints_list is None or mandatory_list is None:
+            raise ValueError(
+                "piscines_list, checkpoints_list and mandatory_list are required "
+                "when graph_json is not a CompiledLayout."
+            )
+        layout = CompiledLayout(
+            graph_json,
+            piscines_list,
+            checkpoints_list,
+            mandatory_list,
+            precision=graph_options.get("precision"),
+        )
+    graphs = {
+        title: modular_graph(
+            layout.graph_json,
+            data,
+            layout.piscines_list,
+            layout.checkpoints_list,
+            layout.mandatory_list,
+            kind=kind,
+            layout=layout,
+            **graph_options,
+        )
+        for title, data in iter_keyed_data(data_maps)
+    }
+    return compose_grid(graphs, columns=columns)
@@ -0,0 +1,1517 @@
+import math
+import json
+import numpy as np
+
+# __________________________________________________________________________________#
+# |                                                                                  |#
+# |                                 Layout constants                                 |#
+# |__________________________________________________________________________________|#
+
+# Colors are given as keys of the modular_graph palette (modular_graph.COLORS) and
+# resolved when the layout is rendered.
+
+# line contstant
+LINE_CONSTANTS = {
+    "startOffset": 70,
+    "startRadius": 220,
+    "endRadius": 575,
+}
+
+# slices constants
+SLICE_GAP = 20
+SLICE_CONSTANTS = {
+    "textCircle": {
+        "radius": 210,
+        "gap": SLICE_GAP,
+        "nameColor": "teal",
+        "nameFontSize": 50,
+    },
+    "centralPointCircle": {"angle": 0, "radius": 0, "contentRadius": 8},
+    "entryPointCircle": {
+        "radius": 100,
+        "gap": SLICE_GAP,
+        "contentRadius": 8,
+        "contentNameOffset": 35,
+    },
+    "innerCircle": {
+        "radius": 360,
+        "gap": SLICE_GAP,
+        "contentRadius": 10,
+        "nameFont": "IBM Plex Mono",
+        "nameFontSize": 21,
+        "nameColor": "neutral",
+        "nameRadiusOffset": 65,
+        "contentNameOffset": 40,
+        "subContentRadius": 3.25,
+        "subContentGap": 2.75,
+        "subContentRadiusOffset": 75,
+    },
+    "outerCircle": {"radius": 570, "gap": 12, "contentRadius": 5},
+    "outerArc": {
+        "radius": 570,
+        "gap": 10,
+        "contentRadius": 5,
+        "nameFont": "IBM Plex Mono",
+        "nameFontSize": 21,
+        "nameColor": "neutral",
+        "nameRadiusOffset": 65,
+    },
+}
+
+# circles constants
+MIDDLE_CIRCLE_CONSTANTS = {
+    "radius": 815,
+    "gap": 8,
+    "contentRadius": 5,
+    "nameRadiusOffset": 115,
+    "nameColor": "neutral",
+    "nameFontSize": 50,
+}
+
+OUTER_CIRCLE_CONSTANTS = {
+    "radius": 1075,
+    "gap": 12,
+    "contentRadius": 5,
+    "nameRadiusOffset": 115,
+    "nameColor": "neutral",
+    "nameFontSize": 50,
+}
+
+# content constants
+PISCINE_CONSTANTS = {"nameOffset": 50, "radius": 35}
+STAR_CONSTANTS = {"width": 24, "subContentWidth": 18}
+CHECKPOINT_CONSTANTS = {"width": 22, "subContentWidth": 16}
+# content labels (12px uppercase monospace), used to find overlapping labels
+LABEL_CONSTANTS = {"charWidth": 7.5, "lineHeight": 15}
+
+# Icon shapes, defined once as <symbol> and placed with <use>
+STAR_SYMBOL_ID = "star_icon"
+STAR_PATH = "M65 11l18 35 39 6-28 28 6 39-35-18-35 18 6-39L8 52l39-6 18-35z"
+CHECKPOINT_SYMBOL_ID = "checkpoint_icon"
+CHECKPOINT_PATH = "M0 22V0h1.645v1.427C3.29.468 6.129-.256 9.355 1.45c3.187 1.686 6.174.687 7.198.037L18 .569v11.178l-.418.255c-1.451.884-5.19 2.036-9.129.035-3.134-1.593-5.677-.338-6.497.398l-.311.278V22H0ZM6.408 9.605V6.826c-2.247-.354-3.982.556-4.666 1.17l-.097-.094v2.61a7.78 7.78 0 0 1 4.763-.907Zm4.884-1.138a9.66 9.66 0 0 0 4.857-.36v2.674c-.99.454-2.794.908-4.857.449V8.467Zm0-1.175a8.57 8.57 0 0 1-2.1-.747 8.595 8.595 0 0 0-2.784-.882V2.236c.638.11 1.32.334 2.032.71a9.9 9.9 0 0 0 2.852.998v3.348Z"
+
+# Rings and roles of the nodes, in the order of their codes (see index_nodes)
+LAYOUT_RINGS = ("central-point", "inner-circle", "middle-circle", "outer-circle")
+NODE_ROLES = ("project", "piscine", "checkpoint", "mandatory", "sub-content")
+
+# Names of the constant groups a layout can be compiled with
+LAYOUT_CONSTANT_NAMES = (
+    "LINE_CONSTANTS",
+    "SLICE_CONSTANTS",
+    "MIDDLE_CIRCLE_CONSTANTS",
+    "OUTER_CIRCLE_CONSTANTS",
+    "PISCINE_CONSTANTS",
+    "STAR_CONSTANTS",
+    "CHECKPOINT_CONSTANTS",
+)
+
+
+# *#########################################################################* #
+# ************************** Geometry Functions ***************************** #
+# *#########################################################################* #
+
+
+# * helper function to convert polar to cartesian cords
+def polar_to_cartesian(center_x, center_y, radius, angle_in_degrees):
+    """Convert polar coordinates to Cartesian coordinates.
+
+    Args:
+        center_x (float): X coordinate of the circle center.
+        center_y (float): Y coordinate of the circle center.
+        radius (float): Radius from the center to the point.
+        angle_in_degrees (float): Angle in degrees measured from the positive x-axis.
+
+    Returns:
+        dict: Dictionary with keys:
+            x (float): X coordinate of the point.
+            y (float): Y coordinate of the point.
+            angle (float): The input angle in degrees.
+    """
+    angle_in_radians = (angle_in_degrees - 90) * math.pi / 180.0
+    return {
+        "x": center_x + (radius * math.cos(angle_in_radians)),
+        "y": center_y + (radius * math.sin(angle_in_radians)),
+        "angle": angle_in_degrees,
+    }
+
+
+# * helper function to convert arrays of polar cords
+def polar_to_cartesian_array(center_x, center_y, radii, angles_in_degrees):
+    """Convert arrays of polar coordinates to Cartesian coordinates in one call.
+
+    Vectorized polar_to_cartesian (same operations, same results).
+
+    Args:
+        center_x (float): X coordinate of the circle center.
+        center_y (float): Y coordinate of the circle center.
+        radii (array-like): Radii from the center to the points.
+        angles_in_degrees (array-like): Angles in degrees measured from the positive x-axis.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: X and Y coordinates of the points.
+    """
+    angles_in_radians = (
+        (np.asarray(angles_in_degrees, dtype=float) - 90) * math.pi / 180.0
+    )
+    radii = np.asarray(radii, dtype=float)
+    return (
+        center_x + radii * np.cos(angles_in_radians),
+        center_y + radii * np.sin(angles_in_radians),
+    )
+
+
+# * helper function to distribute contents along an arc
+def arc_content_angles(arc_coords, count):
+    """Return the angles of the contents distributed along an arc.
+
+    A single content sits at the middle of the arc; otherwise contents are
+    evenly spaced from the start of the arc to its end (around the whole
+    circle for a full circle).
+
+    Args:
+        arc_coords (dict): Arc as returned by get_arc_coords.
+        count (int): Number of contents.
+
+    Returns:
+        np.ndarray: Angle (degrees) of each content.
+    """
+    if count == 1:
+        return np.array([arc_coords["middle"]["angle"]], dtype=float)
+
+    chunk_divider = count - (0 if arc_coords["fullCircle"] else 1)
+    if chunk_divider <= 0:
+        chunk_divider = 1  # Avoid division by zero for single items
+
+    # Ensure angles are within a consistent range (e.g. 0-360 or -180 to 180) for proper calculation
+    start_angle_norm = arc_coords["start"]["angle"] % 360
+    end_angle_norm = arc_coords["end"]["angle"] % 360
+    if (
+        end_angle_norm < start_angle_norm and not arc_coords["fullCircle"]
+    ):  # handles wrap around 360
+        # this happens if arc crosses the 0/360 degree line
+        if (
+            abs(end_angle_norm - start_angle_norm) > 180
+        ):  # Large arc likely means it crossed 0
+            end_angle_norm += 360
+
+    arc_angle_length = end_angle_norm - start_angle_norm
+    if arc_coords["fullCircle"]:
+        arc_angle_length = 360
+
+    chunk_angle = arc_angle_length / chunk_divider
+    return start_angle_norm + chunk_angle * np.arange(count)
+
+
+# * helper function to distribute contents along a radial line
+def line_content_radii(count, start_radius, end_radius, start_offset):
+    """Return the radii of the contents distributed along a radial line.
+
+    A single content sits at the end of the line; otherwise contents are
+    evenly spaced from `start_radius + start_offset` to `end_radius`.
+
+    Args:
+        count (int): Number of contents.
+        start_radius (float): Radius of the start of the line.
+        end_radius (float): Radius of the end of the line.
+        start_offset (float): Space left at the start of the line (title).
+
+    Returns:
+        np.ndarray: Radius of each content.
+    """
+    if count == 1:
+        return np.array([end_radius], dtype=float)
+    chunk_length = (end_radius - start_radius - start_offset) / (count - 1)
+    return start_radius + start_offset + chunk_length * np.arange(count)
+
+
+# * helper function to distribute sub-contents around their parent
+def sub_content_angles(parent_angle, count, gap):
+    """Return the angles of the sub-contents of a content.
+
+    Sub-contents are spaced by `gap` degrees, centered on the parent angle.
+
+    Args:
+        parent_angle (float): Angle (degrees) of the parent content.
+        count (int): Number of sub-contents.
+        gap (float): Angular gap between sub-contents (degrees).
+
+    Returns:
+        np.ndarray: Angle (degrees) of each sub-content.
+    """
+    total_gap_offset = (count - (count % 2)) * gap
+    return parent_angle + (gap * np.arange(count) - total_gap_offset / 2)
+
+
+# * helper function to allocate the angles of a whole ring
+def allocate_ring_angles(arcs_types, gap, ref_arc, rotate):
+    """Compute start, end and mid angles of every arc of a ring in one pass.
+
+    The available angular span of the reference arc is distributed across the
+    entries marked as 'slice' (non-zero length) while 'line' entries are
+    treated as zero-length; start angles are a running (prefix) sum of the
+    preceding lengths and gaps.
+
+    Args:
+        arcs_types (list[str]): Sequence of 'slice'|'line' describing arc types.
+        gap (float): Angular gap (degrees) to apply between adjacent arcs.
+        ref_arc (dict): Reference arc with 'startAngle' and 'endAngle' in degrees.
+        rotate (float): Rotation offset (degrees) to apply when ref_arc is a full circle.
+
+    Returns:
+        list[dict]: One {'startAngle': float, 'endAngle': float, 'midAngle': float}
+        per entry of arcs_types.
+    """
+    arcs_count = len(arcs_types)
+    single_arc = arcs_count == 1
+    slices_count = arcs_types.count(
+        "slice"
+    )  # Assumes 'line' takes 0 space for length calculation
+
+    ref_arc_is_circle = ref_arc["startAngle"] == 0 and ref_arc["endAngle"] == 360
+    ref_arc_length = ref_arc["endAngle"] - ref_arc["startAngle"]
+
+    gaps_total_angle = gap * (arcs_count if ref_arc_is_circle else arcs_count - 1)
+    gaps_angle = 0 if single_arc else gaps_total_angle
+
+    slice_length = (
+        (ref_arc_length - gaps_angle) / slices_count if slices_count > 0 else 0
+    )
+    arcs_lengths = [
+        slice_length if arc_type == "slice" else 0 for arc_type in arcs_types
+    ]
+
+    base_start_angle = (
+        rotate - (arcs_lengths[0] / 2 if arcs_lengths else 0)
+        if ref_arc_is_circle and not single_arc
+        else ref_arc["startAngle"] + rotate
+    )
+
+    angles = []
+    # length of the arcs before the current one (prefix sum)
+    previous_arcs_length = 0
+    for index, arc_length in enumerate(arcs_lengths):
+        start_angle = previous_arcs_length + base_start_angle + index * gap
+        end_angle = start_angle + arc_length
+        mid_angle = start_angle + (end_angle - start_angle) / 2
+        angles.append(
+            {"startAngle": start_angle, "endAngle": end_angle, "midAngle": mid_angle}
+        )
+        previous_arcs_length += arc_length
+    return angles
+
+
+# * helper function to get arc bounding angles
+def get_arc_bounding_angles(arcs_types, index, gap, ref_arc, rotate):
+    """Compute start, end and mid angles for an arc inside a reference arc.
+
+    See allocate_ring_angles, which computes the angles of every sibling at once.
+
+    Args:
+        arcs_types (list[str]): Sequence of 'slice'|'line' describing arc types.
+        index (int): Index of the target arc in arcs_types.
+        gap (float): Angular gap (degrees) to apply between adjacent arcs.
+        ref_arc (dict): Reference arc with 'startAngle' and 'endAngle' in degrees.
+        rotate (float): Rotation offset (degrees) to apply when ref_arc is a full circle.
+
+    Returns:
+        dict: {'startAngle': float, 'endAngle': float, 'midAngle': float}
+    """
+    return allocate_ring_angles(arcs_types, gap, ref_arc, rotate)[index]
+
+
+# * helper function to format emitted numbers
+def format_number(value, precision=None):
+    """Format a number for the SVG output.
+
+    Args:
+        value (int | float): Number to format.
+        precision (int | None, optional): Number of decimals to keep, trailing zeros
+            dropped. If None the number is written with str() (full precision).
+            Defaults to None.
+
+    Returns:
+        str: Formatted number (e.g. '1412.35', '-3', '0').
+    """
+    if precision is None:
+        return str(value)
+    text = "%.*f" % (precision, value)
+    if precision:
+        text = text.rstrip("0").rstrip(".")
+    # values rounding to zero from below (e.g. -1.8e-16)
+    return "0" if text == "-0" else text
+
+
+# * helper function to get arc cartesian cords
+def get_arc_coords(
+    center_coords,
+    radius,
+    arcs_types,
+    index,
+    reverse=False,
+    gap=0,
+    rotate=0,
+    ref_arc=None,
+    precision=None,
+):
+    """Generate SVG arc path and key points for an arc index.
+
+    Args:
+        center_coords (dict): {'x': float, 'y': float} center coordinates.
+        radius (float): Radius at which the arc lies.
+        arcs_types (list[str]): List describing each sibling arc as 'slice' or 'line'.
+        index (int): Index of the desired arc inside arcs_types.
+        reverse (bool, optional): If True, flip arc orientation for lower half. Defaults to False.
+        gap (float, optional): Angular gap between arcs in degrees. Defaults to 0.
+        rotate (float, optional): Rotation offset in degrees for circular refs. Defaults to 0.
+        ref_arc (dict, optional): Reference arc {'startAngle': float, 'endAngle': float}. If None, full circle used.
+        precision (int | None, optional): Decimals of the numbers of the path (see
+            format_number). Defaults to None (full precision).
+
+    Returns:
+        dict: {
+            'path': str,         # SVG path "d" attribute
+            'start': dict,       # {'x': float, 'y': float, 'angle': float}
+            'end': dict,         # same as start
+            'middle': dict,      # mid point coords
+            'fullCircle': bool   # True if arc spans full 360°
+        }
+    """
+    if ref_arc is None:
+        ref_arc = {"startAngle": 0, "endAngle": 360}
+
+    angles = get_arc_bounding_angles(arcs_types, index, gap, ref_arc, rotate)
+    return arc_coords_from_angles(center_coords, radius, angles, reverse, precision)
+
+
+# * helper function to get the cartesian cords of every arc of a ring
+def allocate_ring(
+    center_coords,
+    radius,
+    arcs_types,
+    reverse=False,
+    gap=0,
+    rotate=0,
+    ref_arc=None,
+    precision=None,
+):
+    """Generate the SVG arc paths and key points of every arc of a ring.
+
+    Same as calling get_arc_coords for each index, in a single pass over the
+    ring (see allocate_ring_angles).
+
+    Args:
+        center_coords (dict): {'x': float, 'y': float} center coordinates.
+        radius (float): Radius at which the arcs lie.
+        arcs_types (list[str]): List describing each sibling arc as 'slice' or 'line'.
+        reverse (bool, optional): If True, flip arc orientation for lower half. Defaults to False.
+        gap (float, optional): Angular gap between arcs in degrees. Defaults to 0.
+        rotate (float, optional): Rotation offset in degrees for circular refs. Defaults to 0.
+        ref_arc (dict, optional): Reference arc {'startAngle': float, 'endAngle': float}. If None, full circle used.
+        precision (int | None, optional): Decimals of the numbers of the paths (see
+            format_number). Defaults to None (full precision).
+
+    Returns:
+        list[dict]: One get_arc_coords result per entry of arcs_types.
+    """
+    if ref_arc is None:
+        ref_arc = {"startAngle": 0, "endAngle": 360}
+    return [
+        arc_coords_from_angles(center_coords, radius, angles, reverse, precision)
+        for angles in allocate_ring_angles(arcs_types, gap, ref_arc, rotate)
+    ]
+
+
+# * helper function to get arc cartesian cords from its angles
+def arc_coords_from_angles(center_coords, radius, angles, reverse, precision):
+    """Generate the SVG arc path and key points of an arc of known angles.
+
+    Args:
+        center_coords (dict): {'x': float, 'y': float} center coordinates.
+        radius (float): Radius at which the arc lies.
+        angles (dict): {'startAngle', 'endAngle', 'midAngle'} of the arc.
+        reverse (bool): If True, flip arc orientation for lower half.
+        precision (int | None): Decimals of the numbers of the path (see
+            format_number).
+
+    Returns:
+        dict: See get_arc_coords.
+    """
+    start_angle, end_angle, mid_angle = (
+        angles["startAngle"],
+        angles["endAngle"],
+        angles["midAngle"],
+    )
+
+    full_circle = round(end_angle) - round(start_angle) == 360
+    end_command = " Z" if full_circle else ""
+
+    on_circle_lower_edge = reverse and 90 < mid_angle < 270
+    large_arc_flag = 1 if on_circle_lower_edge or (end_angle - start_angle > 180) else 0
+    sweep_flag = 0 if not full_circle and on_circle_lower_edge else 1
+
+    flip_angle = 180 if reverse and on_circle_lower_edge else 0
+    start_angle_flipped = start_angle + flip_angle
+    end_angle_flipped = end_angle - (0.01 if full_circle else 0) + flip_angle
+    mid_angle_flipped = mid_angle + flip_angle
+
+    start = polar_to_cartesian(
+        center_coords["x"], center_coords["y"], radius, start_angle_flipped
+    )
+    end = polar_to_cartesian(
+        center_coords["x"], center_coords["y"], radius, end_angle_flipped
+    )
+    middle = polar_to_cartesian(
+        center_coords["x"], center_coords["y"], radius, mid_angle_flipped
+    )
+
+    if precision is None:
+        d_str = f"M {start['x']} {start['y']} A {radius} {radius} 0 {large_arc_flag} {sweep_flag} {end['x']} {end['y']}{end_command}"
+    else:
+        start_x, start_y, r, end_x, end_y = (
+            format_number(value, precision)
+            for value in (start["x"], start["y"], radius, end["x"], end["y"])
+        )
+        d_str = f"M {start_x} {start_y} A {r} {r} 0 {large_arc_flag} {sweep_flag} {end_x} {end_y}{end_command}"
+    return {
+        "path": d_str,
+        "start": start,
+        "end": end,
+        "middle": middle,
+        "fullCircle": full_circle,
+    }
+
+
+# * helper function extract content name
+def get_content_name(content):
+    """Return a canonical content name.
+
+    If content is a dict (representing a parent with sub-contents), the
+    first key is considered the content name. Otherwise the content is
+    converted to string.
+
+    Args:
+        content (dict|str): Content descriptor.
+
+    Returns:
+        str: Content name.
+    """
+    if isinstance(content, dict):
+        return list(content.keys())[0]
+    return str(content)
+
+
+# * helper function to describe a static SVG element of the layout
+def layout_element(tag, attributes=None, text_content=None, theme=(), children=None):
+    """Describe a static (data independent) SVG element of a layout.
+
+    Args:
+        tag (str): Element tag name (may include 'xlink:' prefix).
+        attributes (dict, optional): Attributes of the element.
+        text_content (str, optional): Text content for the element.
+        theme (tuple[str], optional): Names of the attributes whose value is a key
+            of the color palette rather than a color.
+        children (list, optional): Child layout items.
+
+    Returns:
+        dict: {'tag', 'attrs', 'text', 'theme', 'children'} description.
+    """
+    return {
+        "tag": tag,
+        "attrs": attributes or {},
+        "text": text_content,
+        "theme": theme,
+        "children": children if children is not None else [],
+    }
+
+
+# __________________________________________________________________________________#
+# |                                                                                  |#
+# |                               Compiled layout object                             |#
+# |__________________________________________________________________________________|#
+
+
+class CompiledLayout:
+    def __init__(
+        self,
+        graph_json: str,
+        piscines_list: list[str],
+        checkpoints_list: list[str],
+        mandatory_list: list[str],
+        constants: dict | None = None,
+        precision: int | None = None,
+    ):
+        """Compile a graph description into a reusable, data independent layout.
+
+        Every arc, angle, coordinate and text path of the graph is computed once
+        here. A compiled layout can then be shared by any number of modular_graph
+        instances rendering the same module with different data: binding a
+        dataset only colors the nodes and serializes the document.
+
+        Args:
+            graph_json (str): JSON string describing the graph layout.
+            piscines_list (list[str]): List of  "piscines".
+            checkpoints_list (list[str]): List of checkpoints.
+            mandatory_list (list[str]): List of project names that should be rendered
+                as mandatory (star) icons.
+            constants (dict | None, optional): Overrides of the layout constants,
+                keyed by name (see LAYOUT_CONSTANT_NAMES). Missing groups use the
+                module defaults. Defaults to None.
+            precision (int | None, optional): Number of decimals of the emitted
+                coordinates, path data and transforms (trailing zeros dropped). If
+                None, numbers are written in full. Defaults to None.
+
+        Raises:
+            ValueError: If precision is negative.
+
+        Side effects:
+            - Parses `graph_json` into `self.graph`.
+            - Fills `self.nodes` (one record per rendered content, in document
+              order), `self.node_indices` (content name -> node indices) and
+              `self.tree` (static SVG skeleton referencing the nodes).
+            - Keeps the placement of the nodes as arrays indexed like
+              `self.nodes` (see place_nodes), and their names, rings, roles
+              and sections likewise (see index_nodes).
+        Returns:
+            None
+        """
+        constants = constants or {}
+        self.LINE_CONSTANTS = constants.get("LINE_CONSTANTS", LINE_CONSTANTS)
+        self.SLICE_CONSTANTS = constants.get("SLICE_CONSTANTS", SLICE_CONSTANTS)
+        self.MIDDLE_CIRCLE_CONSTANTS = constants.get(
+            "MIDDLE_CIRCLE_CONSTANTS", MIDDLE_CIRCLE_CONSTANTS
+        )
+        self.OUTER_CIRCLE_CONSTANTS = constants.get(
+            "OUTER_CIRCLE_CONSTANTS", OUTER_CIRCLE_CONSTANTS
+        )
+        self.PISCINE_CONSTANTS = constants.get("PISCINE_CONSTANTS", PISCINE_CONSTANTS)
+        self.STAR_CONSTANTS = constants.get("STAR_CONSTANTS", STAR_CONSTANTS)
+        self.CHECKPOINT_CONSTANTS = constants.get(
+            "CHECKPOINT_CONSTANTS", CHECKPOINT_CONSTANTS
+        )
+
+        if precision is not None and precision < 0:
+            raise ValueError(f"precision must be positive or zero, got {precision}.")
+        self.precision = precision
+
+        self.piscines_list = piscines_list
+        self.checkpoints_list = checkpoints_list
+        self.mandatory_list = mandatory_list
+        # sets give O(1) role lookups while compiling
+        self.piscines_set = set(piscines_list)
+        self.checkpoints_set = set(checkpoints_list)
+        self.mandatory_set = set(mandatory_list)
+
+        self.graph_json = graph_json
+        self.graph = json.loads(graph_json)
+
+        # Determine SVG_SIZE and CENTER
+        self.svg_size = 2300 if self.graph.get("outerCircle") else 2000
+        self.center = self.svg_size / 2
+
+        # allocated rings, keyed by ring config and arc types (see ring_coords)
+        self.rings = {}
+        self.nodes = []
+        self.tree = []
+        # label offset of each node and sub-content lines, until place_nodes
+        self.label_offsets = []
+        self.sub_content_lines = []
+        # placement of the nodes, set by place_nodes
+        self.angles = self.radii = self.xs = self.ys = self.label_ys = np.empty(0)
+        self.formatted_x = self.formatted_y = self.formatted_label_y = []
+        self.transforms = []
+        if self.graph:
+            self.compile_graph()
+            self.place_nodes()
+        self.index_nodes()
+        # content name -> indices of its nodes
+        self.node_indices = {}
+        for node in self.nodes:
+            self.node_indices.setdefault(node["name"], []).append(node["index"])
+        # indices of the nodes whose label overlaps another one (see dense_labels)
+        self.dense_label_indices = None
+
+    # *#########################################################################* #
+    # ************************** Compile Functions ****************************** #
+    # *#########################################################################* #
+
+    # * helper function to match a layout against the inputs it was compiled from
+    def matches(
+        self,
+        graph_json,
+        piscines_list,
+        checkpoints_list,
+        mandatory_list,
+        precision=None,
+    ):
+        """Return whether this layout was compiled from the given inputs.
+
+        Args:
+            graph_json (str): JSON string describing the graph layout.
+            piscines_list (list[str]): List of  "piscines".
+            checkpoints_list (list[str]): List of checkpoints.
+            mandatory_list (list[str]): List of mandatory project names.
+            precision (int | None, optional): Precision of the emitted numbers.
+                Defaults to None.
+
+        Returns:
+            bool: True if the graph, the role lists and the precision are the same.
+        """
+        return (
+            graph_json == self.graph_json
+            and precision == self.precision
+            and set(piscines_list) == self.piscines_set
+            and set(checkpoints_list) == self.checkpoints_set
+            and set(mandatory_list) == self.mandatory_set
+        )
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to find the labels too dense to be read
+    def dense_labels(self):
+        """Return the nodes whose label would overlap a label kept before it.
+
+        Labels are taken in priority order (piscines, checkpoints and mandatory
+        contents first, then document order) and kept unless their box overlaps
+        the box of a kept label. Computed once per layout.
+
+        Returns:
+            frozenset[int]: Indices of the nodes whose label is dropped.
+        """
+        if self.dense_label_indices is not None:
+            return self.dense_label_indices
+        char_width = LABEL_CONSTANTS["charWidth"]
+        line_height = LABEL_CONSTANTS["lineHeight"]
+        labeled = [node for node in self.nodes if node["has_label"]]
+        labeled.sort(key=lambda node: node["role"] == "project")
+        xs = self.xs.tolist()
+        label_ys = self.label_ys.tolist()
+        # kept labels by row of line_height: [(x, y, half width)]
+        rows = {}
+        dense = set()
+        for node in labeled:
+            x, y = xs[node["index"]], label_ys[node["index"]]
+            half_width = len(node["name"]) * char_width / 2
+            row = int(y // line_height)
+            overlaps = any(
+                abs(kept_x - x) < kept_half_width + half_width
+                and abs(kept_y - y) < line_height
+                for near_row in (row - 1, row, row + 1)
+                for kept_x, kept_y, kept_half_width in rows.get(near_row, ())
+            )
+            if overlaps:
+                dense.add(node["index"])
+            else:
+                rows.setdefault(row, []).append((x, y, half_width))
+        self.dense_label_indices = frozenset(dense)
+        return self.dense_label_indices
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to read the allocated arcs of a ring
+    def ring_coords(
+        self, radius, arcs_types, reverse=False, gap=0, rotate=0, ref_arc=None
+    ):
+        """Return the arcs of every sibling of a ring, allocated once per ring.
+
+        Args:
+            radius (float): Radius at which the arcs lie.
+            arcs_types (list[str]): List describing each sibling arc as 'slice' or 'line'.
+            reverse (bool, optional): If True, flip arc orientation for lower half. Defaults to False.
+            gap (float, optional): Angular gap between arcs in degrees. Defaults to 0.
+            rotate (float, optional): Rotation offset in degrees for circular refs. Defaults to 0.
+            ref_arc (dict, optional): Reference arc {'startAngle': float, 'endAngle': float}.
+                If None, full circle used.
+
+        Returns:
+            list[dict]: One get_arc_coords result per sibling, centered on the
+            layout and written with its precision. Shared: not to be modified.
+        """
+        key = (
+            radius,
+            tuple(arcs_types),
+            reverse,
+            gap,
+            rotate,
+            None if ref_arc is None else (ref_arc["startAngle"], ref_arc["endAngle"]),
+        )
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = allocate_ring(
+                center_coords={"x": self.center, "y": self.center},
+                radius=radius,
+                arcs_types=arcs_types,
+                reverse=reverse,
+                gap=gap,
+                rotate=rotate,
+                ref_arc=ref_arc,
+                precision=self.precision,
+            )
+            self.rings[key] = ring
+        return ring
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to format emitted numbers
+    def format_number(self, value):
+        """Format a number of the output with the precision of the layout.
+
+        Args:
+            value (int | float): Number to format.
+
+        Returns:
+            str: Formatted number (see `circular_graph.layout.format_number`).
+        """
+        return format_number(value, self.precision)
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # component compile function text path (as an arc shape)
+    def compile_text_path(self, parent_items, text, id_str, index, circle_params):
+        """Add an SVG textPath that follows an arc.
+
+        Args:
+            parent_items (list): Layout items of the parent group.
+            text (str): Text to render along the arc.
+            id_str (str): ID to assign to the path element.
+            index (int): Index of the path (used when computing arc coords).
+            circle_params (dict): Circle configuration including radius, font settings and arcs.
+
+        Returns:
+            None
+        """
+        radius = circle_params["radius"] - (circle_params.get("nameRadiusOffset", 0))
+
+        arc_path_data = self.ring_coords(
+            radius=radius,
+            arcs_types=circle_params["arcs"],
+            reverse=True,
+            gap=circle_params.get("gap", 0),
+            rotate=circle_params.get("rotate", 0),
+            ref_arc=circle_params.get("refArc"),
+        )[index]
+
+        text_path = layout_element(
+            "textPath",
+            {
+                "startOffset": f"{50}%",
+                "xlink:href": f"#{id_str}",
+                "style": "letter-spacing: 0.75px;",
+            },
+            text_content=text,
+        )
+        text_el = layout_element(
+            "text",
+            {
+                "fill": circle_params.get("nameColor", "neutral"),
+                "text-anchor": "middle",
+                "dominant-baseline": "middle",
+                "font-size": str(circle_params.get("nameFontSize", 50)),
+                "font-family": circle_params.get("nameFont", "IBM Plex Sans"),
+            },
+            theme=("fill",),
+            children=[text_path],
+        )
+        path_el = layout_element(
+            "path", {"d": arc_path_data["path"], "id": id_str, "fill": "none"}
+        )
+        parent_items.append(
+            layout_element("g", {"id": f"g-{id_str}"}, children=[path_el, text_el])
+        )
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # component compile function for content
+    def compile_content(
+        self,
+        parent_items,
+        content_item_data,
+        circle_props_from_parent,
+        placement,
+        is_sub_content=False,
+        parent=None,
+    ):
+        """Register a content node (project, piscine, checkpoint).
+
+        Its position (and everything derived from it) is computed with the
+        positions of every other node by place_nodes.
+
+        Args:
+            parent_items (list): Layout items of the parent group.
+            content_item_data (dict|str): Content descriptor or name.
+            circle_props_from_parent (dict): Positioning and size parameters for the content.
+            placement (dict): {'ring', 'slice', 'section'} ids of the enclosing groups.
+            is_sub_content (bool, optional): If True, places a sub-content (smaller icon). Defaults to False.
+            parent (str, optional): Name of the parent content of a sub-content.
+
+        Returns:
+            None
+        """
+        name = get_content_name(content_item_data)
+
+        is_piscine = name in self.piscines_set
+        if name in self.checkpoints_set:
+            icon = "checkpoint"
+            role = "checkpoint"
+            width = (
+                self.CHECKPOINT_CONSTANTS["subContentWidth"]
+                if is_sub_content
+                else self.CHECKPOINT_CONSTANTS["width"]
+            )
+        elif name in self.mandatory_set:
+            icon = "star"
+            role = "mandatory"
+            width = (
+                self.STAR_CONSTANTS["subContentWidth"]
+                if is_sub_content
+                else self.STAR_CONSTANTS["width"]
+            )
+        else:
+            icon = "circle"
+            role = (
+                "piscine"
+                if is_piscine
+                else "sub-content" if is_sub_content else "project"
+            )
+            width = None
+
+        icon_radius = (
+            self.PISCINE_CONSTANTS["radius"]
+            if is_piscine
+            else circle_props_from_parent.get("contentRadius", 4)
+        )
+        name_offset = (
+            self.PISCINE_CONSTANTS["nameOffset"]
+            if is_piscine
+            else circle_props_from_parent.get("contentNameOffset", 34)
+        )
+
+        node = {
+            "index": len(self.nodes),
+            "name": name,
+            "parent": parent,
+            **placement,
+            "role": role,
+            "icon": icon,
+            "is_piscine": is_piscine,
+            "is_sub_content": is_sub_content,
+            # polar position (Cartesian positions are computed by place_nodes)
+            "angle": circle_props_from_parent["angle"],
+            "radius": circle_props_from_parent["radius"],
+            "icon_radius": icon_radius,
+            "icon_width": width,
+            # Content name text (not displayed for sub-contents)
+            "has_label": not is_sub_content,
+        }
+        self.nodes.append(node)
+        self.label_offsets.append(None if is_sub_content else name_offset)
+
+        item = {"node": node["index"], "children": []}
+        parent_items.append(item)
+
+        if isinstance(content_item_data, dict):
+            self.compile_sub_contents(
+                item["children"],
+                content_item_data,
+                circle_props_from_parent,
+                placement,
+            )
+
+    ##############################################################################################################################
+    ##############################################################################################################################
+    # component compile function for sub_content
+    def compile_sub_contents(
+        self, parent_items, content_data_with_subs, parent_circle_props, placement
+    ):
+        """Place the sub-contents of a parent content item.
+
+        Args:
+            parent_items (list): Layout items of the parent content group.
+            content_data_with_subs (dict): {name: [sub1, sub2, ...]} structure.
+            parent_circle_props (dict): Circle properties for the parent used to compute positions.
+            placement (dict): {'ring', 'slice', 'section'} ids of the enclosing groups.
+
+        Returns:
+            None
+        """
+        name, sub_contents_list = list(content_data_with_subs.items())[0]
+        if not sub_contents_list:
+            return
+
+        sub_radius = (
+            parent_circle_props["radius"]
+            + self.SLICE_CONSTANTS["innerCircle"]["subContentRadiusOffset"]
+        )
+
+        # Line connecting to sub-contents (ends set by place_nodes)
+        line = layout_element(
+            "line",
+            {
+                "x1": None,
+                "y1": None,
+                "x2": None,
+                "y2": None,
+                "stroke": "neutral",
+                "stroke-width": "1",
+                "opacity": "0.5",
+            },
+            theme=("stroke",),
+        )
+        parent_items.append(line)
+        self.sub_content_lines.append(
+            (
+                line,
+                parent_circle_props["radius"],
+                sub_radius,
+                parent_circle_props["angle"],
+            )
+        )
+
+        sub_angles = sub_content_angles(
+            parent_circle_props["angle"],
+            len(sub_contents_list),
+            self.SLICE_CONSTANTS["innerCircle"]["subContentGap"],
+        ).tolist()
+        for sub_name, sub_angle in zip(sub_contents_list, sub_angles):
+            sub_circle_props = {
+                **parent_circle_props,
+                "radius": sub_radius,
+                "angle": sub_angle,
+                "contentRadius": parent_circle_props.get(
+                    "subContentRadius",
+                    self.SLICE_CONSTANTS["innerCircle"]["subContentRadius"],
+                ),
+            }
+
+            self.compile_content(
+                parent_items,
+                sub_name,
+                sub_circle_props,
+                placement,
+                is_sub_content=True,
+                parent=name,
+            )
+
+    #####################################################################################################################################################
+    #####################################################################################################################################################
+
+    # component compile function for arc
+    def compile_arc(
+        self,
+        parent_items,
+        section_data,
+        circle_config_from_parent,
+        index,
+        id_prefix,
+        placement,
+    ):
+        """Lay out an arc section and its contents.
+
+        Args:
+            parent_items (list): Layout items of the parent group.
+            section_data (dict): Section definition (name, contents, inner/outer arcs).
+            circle_config_from_parent (dict): Circle configuration inherited from parent.
+            index (int): Index of this arc within its siblings.
+            id_prefix (str): Prefix string used to build element ids.
+            placement (dict): {'ring', 'slice'} ids of the enclosing groups.
+
+        Returns:
+            None
+        """
+
+        arc_id = f"{id_prefix}-arc-{index + 1}"
+        arc_g = layout_element("g", {"id": arc_id})
+        parent_items.append(arc_g)
+        placement = {"slice": arc_id, **placement, "section": arc_id}
+
+        arc_coords_data = self.ring_coords(
+            radius=circle_config_from_parent["radius"],
+            arcs_types=circle_config_from_parent["arcs"],  # list of 'slice' or 'line'
+            gap=circle_config_from_parent.get("gap", 0),
+            ref_arc=circle_config_from_parent.get("refArc"),
+        )[index]
+
+        contents = section_data.get("contents", [])
+        single_content = len(contents) == 1
+
+        if not single_content:
+            arc_g["children"].append(
+                layout_element(
+                    "path",
+                    {
+                        "d": arc_coords_data["path"],
+                        "fill": "none",
+                        "stroke": "grey",
+                        "stroke-width": "0.25",
+                    },
+                    theme=("stroke",),
+                )
+            )
+
+        section_name_data = section_data.get("name", {})
+        if not section_name_data.get("hidden", False) and section_name_data.get("text"):
+            self.compile_text_path(
+                arc_g["children"],
+                section_name_data["text"],
+                f"{arc_id}-text-path",
+                index,
+                circle_config_from_parent,
+            )
+
+        # Distribute contents
+        content_angles = (
+            arc_content_angles(arc_coords_data, len(contents)).tolist()
+            if contents
+            else []
+        )
+        for content_item, content_angle in zip(contents, content_angles):
+            content_circle_props = {
+                "radius": circle_config_from_parent[
+                    "radius"
+                ],  # Content sits on the main arc radius
+                "angle": content_angle,
+                "contentRadius": circle_config_from_parent.get("contentRadius", 5),
+                "contentNameOffset": circle_config_from_parent.get(
+                    "contentNameOffset", 34
+                ),
+            }
+            self.compile_content(
+                arc_g["children"], content_item, content_circle_props, placement
+            )
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # component compile function for slice
+    def compile_slice(self, parent_items, slice_data, index, all_sections_types):
+        """Lay out a slice containing entry point, inner arc and outer arcs.
+
+        Args:
+            parent_items (list): Layout items of the parent group.
+            slice_data (dict): Slice definition (name, innerArc, outerArcs, entryPoint).
+            index (int): Slice index among siblings.
+            all_sections_types (list[str]): Sibling types used to compute angles.
+
+        Returns:
+            None
+        """
+        # slice_data: { name, innerArc, outerArcs, entryPoint }
+
+        slice_id = f"slice-{index + 1}"
+        slice_g = layout_element("g", {"id": slice_id})
+        parent_items.append(slice_g)
+        placement = {"ring": "inner-circle", "slice": slice_id}
+
+        slice_name_data = slice_data.get("name", {})
+        if not slice_name_data.get("hidden", False) and slice_name_data.get("text"):
+            # For slice name, use SLICE_CONSTANTS.textCircle
+            text_circle_params = {
+                **self.SLICE_CONSTANTS["textCircle"],
+                "arcs": all_sections_types,
+            }
+            self.compile_text_path(
+                slice_g["children"],
+                slice_name_data["text"],
+                f"{slice_id}-text-path",
+                index,
+                text_circle_params,
+            )
+
+        # Entry Point
+        entry_point_key = slice_data.get("entryPoint")
+        if entry_point_key:
+            # Calculate outerArcCoords for entry point angle
+            outer_arc_coords_for_entry = self.ring_coords(
+                radius=self.SLICE_CONSTANTS["outerCircle"][
+                    "radius"
+                ],  # JS uses SLICE.outerCircle.radius
+                arcs_types=all_sections_types,
+                gap=self.SLICE_CONSTANTS["outerCircle"]["gap"],
+            )[index]
+            entry_point_circle_props = {
+                **self.SLICE_CONSTANTS["entryPointCircle"],
+                "angle": outer_arc_coords_for_entry["middle"]["angle"],
+            }
+            self.compile_content(
+                slice_g["children"],
+                entry_point_key,
+                entry_point_circle_props,
+                {**placement, "section": slice_id},
+            )
+
+        # Inner Arc
+        inner_arc_data = slice_data.get("innerArc")
+        if inner_arc_data:
+            inner_arc_circle_config = {
+                **self.SLICE_CONSTANTS["innerCircle"],
+                "arcs": all_sections_types,
+            }
+            # The 'index' for this arc within the slice is effectively the slice's index itself
+            self.compile_arc(
+                slice_g["children"],
+                inner_arc_data,
+                inner_arc_circle_config,
+                index,
+                f"{slice_id}-inner",
+                placement,
+            )
+
+        # Outer Arcs
+        outer_arcs_data = slice_data.get("outerArcs", [])
+        if outer_arcs_data:
+            outer_arcs_types = ["slice"] * len(
+                outer_arcs_data
+            )  # Outer arcs within a slice are always 'slice' type relative to each other
+
+            # Calculate reference arc for these outer arcs based on the slice's position
+            slice_outer_coords = self.ring_coords(
+                radius=self.SLICE_CONSTANTS["outerArc"]["radius"],
+                arcs_types=all_sections_types,
+                gap=self.SLICE_CONSTANTS["textCircle"]["gap"],
+            )[index]
+
+            ref_arc_for_outer_arcs = {
+                "startAngle": slice_outer_coords["start"]["angle"],
+                "endAngle": slice_outer_coords["end"]["angle"],
+            }
+            # Adjust refArc if only one main section (full circle span for slice)
+            if len(all_sections_types) == 1:
+                ref_arc_for_outer_arcs = {
+                    "startAngle": self.SLICE_CONSTANTS["outerArc"]["gap"] / 2,
+                    "endAngle": 360 - self.SLICE_CONSTANTS["outerArc"]["gap"] / 2,
+                }
+
+            outer_arc_circle_config = {
+                **self.SLICE_CONSTANTS["outerArc"],
+                "arcs": outer_arcs_types,
+                "refArc": ref_arc_for_outer_arcs,
+            }
+            for arc_idx, arc_data in enumerate(outer_arcs_data):
+                self.compile_arc(
+                    slice_g["children"],
+                    arc_data,
+                    outer_arc_circle_config,
+                    arc_idx,
+                    f"{slice_id}-outer",
+                    placement,
+                )
+
+    ########################################################################################################################################################################
+    ########################################################################################################################################################################
+
+    def compile_line_section(self, parent_items, line_data, index, all_sections_types):
+        """Lay out a linear section radiating from the center.
+
+        This function places a radial line section used when a section is declared
+        as type 'line' instead of 'slice'. It performs these tasks:
+          - compute the section angle using the innerCircle as reference
+          - draw a line from LINE_CONSTANTS['startRadius'] to ['endRadius']
+          - add an optional rotated title near the line start
+          - evenly distribute contents along the line length
+
+        Args:
+            parent_items (list): Layout items of the parent group.
+            line_data (dict): Dictionary with keys 'name' and 'contents' for the section.
+            index (int): Index of this line section among siblings.
+            all_sections_types (list[str]): Types of all sibling sections (used for angle calc).
+
+        Returns:
+            None
+        """
+        # line_data: { name, contents }
+        line_id = f"line-{index + 1}"
+        line_g = layout_element("g", {"id": line_id})
+        parent_items.append(line_g)
+        placement = {"ring": "inner-circle", "slice": line_id, "section": line_id}
+
+        # Determine line's angle based on its position among all sections
+        arc_coords_for_line_angle = self.ring_coords(
+            radius=self.SLICE_CONSTANTS["innerCircle"][
+                "radius"
+            ],  # Radius reference from JS for angle
+            arcs_types=all_sections_types,
+            gap=self.SLICE_CONSTANTS["innerCircle"]["gap"],
+        )[index]
+        line_angle = arc_coords_for_line_angle["start"][
+            "angle"
+        ]  # Use start angle for line orientation
+
+        start_coords = polar_to_cartesian(
+            self.center,
+            self.center,
+            self.LINE_CONSTANTS["startRadius"],
+            line_angle,
+        )
+        end_coords = polar_to_cartesian(
+            self.center,
+            self.center,
+            self.LINE_CONSTANTS["endRadius"],
+            line_angle,
+        )
+
+        # Line element (simplified, no gradient for now)
+        line_g["children"].append(
+            layout_element(
+                "line",
+                {
+                    "x1": self.format_number(start_coords["x"]),
+                    "y1": self.format_number(start_coords["y"]),
+                    "x2": self.format_number(end_coords["x"]),
+                    "y2": self.format_number(end_coords["y"]),
+                    "stroke": "neutral",
+                    "stroke-width": "1",
+                    "opacity": "0.5",
+                },
+                theme=("stroke",),
+            )
+        )
+
+        # Text title
+        line_name_data = line_data.get("name", {})
+        if not line_name_data.get("hidden", False) and line_name_data.get("text"):
+            on_circle_right_side = 0 <= line_angle < 180
+            text_rotation = line_angle + (-90 if on_circle_right_side else 90)
+            text_anchor = "end" if on_circle_right_side else "start"
+
+            line_g["children"].append(
+                layout_element(
+                    "text",
+                    {
+                        "x": self.format_number(start_coords["x"]),
+                        "y": self.format_number(start_coords["y"]),
+                        "font-size": "21px",
+                        "fill": "neutral",
+                        "font-family": "IBM Plex Mono",
+                        "alignment-baseline": "middle",
+                        "text-anchor": text_anchor,
+                        "transform": f"rotate({self.format_number(text_rotation)} {self.format_number(start_coords['x'])} {self.format_number(start_coords['y'])})",
+                    },
+                    text_content=line_name_data["text"],
+                    theme=("fill",),
+                )
+            )
+
+        # Contents along the line
+        contents = line_data.get("contents", [])
+        line_offset_for_content = (
+            0
+            if line_name_data.get("hidden", True)
+            else self.LINE_CONSTANTS["startOffset"]
+        )
+        content_radii = (
+            line_content_radii(
+                len(contents),
+                self.LINE_CONSTANTS["startRadius"],
+                self.LINE_CONSTANTS["endRadius"],
+                line_offset_for_content,
+            ).tolist()
+            if contents
+            else []
+        )
+
+        for content_item, radius_for_content in zip(contents, content_radii):
+            content_circle_props = {
+                "radius": radius_for_content,
+                "angle": line_angle,
+                "contentRadius": self.SLICE_CONSTANTS["innerCircle"][
+                    "contentRadius"
+                ],  # Example from inner circle
+                "contentNameOffset": self.SLICE_CONSTANTS["innerCircle"][
+                    "contentNameOffset"
+                ],
+            }
+            self.compile_content(
+                line_g["children"], content_item, content_circle_props, placement
+            )
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # component placement function for the nodes
+    def place_nodes(self):
+        """Compute the positions of every node in one vectorized call.
+
+        The (radius, angle) of all the nodes recorded by compile_content are
+        converted at once (see polar_to_cartesian_array), then the label
+        positions, icon transforms and sub-content lines are derived from them.
+
+        The placement is kept as arrays indexed like `self.nodes`, shared by
+        every graph rendering the layout:
+            - `angles`, `radii`, `xs`, `ys`, `label_ys` (np.ndarray): polar and
+              Cartesian positions of the nodes and of their label (NaN without
+              label);
+            - `formatted_x`, `formatted_y`, `formatted_label_y` (list[str]): the
+              same positions as written in the document (None without label);
+            - `transforms` (list[str | None]): transform of the icon of the
+              checkpoint and mandatory nodes.
+
+        Returns:
+            None
+        """
+        fmt = self.format_number
+        self.angles = np.array([node["angle"] for node in self.nodes], dtype=float)
+        self.radii = np.array([node["radius"] for node in self.nodes], dtype=float)
+        self.xs, self.ys = polar_to_cartesian_array(
+            self.center, self.center, self.radii, self.angles
+        )
+        label_offsets = np.array(
+            [np.nan if offset is None else offset for offset in self.label_offsets],
+            dtype=float,
+        )
+        self.label_ys = self.ys + label_offsets
+        self.formatted_x = list(map(fmt, self.xs.tolist()))
+        self.formatted_y = list(map(fmt, self.ys.tolist()))
+        self.formatted_label_y = [
+            None if offset is None else fmt(label_y)
+            for offset, label_y in zip(self.label_offsets, self.label_ys.tolist())
+        ]
+
+        # icon transforms (checkpoint flags are 18x22, stars 130x130)
+        widths = np.array([node["icon_width"] or 0 for node in self.nodes], dtype=float)
+        is_checkpoint = np.array([node["icon"] == "checkpoint" for node in self.nodes])
+        heights = np.where(is_checkpoint, widths / 18 * 22, widths)
+        scales = widths / np.where(is_checkpoint, 18, 130)
+        self.transforms = [
+            (
+                f"translate({fmt(x)}, {fmt(y)}) scale({fmt(scale)})"
+                if node["icon"] in ("checkpoint", "star")
+                else None
+            )
+            for node, x, y, scale in zip(
+                self.nodes,
+                (self.xs - widths / 2).tolist(),
+                (self.ys - heights / 2).tolist(),
+                scales.tolist(),
+            )
+        ]
+
+        if not self.sub_content_lines:
+            return
+        lines, start_radii, end_radii, angles = zip(*self.sub_content_lines)
+        x1, y1 = polar_to_cartesian_array(self.center, self.center, start_radii, angles)
+        x2, y2 = polar_to_cartesian_array(self.center, self.center, end_radii, angles)
+        for line, ends in zip(
+            lines, zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())
+        ):
+            line["attrs"].update(zip(("x1", "y1", "x2", "y2"), map(fmt, ends)))
+
+    # * helper function to keep the descriptive fields of the nodes as arrays
+    def index_nodes(self):
+        """Keep the names, rings, roles and sections of the nodes as arrays.
+
+        The arrays are indexed like `self.nodes` and shared by every graph
+        rendering the layout (e.g. to gather data values or build layout_frame):
+            - `names`, `parents`, `slices`, `sections` (np.ndarray): object
+              arrays of the content name, parent name, slice and section of the
+              nodes (None when missing);
+            - `ring_codes`, `role_codes` (np.ndarray): positions of the ring and
+              role of the nodes in LAYOUT_RINGS and NODE_ROLES;
+            - `has_label` (np.ndarray): whether the nodes carry a label.
+
+        Returns:
+            None
+        """
+        ring_codes = {ring: code for code, ring in enumerate(LAYOUT_RINGS)}
+        role_codes = {role: code for code, role in enumerate(NODE_ROLES)}
+        columns = {
+            "names": [],
+            "parents": [],
+            "slices": [],
+            "sections": [],
+            "ring_codes": [],
+            "role_codes": [],
+            "has_label": [],
+        }
+        for node in self.nodes:
+            columns["names"].append(node["name"])
+            columns["parents"].append(node["parent"])
+            columns["slices"].append(node["slice"])
+            columns["sections"].append(node["section"])
+            columns["ring_codes"].append(ring_codes[node["ring"]])
+            columns["role_codes"].append(role_codes[node["role"]])
+            columns["has_label"].append(node["has_label"])
+        count = len(self.nodes)
+        for name in ("names", "parents", "slices", "sections"):
+            array = np.empty(count, dtype=object)
+            array[:] = columns[name]
+            setattr(self, name, array)
+        self.ring_codes = np.array(columns["ring_codes"], dtype=np.int8)
+        self.role_codes = np.array(columns["role_codes"], dtype=np.int8)
+        self.has_label = np.array(columns["has_label"], dtype=bool)
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # main compile function for circular map 01
+    def compile_graph(self):
+        """Lay out the whole graph into `self.tree` and `self.nodes`.
+
+        The top-level items are, in document order, the central point and the
+        inner, middle and outer circle groups.
+
+        Returns:
+            None
+        """
+        graph_attr = self.graph
+
+        # Central Point
+        central_point_key = graph_attr.get("centralPoint")
+        if central_point_key:
+            cp_circle_props = {
+                "radius": self.SLICE_CONSTANTS["centralPointCircle"]["radius"],
+                "angle": self.SLICE_CONSTANTS["centralPointCircle"]["angle"],
+                "contentRadius": self.SLICE_CONSTANTS["centralPointCircle"][
+                    "contentRadius"
+                ],
+                "contentNameOffset": self.SLICE_CONSTANTS["centralPointCircle"].get(
+                    "contentNameOffset", 34
+                ),
+            }
+            self.compile_content(
+                self.tree,
+                central_point_key,
+                cp_circle_props,
+                {"ring": "central-point", "slice": None, "section": None},
+            )
+
+        # Inner Circle
+        inner_circle_sections = graph_attr.get("innerCircle", [])
+        if inner_circle_sections:
+            inner_g = layout_element("g", {"id": "inner-circle"})
+            self.tree.append(inner_g)
+            sections_types = [s.get("type", "slice") for s in inner_circle_sections]
+            for i, section in enumerate(inner_circle_sections):
+                if section.get("type") == "slice":
+                    self.compile_slice(inner_g["children"], section, i, sections_types)
+                elif section.get("type") == "line":
+                    self.compile_line_section(
+                        inner_g["children"], section, i, sections_types
+                    )
+
+        # Middle and Outer Circles
+        for ring_id, ring_key, ring_constants in (
+            ("middle-circle", "middleCircle", self.MIDDLE_CIRCLE_CONSTANTS),
+            ("outer-circle", "outerCircle", self.OUTER_CIRCLE_CONSTANTS),
+        ):
+            ring_sections = graph_attr.get(ring_key, [])
+            if not ring_sections:
+                continue
+            ring_g = layout_element("g", {"id": ring_id})
+            self.tree.append(ring_g)
+            ring_config = {
+                **ring_constants,
+                "arcs": ["slice"] * len(ring_sections),
+            }
+            for i, section in enumerate(ring_sections):
+                self.compile_arc(
+                    ring_g["children"],
+                    section,
+                    ring_config,
+                    i,
+                    ring_id,
+                    {"ring": ring_id},
+                )
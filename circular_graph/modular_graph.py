@@ -1,12 +1,62 @@
 from xml.etree import ElementTree as ET2
 from typing import Literal
-import math
+import copy
+import gzip
+import hashlib
+import io
 import json
+import os
+import posixpath
+import re
+import urllib.parse
+from itertools import repeat
+from operator import methodcaller
+import numpy as np
 import pandas as pd
-from circular_graph.color_tools.color_conversion import value_to_color
-from circular_graph.color_tools.gradient import create_gradient_html
+from circular_graph.color_tools.colormap import Colormap
+from circular_graph.color_tools.gradient import gradient_legend_svg
 from IPython.display import display, HTML
-from circular_graph.tools.renderer_utils import show_info_card
+from circular_graph.tools.renderer_utils import (
+    show_info_card,
+    delegated_info_card_script,
+    HIDE_INFO_CARD,
+    TOOLTIP_ISLAND_ID,
+    METRIC_ISLAND_ID,
+    SNAPSHOT_ISLAND_ID,
+    metric_selector_script,
+    metric_selector_html,
+    snapshot_player_script,
+    snapshot_player_html,
+    lazy_panel_script,
+    ring_loader_script,
+)
+from circular_graph import layout as layout_defaults
+from circular_graph.tools.svg_writer import (
+    SVGTreeBuilder,
+    SVGStreamWriter,
+    SVGCounter,
+)
+from circular_graph.tools.style_classes import StyleClasses
+from circular_graph.tools.json_values import json_default, to_native
+from circular_graph.layout import (
+    CompiledLayout,
+    LAYOUT_CONSTANT_NAMES,
+    LAYOUT_RINGS,
+    NODE_ROLES,
+    STAR_SYMBOL_ID,
+    STAR_PATH,
+    CHECKPOINT_SYMBOL_ID,
+    CHECKPOINT_PATH,
+    polar_to_cartesian,
+    get_arc_bounding_angles,
+    get_arc_coords,
+    get_content_name,
+)
+
+# Levels of detail, from the finest to the coarsest (see modular_graph)
+DETAIL_LEVELS = ("full", "compact", "overview", "minimal")
+# Top-level groups emitted as separate fragments (see to_progressive)
+DEFERRED_RINGS = ("middle-circle", "outer-circle")
 
 # __________________________________________________________________________________#
 # |                                                                                  |#
@@ -24,12 +74,23 @@ class modular_graph:
         mandatory_list: list[str],
         kind: Literal["classic", "custom"] = "classic",
         color_key: str | None = None,
+        event_mode: Literal["inline", "delegated"] = "inline",
+        layout: CompiledLayout | None = None,
+        restyle: bool = False,
+        retain: bool = True,
+        css_classes: bool = False,
+        precision: int | None = None,
+        tooltip_mode: Literal["attribute", "island"] = "attribute",
+        metrics: bool = False,
+        detail: Literal["full", "compact", "overview", "minimal"] = "full",
+        max_nodes: int | None = None,
+        max_bytes: int | None = None,
     ):
         """Initialize a modular_graph instance.
 
-        This constructor sets up configuration, constants and color palette,
-        parses the provided graph JSON and generates the SVG representation
-        immediately by calling render_circular_map01.
+        This constructor sets up configuration, constants and color palette and
+        compiles the provided graph JSON into a layout (unless a compiled one is
+        given). Rendering is deferred until the SVG is first needed.
 
         Args:
             graph_json (str): JSON string describing the graph layout.
@@ -48,20 +109,114 @@ class modular_graph:
                 key to use for color mapping. If None, uses the first key. Must be a valid
                 key present in all data dictionaries. Raises ValueError if invalid.
                 Defaults to None.
+            event_mode (Literal['inline','delegated'], optional): How the info-card
+                handlers are attached to the nodes. "inline" embeds the handler in the
+                `onpointerenter`/`onpointerleave` attributes of every node; "delegated"
+                emits a single <script> with listeners on the SVG root and leaves only
+                data attributes on the nodes. Defaults to "inline".
+            layout (CompiledLayout | None, optional): Layout previously compiled from the
+                same `graph_json` and lists. Sharing one layout across instances skips the
+                parsing and all geometry computations, leaving only data binding and
+                serialization. Defaults to None (compiled here).
+            restyle (bool, optional): If True, palette colors are emitted as CSS custom
+                properties declared in a single <style> block, and node fills are
+                indexed, so that set_theme and set_gradient_colors patch the rendered
+                document in place instead of rendering it again. Defaults to False.
+            retain (bool, optional): If False, the rendered document is never kept in
+                memory (`root_svg` and `graph_svg_text` are None); it is streamed on
+                demand by write_svg / to_svg. Defaults to True.
+            css_classes (bool, optional): If True, identical sets of presentation
+                attributes of the static elements and labels (font, stroke, fill...)
+                are replaced by a CSS class declared once in a <style> block.
+                Defaults to False.
+            precision (int | None, optional): Number of decimals of every emitted
+                coordinate, path and transform, trailing zeros dropped (e.g. 2 gives
+                '1412.35' for 1412.3456789012345). None writes numbers in full.
+                Must match the precision of `layout` if given. Defaults to None.
+            tooltip_mode (Literal['attribute','island'], optional): Where the values
+                shown by custom info cards are stored. "attribute" serializes them as
+                JSON in the `data-tooltip` attribute of every node; "island" emits a
+                single <script type="application/json"> mapping node ids to values,
+                serialized in one call. "island" requires kind="custom".
+                Defaults to "attribute".
+            metrics (bool, optional): If True, the fills of every key of the custom
+                data are computed in one pass and embedded in the document, which
+                can then switch the metric coloring the nodes (and the bounds of
+                the legend shown by show) client-side, without rendering again.
+                Requires kind="custom". Defaults to False.
+            detail (Literal['full','compact','overview','minimal'], optional): Level
+                of detail of the document. "compact" collapses the sub-contents of
+                each content into one aggregate glyph (colored by their mean value,
+                with a `data-count` attribute); "overview" also drops the labels
+                overlapping a label of higher priority (see
+                CompiledLayout.dense_labels); "minimal" drops every content label.
+                Aggregates are not recolored client-side. Defaults to "full".
+            max_nodes (int | None, optional): Maximum number of elements of the
+                document. The finest level (not finer than `detail`) meeting the
+                budgets is rendered, or the coarsest one if none does.
+                Defaults to None (no budget).
+            max_bytes (int | None, optional): Maximum size of the serialized document
+                in UTF-8 bytes (see max_nodes). Defaults to None (no budget).
 
         Raises:
             ValueError: If color_key is specified but not found in data dictionaries,
-                or if data format is invalid for the specified kind.
+                or if data format is invalid for the specified kind, or if
+                event_mode or tooltip_mode is unknown (or "island" or metrics with
+                a classic graph), or if `layout` was compiled from other inputs, or
+                if detail is unknown, a budget is not positive, or metrics is
+                combined with another detail level or a budget.
 
         Side effects:
             - Registers SVG namespaces.
-            - Parses `graph_json` into `self.graph_dict`.
-            - Renders informations according to the specified `kind`.
+            - Compiles `graph_json` into `self.layout` and exposes it as `self.graph_dict`.
+            - Nothing is rendered here: the document is rendered when `root_svg`,
+              `graph_svg_text`, to_svg or show is first used, then cached.
         Returns:
             None
         """
         # Kind of graph
         self.kind = kind
+        # Info-card handlers attachment
+        if event_mode not in ("inline", "delegated"):
+            raise ValueError(
+                f"Invalid event_mode '{event_mode}'. Must be 'inline' or 'delegated'."
+            )
+        self.event_mode = event_mode
+        # Tooltip storage (custom graphs)
+        if tooltip_mode not in ("attribute", "island"):
+            raise ValueError(
+                f"Invalid tooltip_mode '{tooltip_mode}'. Must be 'attribute' or 'island'."
+            )
+        if tooltip_mode == "island" and kind != "custom":
+            raise ValueError("tooltip_mode='island' requires kind='custom'.")
+        self.tooltip_mode = tooltip_mode
+        # Fills of every custom key embedded in the document
+        if metrics and kind != "custom":
+            raise ValueError("metrics=True requires kind='custom'.")
+        self.metrics = metrics
+        # Level of detail and budgets (see resolve_detail)
+        if detail not in DETAIL_LEVELS:
+            raise ValueError(
+                f"Invalid detail '{detail}'. Must be one of: {list(DETAIL_LEVELS)}"
+            )
+        for name, budget in (("max_nodes", max_nodes), ("max_bytes", max_bytes)):
+            if budget is not None and budget <= 0:
+                raise ValueError(f"{name} must be positive, got {budget}.")
+        if metrics and (detail != "full" or max_nodes or max_bytes):
+            raise ValueError(
+                "metrics=True requires detail='full' and no max_nodes / max_bytes."
+            )
+        self.detail = detail
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        # level of the last emitted document
+        self.detail_level = detail
+        # Restyle mode (CSS custom properties + in-place fill patches)
+        self.restyle = restyle
+        # Keep the rendered tree and text (False: stream on demand)
+        self.retain = retain
+        # Presentation attributes hash-consed into CSS classes
+        self.css_classes = css_classes
         # defs of the svg
         self.svg_defs = ET2.Element("defs")
         # Color Palette
@@ -70,6 +225,7 @@ class modular_graph:
             "#32CD32",
             "#1E90FF",
         ]  # yellow -> green -> blue
+        self.colormap = None  # built from gradient_colors (see get_colormap)
         self.COLORS = {
             "neutral": "#808080",  # Grey
             "neutralAlt": "#A9A9A9",  # Dark Grey
@@ -89,89 +245,35 @@ class modular_graph:
         ET2.register_namespace("", self.SVG_NS)
         ET2.register_namespace("xlink", self.XLINK_NS)
 
-        # line contstant
-        self.LINE_CONSTANTS = {
-            "startOffset": 70,
-            "startRadius": 220,
-            "endRadius": 575,
-        }
-
-        # slices constants
-        self.SLICE_GAP = 20
-        self.SLICE_CONSTANTS = {
-            "textCircle": {
-                "radius": 210,
-                "gap": self.SLICE_GAP,
-                "nameColor": self.COLORS["teal"],
-                "nameFontSize": 50,
-            },
-            "centralPointCircle": {"angle": 0, "radius": 0, "contentRadius": 8},
-            "entryPointCircle": {
-                "radius": 100,
-                "gap": self.SLICE_GAP,
-                "contentRadius": 8,
-                "contentNameOffset": 35,
-            },
-            "innerCircle": {
-                "radius": 360,
-                "gap": self.SLICE_GAP,
-                "contentRadius": 10,
-                "nameFont": "IBM Plex Mono",
-                "nameFontSize": 21,
-                "nameColor": self.COLORS["neutral"],
-                "nameRadiusOffset": 65,
-                "contentNameOffset": 40,
-                "subContentRadius": 3.25,
-                "subContentGap": 2.75,
-                "subContentRadiusOffset": 75,
-            },
-            "outerCircle": {"radius": 570, "gap": 12, "contentRadius": 5},
-            "outerArc": {
-                "radius": 570,
-                "gap": 10,
-                "contentRadius": 5,
-                "nameFont": "IBM Plex Mono",
-                "nameFontSize": 21,
-                "nameColor": self.COLORS["neutral"],
-                "nameRadiusOffset": 65,
-            },
-        }
-
-        # circles constants
-        self.MIDDLE_CIRCLE_CONSTANTS = {
-            "radius": 815,
-            "gap": 8,
-            "contentRadius": 5,
-            "nameRadiusOffset": 115,
-            "nameColor": self.COLORS["neutral"],
-            "nameFontSize": 50,
-        }
-
-        self.OUTER_CIRCLE_CONSTANTS = {
-            "radius": 1075,
-            "gap": 12,
-            "contentRadius": 5,
-            "nameRadiusOffset": 115,
-            "nameColor": self.COLORS["neutral"],
-            "nameFontSize": 50,
-        }
-
-        # content constants
-        self.PISCINE_CONSTANTS = {"nameOffset": 50, "radius": 35}
-        self.STAR_CONSTANTS = {"width": 24, "subContentWidth": 18}
-        self.CHECKPOINT_CONSTANTS = {"width": 22, "subContentWidth": 16}
+        # layout constants (defaults from circular_graph.layout)
+        self.LINE_CONSTANTS = copy.deepcopy(layout_defaults.LINE_CONSTANTS)
+        self.SLICE_GAP = layout_defaults.SLICE_GAP
+        self.SLICE_CONSTANTS = copy.deepcopy(layout_defaults.SLICE_CONSTANTS)
+        self.MIDDLE_CIRCLE_CONSTANTS = copy.deepcopy(
+            layout_defaults.MIDDLE_CIRCLE_CONSTANTS
+        )
+        self.OUTER_CIRCLE_CONSTANTS = copy.deepcopy(
+            layout_defaults.OUTER_CIRCLE_CONSTANTS
+        )
+        self.PISCINE_CONSTANTS = copy.deepcopy(layout_defaults.PISCINE_CONSTANTS)
+        self.STAR_CONSTANTS = copy.deepcopy(layout_defaults.STAR_CONSTANTS)
+        self.CHECKPOINT_CONSTANTS = copy.deepcopy(layout_defaults.CHECKPOINT_CONSTANTS)
 
         # Global center
         self.CURRENT_CENTER = 1000
 
+        # Notebook display (see _repr_html_): documents longer than
+        # DISPLAY_INLINE_LIMIT characters are written to DISPLAY_DIRECTORY and
+        # displayed by reference
+        self.DISPLAY_INLINE_LIMIT = 512 * 1024
+        self.DISPLAY_DIRECTORY = "vizard_graphs"
+        self.DISPLAY_COMPRESS = False
+
         self.data = data
         self.keys = None  # Initialize keys attribute
         self.color_key = None  # Initialize color_key attribute
         if self.kind == "classic":
-            try:
-                self.max_value = max(data.values())
-            except:
-                self.max_value = 0
+            self.max_value = self.compute_max_value()
         elif self.kind == "custom":
             # Validate that all values are dictionaries and have the same keys
             first_val = next(iter(data.values()))
@@ -198,19 +300,157 @@ class modular_graph:
                 self.color_key = self.keys[0]
 
             # Set max_value based on the color_key
-            try:
-                self.max_value = max(v[self.color_key] for v in data.values())
-            except:
-                self.max_value = 0
+            self.max_value = self.compute_max_value()
         self.piscines_list = piscines_list
         self.checkpoints_list = checkpoints_list
         self.mandatory_list = mandatory_list
 
         self.graph_json = graph_json
-        self.graph_dict = {"graph": json.loads(self.graph_json)}
+        if layout is None:
+            layout = CompiledLayout(
+                graph_json,
+                piscines_list,
+                checkpoints_list,
+                mandatory_list,
+                constants={name: getattr(self, name) for name in LAYOUT_CONSTANT_NAMES},
+                precision=precision,
+            )
+        elif not layout.matches(
+            graph_json, piscines_list, checkpoints_list, mandatory_list, precision
+        ):
+            raise ValueError(
+                "The given layout was compiled from another graph_json, other lists "
+                "or another precision."
+            )
+        self.layout = layout
+        self.graph_dict = {"graph": layout.graph}
+
+        # the SVG is rendered on first access (see root_svg)
+        self.svg_cache = None
+        # set while emitting the skeleton (see to_skeleton)
+        self.skeleton = False
+        # {timestamp: data} animated by the document (see from_snapshots)
+        self.snapshots = None
+        # set while emitting a progressive document (see to_progressive)
+        self.progressive = None
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # alternative constructor for time series
+    @classmethod
+    def from_snapshots(
+        cls,
+        graph_json: str,
+        snapshots: dict,
+        piscines_list: list[str],
+        checkpoints_list: list[str],
+        mandatory_list: list[str],
+        **options,
+    ) -> "modular_graph":
+        """Create a graph animating successive snapshots of the data.
+
+        The layout is compiled once and the document is rendered once, bound to
+        the first snapshot. Colors of every node at every timestamp are computed
+        as a (nodes x snapshots) matrix and embedded as a frame table listing only
+        the changed cells (see snapshot_island), played client-side by
+        `showGraphFrame(svg, index)` / `playGraphSnapshots(svg, interval)`; show
+        adds a slider and a play button. All frames share one color scale.
 
-        # create the SVG
-        self.root_svg, self.graph_svg_text = self.render_circular_map01(self.graph_dict)
+        Args:
+            graph_json (str): JSON string describing the graph layout.
+            snapshots (dict): {timestamp: data} in display order, each data in the
+                format of `data` (see __init__). Timestamps are displayed with str.
+            piscines_list (list[str]): List of  "piscines".
+            checkpoints_list (list[str]): List of checkpoints.
+            mandatory_list (list[str]): List of project names rendered as mandatory
+                (star) icons.
+            **options: Other arguments of __init__ (kind, color_key, layout...).
+
+        Raises:
+            ValueError: If there is no snapshot, if metrics=True, another detail
+                than "full" or a budget is given, or if a snapshot is invalid for the
+                kind of graph (see __init__).
+
+        Returns:
+            modular_graph: Graph bound to the first snapshot.
+        """
+        if not snapshots:
+            raise ValueError("At least one snapshot is required.")
+        if options.get("metrics"):
+            raise ValueError("metrics=True cannot be combined with snapshots.")
+        if (
+            options.get("detail", "full") != "full"
+            or options.get("max_nodes")
+            or options.get("max_bytes")
+        ):
+            raise ValueError(
+                "Snapshots require detail='full' and no max_nodes / max_bytes."
+            )
+        snapshots = {timestamp: dict(data) for timestamp, data in snapshots.items()}
+        graph = cls(
+            graph_json,
+            next(iter(snapshots.values())),
+            piscines_list,
+            checkpoints_list,
+            mandatory_list,
+            **options,
+        )
+        if graph.kind == "custom":
+            for data in snapshots.values():
+                for key, val in data.items():
+                    if not isinstance(val, dict) or list(val.keys()) != graph.keys:
+                        raise ValueError(
+                            f"Inconsistent keys in data for project '{key}'. All dictionaries must have keys: {graph.keys}"
+                        )
+        graph.snapshots = snapshots
+        # one color scale for every frame
+        graph.max_value = max(
+            graph.compute_max_value(data) for data in snapshots.values()
+        )
+        return graph
+
+    # *#########################################################################* #
+    # ************************** Rendered document ****************************** #
+    # *#########################################################################* #
+
+    @property
+    def root_svg(self):
+        """The <svg> root element, rendered on first access and cached.
+
+        Returns:
+            xml.etree.ElementTree.Element | None: Root element, or None for an
+            empty graph or when the graph was created with retain=False.
+        """
+        if not self.retain:
+            return None
+        if self.svg_cache is None:
+            self.svg_cache = {"root": self.build_svg_tree(), "text": None}
+        return self.svg_cache["root"]
+
+    @property
+    def graph_svg_text(self):
+        """Serialization of `root_svg`, computed on first access and cached.
+
+        Returns:
+            str | None: SVG document, or None for an empty graph or when the graph
+            was created with retain=False.
+        """
+        root = self.root_svg
+        if root is None:
+            return None
+        if self.svg_cache["text"] is None:
+            self.svg_cache["text"] = ET2.tostring(root, encoding="unicode")
+        return self.svg_cache["text"]
+
+    # * helper function to drop the rendered document
+    def invalidate(self):
+        """Drop the cached document, to be rendered again on next access.
+
+        Returns:
+            None
+        """
+        self.svg_cache = None
 
     # *#########################################################################* #
     # *************************************************************************** #
@@ -220,81 +460,68 @@ class modular_graph:
     # **************************************************************************  #
     # *#########################################################################* #
 
-    # * helper function to convert polar to cartesian cords
-    def polar_to_cartesian(self, center_x, center_y, radius, angle_in_degrees):
-        """Convert polar coordinates to Cartesian coordinates.
+    # * helper function to read the value used for colors
+    def color_value(self, data_value):
+        """Return the value of a data entry used for the node colors.
 
         Args:
-            center_x (float): X coordinate of the circle center.
-            center_y (float): Y coordinate of the circle center.
-            radius (float): Radius from the center to the point.
-            angle_in_degrees (float): Angle in degrees measured from the positive x-axis.
-
-        Returns:
-            dict: Dictionary with keys:
-                x (float): X coordinate of the point.
-                y (float): Y coordinate of the point.
-                angle (float): The input angle in degrees.
-        """
-        angle_in_radians = (angle_in_degrees - 90) * math.pi / 180.0
-        return {
-            "x": center_x + (radius * math.cos(angle_in_radians)),
-            "y": center_y + (radius * math.sin(angle_in_radians)),
-            "angle": angle_in_degrees,
-        }
+            data_value (Any): Entry of `self.data` (number, or dict in custom mode).
+
+        Returns:
+            Any: The entry itself (classic) or its `color_key` value (custom).
+        """
+        if self.kind == "custom":
+            return data_value[self.color_key]
+        return data_value
 
     ###############################################################################################
     ###############################################################################################
 
-    # * helper function to get arc bounding angles
-    def get_arc_bounding_angles(self, arcs_types, index, gap, ref_arc, rotate):
-        """Compute start, end and mid angles for an arc inside a reference arc.
-
-        The function distributes available angular span across entries marked as
-        'slice' (non-zero length) while treating 'line' entries as zero-length.
+    # * helper function to compute the end of the gradient
+    def compute_max_value(self, data=None):
+        """Return the largest color value of `self.data` (0 if it cannot be computed).
 
         Args:
-            arcs_types (list[str]): Sequence of 'slice'|'line' describing arc types.
-            index (int): Index of the target arc in arcs_types.
-            gap (float): Angular gap (degrees) to apply between adjacent arcs.
-            ref_arc (dict): Reference arc with 'startAngle' and 'endAngle' in degrees.
-            rotate (float): Rotation offset (degrees) to apply when ref_arc is a full circle.
+            data (dict | None, optional): Data to scan instead of `self.data`.
+                Defaults to None.
 
         Returns:
-            dict: {'startAngle': float, 'endAngle': float, 'midAngle': float}
+            int | float: Value corresponding to the end of the gradient.
         """
-        arcs_count = len(arcs_types)
-        single_arc = arcs_count == 1
-        slices_count = arcs_types.count(
-            "slice"
-        )  # Assumes 'line' takes 0 space for length calculation
+        if data is None:
+            data = self.data
+        try:
+            return max(self.color_value(v) for v in data.values())
+        except:
+            return 0
 
-        ref_arc_is_circle = ref_arc["startAngle"] == 0 and ref_arc["endAngle"] == 360
-        ref_arc_length = ref_arc["endAngle"] - ref_arc["startAngle"]
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to convert polar to cartesian cords
+    def polar_to_cartesian(self, center_x, center_y, radius, angle_in_degrees):
+        """Convert polar coordinates to Cartesian coordinates.
 
-        gaps_total_angle = gap * (arcs_count if ref_arc_is_circle else arcs_count - 1)
-        gaps_angle = 0 if single_arc else gaps_total_angle
+        See `circular_graph.layout.polar_to_cartesian`.
 
-        slice_length = (
-            (ref_arc_length - gaps_angle) / slices_count if slices_count > 0 else 0
-        )
-        arcs_lengths = [
-            slice_length if arc_type == "slice" else 0 for arc_type in arcs_types
-        ]
+        Returns:
+            dict: {'x': float, 'y': float, 'angle': float}
+        """
+        return polar_to_cartesian(center_x, center_y, radius, angle_in_degrees)
 
-        base_start_angle = (
-            rotate - (arcs_lengths[0] / 2 if arcs_lengths else 0)
-            if ref_arc_is_circle and not single_arc
-            else ref_arc["startAngle"] + rotate
-        )
+    ###############################################################################################
+    ###############################################################################################
 
-        previous_arcs_length = sum(arcs_lengths[:index]) + base_start_angle
+    # * helper function to get arc bounding angles
+    def get_arc_bounding_angles(self, arcs_types, index, gap, ref_arc, rotate):
+        """Compute start, end and mid angles for an arc inside a reference arc.
 
-        start_angle = previous_arcs_length + index * gap
-        end_angle = start_angle + arcs_lengths[index]
-        mid_angle = start_angle + (end_angle - start_angle) / 2
+        See `circular_graph.layout.get_arc_bounding_angles`.
 
-        return {"startAngle": start_angle, "endAngle": end_angle, "midAngle": mid_angle}
+        Returns:
+            dict: {'startAngle': float, 'endAngle': float, 'midAngle': float}
+        """
+        return get_arc_bounding_angles(arcs_types, index, gap, ref_arc, rotate)
 
     ###############################################################################################
     ###############################################################################################
@@ -310,107 +537,194 @@ class modular_graph:
         gap=0,
         rotate=0,
         ref_arc=None,
+        precision=None,
     ):
         """Generate SVG arc path and key points for an arc index.
 
-        Args:
-            center_coords (dict): {'x': float, 'y': float} center coordinates.
-            radius (float): Radius at which the arc lies.
-            arcs_types (list[str]): List describing each sibling arc as 'slice' or 'line'.
-            index (int): Index of the desired arc inside arcs_types.
-            reverse (bool, optional): If True, flip arc orientation for lower half. Defaults to False.
-            gap (float, optional): Angular gap between arcs in degrees. Defaults to 0.
-            rotate (float, optional): Rotation offset in degrees for circular refs. Defaults to 0.
-            ref_arc (dict, optional): Reference arc {'startAngle': float, 'endAngle': float}. If None, full circle used.
-
-        Returns:
-            dict: {
-                'path': str,         # SVG path "d" attribute
-                'start': dict,       # {'x': float, 'y': float, 'angle': float}
-                'end': dict,         # same as start
-                'middle': dict,      # mid point coords
-                'fullCircle': bool   # True if arc spans full 360°
-            }
-        """
-        if ref_arc is None:
-            ref_arc = {"startAngle": 0, "endAngle": 360}
+        See `circular_graph.layout.get_arc_coords`.
 
-        angles = self.get_arc_bounding_angles(arcs_types, index, gap, ref_arc, rotate)
-        start_angle, end_angle, mid_angle = (
-            angles["startAngle"],
-            angles["endAngle"],
-            angles["midAngle"],
+        Returns:
+            dict: {'path', 'start', 'end', 'middle', 'fullCircle'}
+        """
+        return get_arc_coords(
+            center_coords,
+            radius,
+            arcs_types,
+            index,
+            reverse,
+            gap,
+            rotate,
+            ref_arc,
+            precision,
         )
 
-        full_circle = round(end_angle) - round(start_angle) == 360
-        end_command = " Z" if full_circle else ""
+    ###############################################################################################
+    ###############################################################################################
 
-        on_circle_lower_edge = reverse and 90 < mid_angle < 270
-        large_arc_flag = (
-            1 if on_circle_lower_edge or (end_angle - start_angle > 180) else 0
-        )
-        sweep_flag = 0 if not full_circle and on_circle_lower_edge else 1
+    # * helper function extract content name
+    def get_content_name(self, content):
+        """Return a canonical content name.
 
-        flip_angle = 180 if reverse and on_circle_lower_edge else 0
-        start_angle_flipped = start_angle + flip_angle
-        end_angle_flipped = end_angle - (0.01 if full_circle else 0) + flip_angle
-        mid_angle_flipped = mid_angle + flip_angle
+        See `circular_graph.layout.get_content_name`.
 
-        start = self.polar_to_cartesian(
-            center_coords["x"], center_coords["y"], radius, start_angle_flipped
-        )
-        end = self.polar_to_cartesian(
-            center_coords["x"], center_coords["y"], radius, end_angle_flipped
-        )
-        middle = self.polar_to_cartesian(
-            center_coords["x"], center_coords["y"], radius, mid_angle_flipped
-        )
+        Returns:
+            str: Content name.
+        """
+        return get_content_name(content)
 
-        d_str = f"M {start['x']} {start['y']} A {radius} {radius} 0 {large_arc_flag} {sweep_flag} {end['x']} {end['y']}{end_command}"
-        return {
-            "path": d_str,
-            "start": start,
-            "end": end,
-            "middle": middle,
-            "fullCircle": full_circle,
-        }
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to get the info-card handlers of a node
+    def get_event_attributes(self):
+        """Return the event handler attributes to set on an interactive node.
+
+        In "inline" mode the info-card script is embedded on every node; it is
+        generated once per render and cached in `self.event_attributes`. In
+        "delegated" mode nodes carry no handler at all, the listeners being
+        installed once on the SVG root by render_circular_map01.
+
+        Returns:
+            dict: Attribute name -> JavaScript code (empty in "delegated" mode).
+        """
+        if self.event_mode == "delegated":
+            return {}
+        if self.event_attributes is None:
+            self.event_attributes = {
+                "onpointerenter": show_info_card(
+                    self.kind,
+                    self.keys if self.kind == "custom" else None,
+                    self.tooltip_mode,
+                ),
+                "onpointerleave": HIDE_INFO_CARD,
+            }
+        return self.event_attributes
 
     ###############################################################################################
     ###############################################################################################
 
-    # * helper function extract content name
-    def get_content_name(self, content):
-        """Return a canonical content name.
+    # * helper function to resolve palette colors
+    def resolve_theme(self, attributes, theme):
+        """Replace palette keys by colors in the themed attributes of an element.
 
-        If content is a dict (representing a parent with sub-contents), the
-        first key is considered the content name. Otherwise the content is
-        converted to string.
+        In restyle mode the colors are not written: themed attributes are moved to
+        the `style` attribute as `var(--<key>)` references to the custom
+        properties declared by theme_css.
 
         Args:
-            content (dict|str): Content descriptor.
+            attributes (dict): Element attributes, themed ones holding palette keys.
+            theme (tuple[str]): Names of the themed attributes.
 
         Returns:
-            str: Content name.
+            dict: Attributes ready to be set on the element.
         """
-        if isinstance(content, dict):
-            return list(content.keys())[0]
-        return str(content)
+        if not self.restyle:
+            return {
+                k: self.COLORS.get(v, v) if k in theme else v
+                for k, v in attributes.items()
+            }
+        resolved = {}
+        declarations = []
+        for k, v in attributes.items():
+            if k in theme and v in self.COLORS:
+                declarations.append(f"{k}: var(--{v});")
+            else:
+                resolved[k] = v
+        if declarations:
+            style = resolved.get("style", "")
+            resolved["style"] = " ".join(filter(None, [style] + declarations))
+        return resolved
 
     ###############################################################################################
     ###############################################################################################
 
-    # * helper function create SVG element
-    def create_element(self, tag, attributes=None, text_content=None, ns=None):
-        """Create an XML Element for the SVG with proper namespacing.
+    # * helper function to build the theme style block
+    def theme_css(self):
+        """Return the CSS declaring the palette as custom properties of the graph.
+
+        Returns:
+            str: `#canevas { --<key>: <color>; ... }`
+        """
+        properties = " ".join(f"--{k}: {v};" for k, v in self.COLORS.items())
+        return f"#canevas {{ {properties} }}"
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to build the style block
+    def document_css(self):
+        """Return the content of the <style> block of the document.
+
+        Returns:
+            str: Palette custom properties (restyle mode) followed by the rules of
+            the style classes (css_classes mode).
+        """
+        rules = []
+        if self.restyle:
+            rules.append(self.theme_css())
+        if self.style_classes is not None:
+            rules.append(self.style_classes.css())
+        return "\n".join(rules)
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to prepare the attributes of the static elements
+    def prepare_styles(self):
+        """Resolve the attributes of the static elements and labels for this render.
+
+        Themes are resolved once per element, and in css_classes mode the
+        presentation attributes are hash-consed into `self.style_classes`. Done
+        before emitting anything, so that the <style> block can come first.
+
+        Returns:
+            None
+        """
+        self.style_classes = StyleClasses() if self.css_classes else None
+        self.static_attributes = {}
+
+        def prepare(items):
+            for item in items:
+                if "node" in item:
+                    prepare(item["children"])
+                    continue
+                attributes = item["attrs"]
+                if item["theme"]:
+                    attributes = self.resolve_theme(attributes, item["theme"])
+                if self.style_classes is not None:
+                    attributes = self.style_classes.classify(attributes)
+                self.static_attributes[id(item)] = attributes
+                prepare(item["children"])
+
+        prepare(self.layout.tree)
+        # attributes shared by every content label
+        self.label_attributes = self.resolve_theme(
+            {
+                "font-size": "12px",
+                "text-anchor": "middle",
+                "fill": "neutral",
+                "font-family": "IBM Plex Mono",
+                "style": "text-transform: uppercase;",
+            },
+            ("fill",),
+        )
+        if self.style_classes is not None:
+            self.label_attributes = self.style_classes.classify(self.label_attributes)
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function to qualify SVG names
+    def qualify(self, tag, attributes=None, ns=None):
+        """Return the ElementTree qualified tag and attributes of an SVG element.
 
         Args:
             tag (str): Element tag name (may include 'xlink:' prefix).
-            attributes (dict, optional): Attributes to set on the element.
-            text_content (str, optional): Text content for the element.
+            attributes (dict, optional): Attributes of the element.
             ns (str, optional): Namespace URI to use for the element. Defaults to the SVG namespace.
 
         Returns:
-            xml.etree.ElementTree.Element: Newly created element with attributes and text set.
+            tuple[str, dict]: Qualified tag and attributes (values converted to str).
         """
         if ns is None:
             ns = self.SVG_NS
@@ -421,14 +735,34 @@ class modular_graph:
         else:
             tag = f"{{{ns}}}{tag}"
 
-        element = ET2.Element(tag)
+        qualified = {}
         if attributes:
             for k, v in attributes.items():
                 if ":" in k:
                     prefix, local_name = k.split(":", 1)
                     if prefix == "xlink":
                         k = f"{{{self.XLINK_NS}}}{local_name}"
-                element.set(k, str(v))
+                qualified[k] = str(v)
+        return tag, qualified
+
+    ###############################################################################################
+    ###############################################################################################
+
+    # * helper function create SVG element
+    def create_element(self, tag, attributes=None, text_content=None, ns=None):
+        """Create an XML Element for the SVG with proper namespacing.
+
+        Args:
+            tag (str): Element tag name (may include 'xlink:' prefix).
+            attributes (dict, optional): Attributes to set on the element.
+            text_content (str, optional): Text content for the element.
+            ns (str, optional): Namespace URI to use for the element. Defaults to the SVG namespace.
+
+        Returns:
+            xml.etree.ElementTree.Element: Newly created element with attributes and text set.
+        """
+        tag, attributes = self.qualify(tag, attributes, ns)
+        element = ET2.Element(tag, attributes)
         if text_content:
             element.text = text_content
         return element
@@ -437,1157 +771,1363 @@ class modular_graph:
     ###############################################################################################
 
     # * icon rendering function star icon
-    def render_star_icon(self, x, y, fill, width, name, content_name, value):
-        """Render a star SVG icon group.
+    def render_star_icon(self, node, fill, value):
+        """Render a star icon as a <use> of the shared star symbol.
 
         Args:
-            x (int): X coordinate (center) for icon placement.
-            y (int): Y coordinate (center) for icon placement.
+            node (dict): Layout node (position, transform and name of the content).
             fill (str): Fill color for the star.
-            width (int): Width used for scaling the star.
-            name (str): Element id for the star.
-            content_name (str): Human readable project/content name.
-            value (Any): Tooltip or numeric value stored on the element.
+            value (Any): Tooltip or numeric value stored on the element (None: no
+                `data-tooltip` attribute).
 
         Returns:
-            xml.etree.ElementTree.Element: <g> group containing the star icon.
+            xml.etree.ElementTree.Element: <use> element placing the star icon.
         """
-        g = self.create_element(
-            "g",
-            {
-                "transform": f"translate({x - width / 2}, {y - width / 2}) scale({width/130})"
-            },
-        )
-        title = self.create_element("title", text_content="Star icon")
-        path = self.create_element(
-            "path",
-            {
-                "fill": fill,
-                "d": "M65 11l18 35 39 6-28 28 6 39-35-18-35 18 6-39L8 52l39-6 18-35z",
-                "cx": str(x),
-                "cy": str(y),
-                "id": name,
-                "project-name": content_name,
-                "data-tooltip": str(value),
-                "onpointerenter": show_info_card(
-                    self.kind, self.keys if self.kind == "custom" else None
-                ),
-                "onpointerleave": 'document.getElementById("info_card").style.visibility = "hidden";',
-            },
-        )
-        g.append(title)
-        g.append(path)
-        return g
+        attributes = {
+            "xlink:href": f"#{STAR_SYMBOL_ID}",
+            "transform": self.layout.transforms[node["index"]],
+            "fill": fill,
+            "cx": self.layout.formatted_x[node["index"]],
+            "cy": self.layout.formatted_y[node["index"]],
+            "id": node["name"],
+            "project-name": node["name"],
+            "data-tooltip": str(value),
+            **self.get_event_attributes(),
+        }
+        if value is None:
+            del attributes["data-tooltip"]
+        return self.create_element("use", attributes)
 
     ###############################################################################################
     ###############################################################################################
 
     # icon rendering function checkpoint icon
-    def render_checkpoint_icon(self, x, y, fill, width):
-        """Render a checkpoint (flag) SVG icon group.
+    def render_checkpoint_icon(self, node, fill):
+        """Render a checkpoint (flag) icon as a <use> of the shared checkpoint symbol.
 
         Args:
-            x (int): X coordinate (center) for icon placement.
-            y (int): Y coordinate (center) for icon placement.
+            node (dict): Layout node (position and transform of the content).
             fill (str): Fill color for the flag.
-            width (int): Width used for scaling the flag.
 
         Returns:
-            xml.etree.ElementTree.Element: <g> group containing the checkpoint icon.
+            xml.etree.ElementTree.Element: <use> element placing the checkpoint icon.
         """
-        height_factor = width / 18 * 22
-        g = self.create_element(
-            "g",
-            {
-                "transform": f"translate({x - width / 2}, {y - height_factor / 2}) scale({width/18})"
-            },
-        )
-        title = self.create_element("title", text_content="Checkpoint icon")
-        path = self.create_element(
-            "path",
+        return self.create_element(
+            "use",
             {
+                "xlink:href": f"#{CHECKPOINT_SYMBOL_ID}",
+                "transform": self.layout.transforms[node["index"]],
                 "fill": fill,
-                "fill-rule": "evenodd",
-                "clip-rule": "evenodd",
-                "d": "M0 22V0h1.645v1.427C3.29.468 6.129-.256 9.355 1.45c3.187 1.686 6.174.687 7.198.037L18 .569v11.178l-.418.255c-1.451.884-5.19 2.036-9.129.035-3.134-1.593-5.677-.338-6.497.398l-.311.278V22H0ZM6.408 9.605V6.826c-2.247-.354-3.982.556-4.666 1.17l-.097-.094v2.61a7.78 7.78 0 0 1 4.763-.907Zm4.884-1.138a9.66 9.66 0 0 0 4.857-.36v2.674c-.99.454-2.794.908-4.857.449V8.467Zm0-1.175a8.57 8.57 0 0 1-2.1-.747 8.595 8.595 0 0 0-2.784-.882V2.236c.638.11 1.32.334 2.032.71a9.9 9.9 0 0 0 2.852.998v3.348Z",
             },
         )
-        g.append(title)
-        g.append(path)
-        return g
 
     ###############################################################################################
     ###############################################################################################
 
-    # component rendering function text path (as an arc shape)
-    def render_text_path(self, parent_group, text, id_str, index, circle_params):
-        """Render an SVG textPath that follows an arc.
+    # * icon symbols
+    def render_icon_symbols(self):
+        """Render the <symbol> elements of the icons used by the layout.
 
-        Args:
-            parent_group (Element): Parent SVG group to append to.
-            text (str): Text to render along the arc.
-            id_str (str): ID to assign to the path element.
-            index (int): Index of the path (used when computing arc coords).
-            circle_params (dict): Circle configuration including radius, font settings and arcs.
+        Icons are defined once in <defs> and placed with <use>; the fill is set on
+        the <use> and inherited by the symbol path.
 
         Returns:
-            None
+            list[Element]: <symbol> elements (star and/or checkpoint).
         """
-        radius = circle_params["radius"] - (circle_params.get("nameRadiusOffset", 0))
-
-        arc_path_data = self.get_arc_coords(
-            center_coords={"x": self.CURRENT_CENTER, "y": self.CURRENT_CENTER},
-            radius=radius,
-            arcs_types=circle_params["arcs"],
-            index=index,
-            reverse=True,
-            gap=circle_params.get("gap", 0),
-            rotate=circle_params.get("rotate", 0),
-            ref_arc=circle_params.get("refArc"),
-        )
+        icons = {node["icon"] for node in self.layout.nodes}
+        symbols = []
+        if "star" in icons:
+            symbol = self.create_element(
+                "symbol", {"id": STAR_SYMBOL_ID, "overflow": "visible"}
+            )
+            symbol.append(self.create_element("title", text_content="Star icon"))
+            symbol.append(self.create_element("path", {"d": STAR_PATH}))
+            symbols.append(symbol)
+        if "checkpoint" in icons:
+            symbol = self.create_element(
+                "symbol", {"id": CHECKPOINT_SYMBOL_ID, "overflow": "visible"}
+            )
+            symbol.append(self.create_element("title", text_content="Checkpoint icon"))
+            symbol.append(
+                self.create_element(
+                    "path",
+                    {
+                        "fill-rule": "evenodd",
+                        "clip-rule": "evenodd",
+                        "d": CHECKPOINT_PATH,
+                    },
+                )
+            )
+            symbols.append(symbol)
+        return symbols
 
-        g_text_path = self.create_element("g", {"id": f"g-{id_str}"})
+    ###############################################################################################
+    ###############################################################################################
+    # * helper function to know if the fills are switched client-side
+    def marks_nodes(self):
+        """Return whether the nodes are recolored client-side.
 
-        path_el = self.create_element(
-            "path", {"d": arc_path_data["path"], "id": id_str, "fill": "none"}
-        )
-        g_text_path.append(path_el)
+        The skeleton (see to_skeleton), the metric selector (metrics=True) and
+        the snapshot player (see from_snapshots) address the nodes through
+        `data-node` markers, and color every piscine with its own gradient.
 
-        text_el = self.create_element(
-            "text",
-            {
-                "fill": circle_params.get("nameColor", self.COLORS["neutral"]),
-                "text-anchor": "middle",
-                "dominant-baseline": "middle",
-                "font-size": str(circle_params.get("nameFontSize", 50)),
-                "font-family": circle_params.get("nameFont", "IBM Plex Sans"),
-            },
-        )
-        text_path_el = self.create_element(
-            "textPath",
-            {
-                "startOffset": f"{50}%",
-                "xlink:href": f"#{id_str}",
-                "style": "letter-spacing: 0.75px;",
-            },
-            text_content=text,
-        )
-        text_el.append(text_path_el)
-        g_text_path.append(text_el)
-        parent_group.append(g_text_path)
+        Returns:
+            bool: True if nodes carry `data-node` markers.
+        """
+        return self.skeleton or self.metrics or self.snapshots is not None
 
     ###############################################################################################
     ###############################################################################################
+    # * helper function to get the colormap of the gradient
+    def get_colormap(self):
+        """Return the Colormap of `self.gradient_colors`, rebuilt only when they change.
 
-    # component rendering function for content
-    def render_content(
-        self,
-        parent_group,
-        content_item_data,
-        circle_props_from_parent,
-        object_attrs=None,
-        is_sub_content=False,
-        content_name=None,
-    ):
-        """Render content items (projects, piscines, checkpoints) onto a parent group.
+        Returns:
+            Colormap: Colormap of the current gradient.
+        """
+        if self.colormap is None or self.colormap.colors != self.gradient_colors:
+            self.colormap = Colormap(self.gradient_colors)
+        return self.colormap
+
+    ###############################################################################################
+    ###############################################################################################
 
-        The method dispatches to either classic or distribution rendering depending
-        on the graph kind.
+    # * data binding function
+    def bind_data(self, nodes=None, with_tooltips=True):
+        """Bind `self.data` to the nodes of the compiled layout.
+
+        No geometry is computed here: each layout node is only given the value
+        read from the data, the resulting fill color and its tooltip text. The
+        values are gathered at once from the node names kept on the layout (see
+        CompiledLayout.index_nodes).
 
         Args:
-            parent_group (Element): SVG group element to which content will be appended.
-            content_item_data (dict|str): Content descriptor or name.
-            circle_props_from_parent (dict): Positioning and size parameters for the content.
-            object_attrs (dict, optional): Additional attributes describing the object.
-            is_sub_content (bool, optional): If True, renders as a sub-content (smaller icon). Defaults to False.
-            content_name (str, optional): Human readable name to use instead of computed name.
+            nodes (list[dict] | None, optional): Layout nodes to bind. Defaults to
+                all the nodes of the layout.
+            with_tooltips (bool, optional): Compute the tooltip texts. Defaults to True.
 
         Returns:
-            None
+            list[dict]: One {'value', 'fill', 'fill_key', 'ratio', 'tooltip'}
+            entry per node, aligned with `nodes` (`self.layout.nodes` by default).
+            'tooltip' is None when the values are stored in the data island (or
+            not computed).
         """
+        names = self.layout.names
+        if nodes is not None:
+            names = names[[node["index"] for node in nodes]]
+        # the data values of all the nodes are gathered in one step
         match self.kind:
             case "custom":
-                self.render_custom_content(
-                    parent_group,
-                    content_item_data,
-                    circle_props_from_parent,
-                    object_attrs,
-                    is_sub_content,
-                    content_name,
+                data_values = np.fromiter(
+                    map(self.data.get, names, repeat({})),
+                    dtype=object,
+                    count=len(names),
+                )
+                # Use the color_key's value for color scaling
+                values = (
+                    list(map(methodcaller("get", self.color_key, 0), data_values))
+                    if self.color_key
+                    else [0] * len(names)
+                )
+                # Serialize dictionary to JSON for tooltip (data island:
+                # serialized once for the whole graph, see tooltip_island)
+                tooltips = (
+                    [json.dumps(value, default=json_default) for value in data_values]
+                    if with_tooltips and self.tooltip_mode == "attribute"
+                    else [None] * len(names)
                 )
             case "classic":
-                self.render_classic_content(
-                    parent_group,
-                    content_item_data,
-                    circle_props_from_parent,
-                    object_attrs,
-                    is_sub_content,
-                    content_name,
+                values = list(map(self.data.get, names, repeat(0)))
+                tooltips = (
+                    list(map(str, values)) if with_tooltips else [None] * len(names)
                 )
             case _:
                 raise ValueError(f"Unknown graph kind: {self.kind}")
 
+        # all the nodes are colored in one vectorized call
+        colormap = self.get_colormap()
+        ratios = colormap.ratios(values, self.max_value)
+        fills = colormap.ratio_hex(ratios).tolist()
+        bindings = [
+            {
+                "value": value,
+                "fill": self.COLORS["neutral"] if value == 0 else fill_color,
+                # palette key of the fill, if it does not come from the gradient
+                "fill_key": "neutral" if value == 0 else None,
+                # gradient position of the fill, shared by every colormap
+                "ratio": ratio,
+                "tooltip": tooltip,
+            }
+            for value, fill_color, ratio, tooltip in zip(
+                values, fills, ratios.tolist(), tooltips
+            )
+        ]
+        return bindings
+
     ################################################################################################
     ################################################################################################
-    #  rendering function for classic circular graph content (project -> integer)
-    def render_classic_content(
-        self,
-        parent_group,
-        content_item_data,
-        circle_props_from_parent,
-        object_attrs=None,
-        is_sub_content=False,
-        content_name=None,
-    ):
-        """Render a classic content node (single numeric value per project).
+    # helper function to index the data dependent fills
+    def register_fill(self, element, attribute, node, binding):
+        """Index a data dependent color attribute so it can be patched in place.
+
+        When rendering a tree, the attribute is recorded in the element index of
+        the node (see update_data). In restyle mode, fills coming from the palette
+        are also turned into `var(--<key>)` style declarations.
 
         Args:
-            parent_group (Element): SVG group to append the content to.
-            content_item_data (dict|str): Descriptor or name of the content.
-            circle_props_from_parent (dict): Circle properties (radius, angle, radii offsets).
-            object_attrs (dict, optional): Extra object attributes. Defaults to None.
-            is_sub_content (bool, optional): Whether this is a nested sub-content. Defaults to False.
-            content_name (str, optional): Optional display name override.
+            element (Element): Element holding the color.
+            attribute (str): Name of the color attribute ('fill' or 'stop-color').
+            node (dict): Layout node the color belongs to.
+            binding (dict): Binding of the node (see bind_data).
 
         Returns:
             None
         """
+        if self.element_index is not None:
+            self.element_index[node["index"]]["fills"].append((element, attribute))
+        if self.restyle and binding["fill_key"] is not None:
+            self.apply_fill(element, attribute, binding)
 
-        if object_attrs is None:
-            object_attrs = {}
-
-        name = self.get_content_name(content_item_data)
-        value = self.data.get(name, 0)
+    ################################################################################################
+    ################################################################################################
+    # helper function to set a data dependent color
+    def apply_fill(self, element, attribute, binding):
+        """Set the color of a binding on an element.
 
-        coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            circle_props_from_parent["radius"],
-            circle_props_from_parent["angle"],
-        )
-        x, y = coords["x"], coords["y"]
+        In restyle mode, palette colors are written as `var(--<key>)` style
+        declarations and gradient colors as attributes.
 
-        has_sub_contents = isinstance(content_item_data, dict)
+        Args:
+            element (Element): Element holding the color.
+            attribute (str): Name of the color attribute ('fill' or 'stop-color').
+            binding (dict): Binding giving the color (see bind_data).
 
-        content_group = self.create_element("g", {"id": name})
-        parent_group.append(content_group)
+        Returns:
+            None
+        """
+        style = element.get("style")
+        if not self.restyle or binding["fill_key"] is None:
+            element.set(attribute, binding["fill"])
+            if style and f"{attribute}: var(--" in style:
+                style = re.sub(rf"\s*{attribute}: var\(--[^)]*\);", "", style).strip()
+                if style:
+                    element.set("style", style)
+                else:
+                    del element.attrib["style"]
+            return
+        element.attrib.pop(attribute, None)
+        if style and f"{attribute}: var(--" in style:
+            style = re.sub(rf"\s*{attribute}: var\(--[^)]*\);", "", style).strip()
+        declaration = f"{attribute}: var(--{binding['fill_key']});"
+        element.set("style", f"{style} {declaration}" if style else declaration)
 
-        obj_mandatory = name in self.mandatory_list
-        is_piscine = name in self.piscines_list
-        fill_color = ""
-        fill_color = (
-            self.COLORS["neutral"]
-            if value == 0
-            else value_to_color(value, self.max_value, self.gradient_colors)
-        )
+    ################################################################################################
+    ################################################################################################
+    # component rendering function for content
+    def render_content(self, target, node, binding, children):
+        """Render a content item (project, piscine, checkpoint) through a render target.
 
-        icon_radius = (
-            self.PISCINE_CONSTANTS["radius"]
-            if is_piscine
-            else circle_props_from_parent.get("contentRadius", 4)
-        )
+        Args:
+            target (SVGTreeBuilder | SVGStreamWriter): Render target receiving the elements.
+            node (dict): Layout node describing the content and its position.
+            binding (dict): {'value', 'fill', 'fill_key', 'tooltip'} bound to the node.
+            children (list): Layout items nested in the content (sub-contents).
 
-        if name in self.checkpoints_list:
-            icon = self.render_checkpoint_icon(
-                x,
-                y,
-                fill_color,
-                (
-                    self.CHECKPOINT_CONSTANTS["subContentWidth"]
-                    if is_sub_content
-                    else self.CHECKPOINT_CONSTANTS["width"]
-                ),
-            )
-            content_group.append(icon)
-        elif obj_mandatory:
-            icon = self.render_star_icon(
-                x,
-                y,
-                fill_color,
-                (
-                    self.STAR_CONSTANTS["subContentWidth"]
-                    if is_sub_content
-                    else self.STAR_CONSTANTS["width"]
-                ),
-                name,
-                name if not content_name else content_name,
-                value,
-            )
-            content_group.append(icon)
+        Returns:
+            None
+        """
+        name = node["name"]
+        index = node["index"]
+        fill_color = binding["fill"]
+        layout = self.layout
+        fmt = layout.format_number
+
+        group_tag, group_attributes = self.qualify("g", {"id": name})
+        target.start(group_tag, group_attributes)
+
+        if node["icon"] == "checkpoint":
+            icon = self.render_checkpoint_icon(node, fill_color)
+            self.register_fill(icon, "fill", node, binding)
+            if self.marks_nodes():
+                icon.set("data-node", str(node["index"]))
+            target.element(icon)
+        elif node["icon"] == "star":
+            icon = self.render_star_icon(node, fill_color, binding["tooltip"])
+            self.register_fill(icon, "fill", node, binding)
+            if self.element_index is not None:
+                self.element_index[node["index"]]["tooltip"] = icon
+            if self.marks_nodes():
+                icon.set("data-node", str(node["index"]))
+            target.element(icon)
         else:
-            if is_piscine:
-                gradient = self.create_element(
-                    "radialGradient",
-                    attributes={
-                        "id": content_item_data + "_gradient",
-                        "cx": "50%",
-                        "cy": "50%",
-                        "r": "50%",
-                        "fx": "50%",
-                        "fy": "50%",
-                    },
-                )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "0%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "1",
-                        },
-                    )
-                )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "40%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "0.5",
-                        },
-                    )
-                )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "100%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "0",
-                        },
-                    )
-                )
-                self.defs.append(gradient)
-
             circle_el = self.create_element(
                 "circle",
                 {
                     "fill": (
                         fill_color
-                        if not is_piscine
-                        else f"url(#{content_item_data}_gradient)"
+                        if not node["is_piscine"]
+                        else f"url(#{self.piscine_gradients[node['index']]})"
                     ),
-                    "r": str(icon_radius),
-                    "cx": str(x),
-                    "cy": str(y),
+                    "r": fmt(node["icon_radius"]),
+                    "cx": layout.formatted_x[index],
+                    "cy": layout.formatted_y[index],
                     "id": name,
-                    "project-name": name if not content_name else content_name,
-                    "data-tooltip": str(value),
-                    "onpointerenter": show_info_card(
-                        self.kind, self.keys if self.kind == "custom" else None
-                    ),
-                    "onpointerleave": 'document.getElementById("info_card").style.visibility = "hidden";',
+                    "project-name": name,
+                    "data-tooltip": binding["tooltip"],
+                    **self.get_event_attributes(),
                 },
             )
-            content_group.append(circle_el)
+            if binding["tooltip"] is None:
+                del circle_el.attrib["data-tooltip"]
+            if not node["is_piscine"]:
+                self.register_fill(circle_el, "fill", node, binding)
+            if self.element_index is not None:
+                entry = self.element_index[node["index"]]
+                entry["tooltip"] = circle_el
+                if node["is_piscine"]:
+                    entry["piscine"] = circle_el
+            if self.marks_nodes():
+                circle_el.set("data-node", str(node["index"]))
+            target.element(circle_el)
 
         # Content name text
-        name_offset = (
-            self.PISCINE_CONSTANTS["nameOffset"]
-            if is_piscine
-            else circle_props_from_parent.get("contentNameOffset", 34)
-        )
-        if not is_sub_content:
+        if node["has_label"] and self.shows_label(node):
             text_el = self.create_element(
                 "text",
                 {
-                    "x": str(x),
-                    "y": str(y + name_offset),
-                    "font-size": "12px",
-                    "text-anchor": "middle",
-                    "fill": self.COLORS["neutral"],
-                    "font-family": "IBM Plex Mono",
-                    "style": "text-transform: uppercase;",
+                    "x": layout.formatted_x[index],
+                    "y": layout.formatted_label_y[index],
+                    **self.label_attributes,
                 },
                 text_content=name,
             )
-            content_group.append(text_el)
+            target.element(text_el)
 
-        if has_sub_contents:
-            self.render_sub_contents(
-                content_group, content_item_data, circle_props_from_parent
+        if self.detail_level == "full":
+            self.render_layout_items(target, children)
+        else:
+            # sub-contents collapsed into one glyph
+            self.render_layout_items(
+                target, [item for item in children if "node" not in item]
             )
+            sub_indices = [item["node"] for item in children if "node" in item]
+            if sub_indices:
+                target.element(self.render_aggregate(node, sub_indices))
+        target.end(group_tag)
 
     ################################################################################################
     ################################################################################################
-    # rendering function for custom content (project -> dictionary)
-    def render_custom_content(
-        self,
-        parent_group,
-        content_item_data,
-        circle_props_from_parent,
-        object_attrs=None,
-        is_sub_content=False,
-        content_name=None,
-    ):
-        """Render a custom content node (dictionary value per project).
+    # * helper function to filter the labels by level of detail
+    def shows_label(self, node):
+        """Return whether the label of a node is emitted at the current level of detail.
+
+        Args:
+            node (dict): Layout node with a label.
+
+        Returns:
+            bool: False for every node at "minimal" and for the dense labels (see
+            CompiledLayout.dense_labels) at "overview", True otherwise.
+        """
+        if self.detail_level == "minimal":
+            return False
+        if self.detail_level == "overview":
+            return node["index"] not in self.layout.dense_labels()
+        return True
+
+    ################################################################################################
+    ################################################################################################
+    # component rendering function for collapsed sub-contents
+    def render_aggregate(self, node, sub_indices):
+        """Build the glyph standing for the sub-contents of a content.
+
+        The glyph sits on the sub-content ring at the angle of its parent, grows
+        with the number of sub-contents and is colored by their mean value.
+
+        Args:
+            node (dict): Layout node of the parent content.
+            sub_indices (list[int]): Layout indices of its sub-contents.
+
+        Returns:
+            Element: <circle> with a `data-count` attribute.
+        """
+        fmt = self.layout.format_number
+        sub_nodes = [self.layout.nodes[index] for index in sub_indices]
+        values = [self.bindings[index]["value"] for index in sub_indices]
+        mean = sum(values) / len(values)
+        if mean == 0:
+            binding = {"fill": self.COLORS["neutral"], "fill_key": "neutral"}
+        else:
+            colormap = self.get_colormap()
+            binding = {
+                "fill": colormap.to_hex([mean], self.max_value)[0],
+                "fill_key": None,
+            }
+        coords = polar_to_cartesian(
+            self.layout.center,
+            self.layout.center,
+            sub_nodes[0]["radius"],
+            node["angle"],
+        )
+        aggregate = self.create_element(
+            "circle",
+            {
+                "r": fmt(sub_nodes[0]["icon_radius"] * min(len(sub_nodes) ** 0.5, 3)),
+                "cx": fmt(coords["x"]),
+                "cy": fmt(coords["y"]),
+                "data-count": str(len(sub_nodes)),
+            },
+        )
+        self.apply_fill(aggregate, "fill", binding)
+        return aggregate
+
+    ################################################################################################
+    ################################################################################################
+    # component rendering function for the layout skeleton
+    def render_layout_items(self, target, items):
+        """Render layout items (static elements and content nodes) through a render target.
 
         Args:
-            parent_group (Element): SVG group to append the content to.
-            content_item_data (dict|str): Descriptor or name of the content.
-            circle_props_from_parent (dict): Circle properties (radius, angle, radii offsets).
-            object_attrs (dict, optional): Extra object attributes. Defaults to None.
-            is_sub_content (bool, optional): Whether this is a nested sub-content. Defaults to False.
-            content_name (str, optional): Optional display name override.
+            target (SVGTreeBuilder | SVGStreamWriter): Render target receiving the elements.
+            items (list): Items from `self.layout.tree` (or nested children).
 
         Returns:
             None
         """
+        for item in items:
+            if "node" in item:
+                self.render_content(
+                    target,
+                    self.layout.nodes[item["node"]],
+                    self.bindings[item["node"]],
+                    item["children"],
+                )
+                continue
+            tag, attributes = self.qualify(
+                item["tag"], self.static_attributes[id(item)]
+            )
+            target.start(tag, attributes)
+            if item["text"]:
+                target.data(item["text"])
+            self.render_layout_items(target, item["children"])
+            target.end(tag)
 
-        if object_attrs is None:
-            object_attrs = {}
+    ################################################################################################
+    ################################################################################################
+    # component rendering function for the defs
+    def render_defs(self):
+        """Build the <defs> element: icon symbols, piscine gradients and filters.
 
-        name = self.get_content_name(content_item_data)
-        data_value = self.data.get(name, {})
+        The gradients are collected from the bound layout nodes before any node
+        is rendered, so that the defs can be emitted ahead of the nodes. Piscines
+        sharing a fill share one gradient (except when the fills are switched
+        client-side, see marks_nodes), named `<name>_gradient` after the first
+        of them; `self.piscine_gradients` maps the index of each piscine node to
+        the id of its gradient.
 
-        # Use the color_key's value for color scaling
-        value_for_color = data_value.get(self.color_key, 0) if self.color_key else 0
+        Returns:
+            tuple[Element, dict]: The <defs> element and the gradients by key
+            ({'id', 'element', 'nodes'}, see gradient_key).
+        """
+        defs = self.create_element("defs")
+        for symbol in self.render_icon_symbols():
+            defs.append(symbol)
+
+        self.piscine_gradients = {}
+        gradients = {}
+        for node, binding in zip(self.layout.nodes, self.bindings):
+            if node["icon"] != "circle" or not node["is_piscine"]:
+                continue
+            # the client-side fills color each piscine separately
+            separate = self.marks_nodes()
+            key = node["index"] if separate else self.gradient_key(binding)
+            gradient = gradients.get(key)
+            if gradient is None:
+                gradient = self.render_piscine_gradient(
+                    f"{node['name']}_gradient", binding
+                )
+                if separate:
+                    gradient["element"].set("data-node", str(node["index"]))
+                gradients[key] = gradient
+                defs.append(gradient["element"])
+            gradient["nodes"].add(node["index"])
+            self.piscine_gradients[node["index"]] = gradient["id"]
+            if self.element_index is not None:
+                self.element_index[node["index"]]["gradient_key"] = key
 
-        coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            circle_props_from_parent["radius"],
-            circle_props_from_parent["angle"],
+        # Add filter
+        """
+        <filter color-interpolation-filters="sRGB" filterunits="userSpaceOnUse" height="63" id="filter7_f_1_272"
+                width="65" x="855" y="994">
+                <feflood flood-opacity="0" result="BackgroundImageFix"></feflood>
+                <feblend in="SourceGraphic" in2="BackgroundImageFix" mode="normal" result="shape"></feblend>
+                <fegaussianblur result="effect1_foregroundBlur_1_272" stddeviation="8.5"></fegaussianblur>
+            </filter>"""
+        filter = self.create_element(
+            "filter",
+            {
+                "color-interpolation-filters": "sRGB",
+                "filterunits": "userSpaceOnUse",
+                "height": "63",
+                "id": "filter7_f_1_272",
+                "width": "65",
+                "x": "855",
+                "y": "994",
+            },
+        )
+
+        defs.append(filter)
+        filter.append(
+            self.create_element(
+                "feflood", {"flood-opacity": "0", "result": "BackgroundImageFix"}
+            )
+        )
+        filter.append(
+            self.create_element(
+                "feblend",
+                {
+                    "in": "SourceGraphic",
+                    "in2": "BackgroundImageFix",
+                    "mode": "normal",
+                    "result": "shape",
+                },
+            )
+        )
+        filter.append(
+            self.create_element(
+                "fegaussianblur",
+                {"result": "effect1_foregroundBlur_1_272", "stddeviation": "8.5"},
+            )
         )
-        x, y = coords["x"], coords["y"]
+        return defs, gradients
+
+    ################################################################################################
+    ################################################################################################
+    # helper function to key the piscine gradients
+    def gradient_key(self, binding):
+        """Return the key under which piscine gradients are shared.
 
-        has_sub_contents = isinstance(content_item_data, dict)
+        Piscines sharing a fill share one gradient. In restyle mode the stops are
+        recolored in place, so the gradient position is used instead of the color.
 
-        content_group = self.create_element("g", {"id": name})
-        parent_group.append(content_group)
+        Args:
+            binding (dict): Binding of the piscine (see bind_data).
 
-        obj_mandatory = name in self.mandatory_list
-        is_piscine = name in self.piscines_list
+        Returns:
+            str | tuple: Fill color, or (fill_key, ratio) in restyle mode.
+        """
+        if self.restyle:
+            return binding["fill_key"], binding["ratio"]
+        return binding["fill"]
 
-        fill_color = (
-            self.COLORS["neutral"]
-            if value_for_color == 0
-            else value_to_color(value_for_color, self.max_value, self.gradient_colors)
+    ################################################################################################
+    ################################################################################################
+    # component rendering function for piscine gradients
+    def render_piscine_gradient(self, gradient_id, binding):
+        """Render the radial gradient filling piscines of a given color.
+
+        Args:
+            gradient_id (str): Id of the gradient.
+            binding (dict): Binding giving the color (see bind_data).
+
+        Returns:
+            dict: {'id', 'element' (<radialGradient>), 'nodes' (empty set of the
+            indices of the piscines using it)}.
+        """
+        gradient = self.create_element(
+            "radialGradient",
+            attributes={
+                "id": gradient_id,
+                "cx": "50%",
+                "cy": "50%",
+                "r": "50%",
+                "fx": "50%",
+                "fy": "50%",
+            },
         )
+        for offset, opacity in (("0%", "1"), ("40%", "0.5"), ("100%", "0")):
+            stop = self.create_element(
+                "stop",
+                attributes={
+                    "offset": offset,
+                    "stop-color": binding["fill"],
+                    "stop-opacity": opacity,
+                },
+            )
+            if self.restyle:
+                self.apply_fill(stop, "stop-color", binding)
+            gradient.append(stop)
+        return {"id": gradient_id, "element": gradient, "nodes": set()}
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # main emitting function for circular map 01
+    def write_document(self, target, index_elements=False, skeleton=False):
+        """Emit the compiled layout bound to the current data through a render target.
+
+        Args:
+            target (SVGTreeBuilder | SVGStreamWriter): Render target receiving the elements.
+            index_elements (bool, optional): Record the data dependent elements of
+                every node for in-place patches (tree targets only). Defaults to False.
+            skeleton (bool, optional): Emit the data independent skeleton instead:
+                neutral fills, empty tooltips, one gradient per piscine and
+                `data-node` markers for the overlay (see to_skeleton). Defaults to False.
+
+        Returns:
+            dict: {'theme_style', 'defs', 'gradients', 'element_index',
+            'tooltip_island', 'metric_island', 'snapshot_island'}, the handles
+            needed to patch a tree target in place.
+        """
+        if skeleton:
+            # the bindings of the rendered document are kept for update_data
+            bindings = self.bindings if hasattr(self, "bindings") else None
+            self.skeleton = True
+            try:
+                self.bindings = self.skeleton_bindings()
+                self.detail_level = self.resolve_detail()
+                return self.emit_document(target, index_elements)
+            finally:
+                self.skeleton = False
+                self.bindings = bindings
+        self.bindings = self.bind_data()
+        self.detail_level = self.resolve_detail()
+        return self.emit_document(target, index_elements)
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # * helper function to meet the budgets
+    def resolve_detail(self):
+        """Return the level of detail of the document bound to `self.bindings`.
+
+        Without budget, this is `self.detail`. Otherwise the levels from
+        `self.detail` to the coarsest are measured in turn (emitted to a
+        SVGCounter, nothing is kept) until one meets max_nodes and max_bytes.
+
+        Returns:
+            str: Level of detail (see DETAIL_LEVELS); the coarsest one if no level
+            meets the budgets.
+        """
+        levels = DETAIL_LEVELS[DETAIL_LEVELS.index(self.detail) :]
+        if self.max_nodes is None and self.max_bytes is None:
+            return levels[0]
+        for level in levels:
+            self.detail_level = level
+            counter = SVGCounter()
+            self.emit_document(counter, False)
+            counter.close()
+            if (self.max_nodes is None or counter.elements <= self.max_nodes) and (
+                self.max_bytes is None or counter.bytes <= self.max_bytes
+            ):
+                return level
+        return levels[-1]
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # emitting function for bound nodes
+    def emit_document(self, target, index_elements):
+        """Emit the document with the nodes bound to `self.bindings` (see write_document).
 
-        icon_radius = (
-            self.PISCINE_CONSTANTS["radius"]
-            if is_piscine
-            else circle_props_from_parent.get("contentRadius", 4)
+        Args:
+            target (SVGTreeBuilder | SVGStreamWriter): Render target receiving the elements.
+            index_elements (bool): Record the data dependent elements of every node.
+
+        Returns:
+            dict: Handles of the document (see write_document).
+        """
+        svg_size = self.layout.svg_size
+        self.CURRENT_CENTER = self.layout.center
+        # handlers are generated once per render (see get_event_attributes)
+        self.event_attributes = None
+        self.prepare_styles()
+        # data dependent elements of each node (see update_data)
+        self.element_index = (
+            [
+                {"fills": [], "tooltip": None, "piscine": None, "gradient_key": None}
+                for _ in self.layout.nodes
+            ]
+            if index_elements
+            else None
         )
 
-        # Serialize dictionary to JSON for tooltip
-        tooltip_data = json.dumps(data_value)
-
-        if name in self.checkpoints_list:
-            icon = self.render_checkpoint_icon(
-                x,
-                y,
-                fill_color,
-                (
-                    self.CHECKPOINT_CONSTANTS["subContentWidth"]
-                    if is_sub_content
-                    else self.CHECKPOINT_CONSTANTS["width"]
-                ),
+        # CORRECTED: Removed explicit xmlns and xmlns:xlink from attributes here
+        svg_tag, svg_attributes = self.qualify(
+            "svg",
+            {
+                "style": "max-width: 1500px; display: block; margin: 0 auto; ",  # Added bg for visibility
+                # "xmlns": SVG_NS, # REMOVED
+                # "xmlns:xlink": XLINK_NS, # REMOVED - create_element handles namespacing the tag, ET.tostring handles declaring the namespace
+                "viewBox": f"0 0 {svg_size} {svg_size}",
+                "id": "canevas",
+                "fill": "none",
+            },
+        )
+        if self.skeleton:
+            svg_attributes["data-layout"] = self.layout_fingerprint()
+        target.start(svg_tag, svg_attributes)
+        target.element(self.create_element("title", text_content="Module graph"))
+        theme_style = None
+        if self.restyle or self.css_classes:
+            # palette as CSS custom properties (patched by set_theme) and classes
+            theme_style = target.element(
+                self.create_element("style", text_content=self.document_css())
             )
-            content_group.append(icon)
-        elif obj_mandatory:
-            # For mandatory items, we might still want to show custom info.
-            icon = self.render_star_icon(
-                x,
-                y,
-                fill_color,
-                (
-                    self.STAR_CONSTANTS["subContentWidth"]
-                    if is_sub_content
-                    else self.STAR_CONSTANTS["width"]
-                ),
-                name,
-                name if not content_name else content_name,
-                tooltip_data,
+        defs, gradients = self.render_defs()
+        target.element(defs)
+
+        # Central point, inner, middle and outer circles
+        if self.progressive is None:
+            self.render_layout_items(target, self.layout.tree)
+        else:
+            for item in self.layout.tree:
+                if "node" not in item and item["attrs"].get("id") in DEFERRED_RINGS:
+                    self.render_deferred_ring(target, item)
+                else:
+                    self.render_layout_items(target, [item])
+
+        # Tooltip data island
+        tooltip_island = None
+        if self.tooltip_mode == "island":
+            tooltip_island = target.element(
+                self.create_element(
+                    "script",
+                    {"type": "application/json", "id": TOOLTIP_ISLAND_ID},
+                    text_content="{}" if self.skeleton else self.tooltip_island(),
+                )
             )
-            # Override onpointerenter for custom kind
-            path = icon.find(f"{{http://www.w3.org/2000/svg}}path")
-            if path is not None:
-                path.set(
-                    "onpointerenter",
-                    show_info_card(
-                        self.kind, self.keys if self.kind == "custom" else None
-                    ),
+
+        # Fills of every metric and the client-side selector
+        metric_island = None
+        if self.metrics and not self.skeleton:
+            metric_island = target.element(
+                self.create_element(
+                    "script",
+                    {"type": "application/json", "id": METRIC_ISLAND_ID},
+                    text_content=self.metric_island(),
                 )
-            content_group.append(icon)
-        else:
-            if is_piscine:
-                gradient = self.create_element(
-                    "radialGradient",
-                    attributes={
-                        "id": content_item_data + "_gradient",
-                        "cx": "50%",
-                        "cy": "50%",
-                        "r": "50%",
-                        "fx": "50%",
-                        "fy": "50%",
-                    },
+            )
+            target.element(
+                self.create_element(
+                    "script",
+                    {"type": "text/javascript"},
+                    text_content=metric_selector_script(),
                 )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "0%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "1",
-                        },
-                    )
+            )
+
+        # Frame table of the snapshots and the client-side player
+        snapshot_island = None
+        if self.snapshots is not None and not self.skeleton:
+            snapshot_island = target.element(
+                self.create_element(
+                    "script",
+                    {"type": "application/json", "id": SNAPSHOT_ISLAND_ID},
+                    text_content=self.snapshot_island(),
                 )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "40%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "0.5",
-                        },
-                    )
+            )
+            target.element(
+                self.create_element(
+                    "script",
+                    {"type": "text/javascript"},
+                    text_content=snapshot_player_script(),
                 )
-                gradient.append(
-                    self.create_element(
-                        "stop",
-                        attributes={
-                            "offset": "100%",
-                            "stop-color": fill_color,
-                            "stop-opacity": "0",
-                        },
-                    )
+            )
+
+        # Loader of the deferred rings
+        if self.progressive is not None and self.progressive["fragments"]:
+            target.element(
+                self.create_element(
+                    "script",
+                    {"type": "text/javascript"},
+                    text_content=ring_loader_script(self.progressive["eager"]),
                 )
-                self.defs.append(gradient)
+            )
 
-            circle_el = self.create_element(
-                "circle",
-                {
-                    "fill": (
-                        fill_color
-                        if not is_piscine
-                        else f"url(#{content_item_data}_gradient)"
-                    ),
-                    "r": str(icon_radius),
-                    "cx": str(x),
-                    "cy": str(y),
-                    "id": name,
-                    "project-name": name if not content_name else content_name,
-                    "data-tooltip": tooltip_data,
-                    "onpointerenter": show_info_card(
-                        self.kind, self.keys if self.kind == "custom" else None
+        # Info Card
+        target.element(self.generate_info_card())
+
+        # Delegated info-card listeners, emitted once for the whole document
+        if self.event_mode == "delegated":
+            target.element(
+                self.create_element(
+                    "script",
+                    {"type": "text/javascript"},
+                    text_content=delegated_info_card_script(
+                        self.kind,
+                        self.keys if self.kind == "custom" else None,
+                        self.tooltip_mode,
                     ),
-                    "onpointerleave": 'document.getElementById("info_card").style.visibility = "hidden";',
-                },
+                )
             )
-            content_group.append(circle_el)
+        target.end(svg_tag)
+
+        handles = {
+            "theme_style": theme_style,
+            "defs": defs,
+            "gradients": gradients,
+            "element_index": self.element_index,
+            "tooltip_island": tooltip_island,
+            "metric_island": metric_island,
+            "snapshot_island": snapshot_island,
+        }
+        self.element_index = None
+        return handles
 
-        # Content name text
-        name_offset = (
-            self.PISCINE_CONSTANTS["nameOffset"]
-            if is_piscine
-            else circle_props_from_parent.get("contentNameOffset", 34)
-        )
-        if not is_sub_content:
-            text_el = self.create_element(
-                "text",
-                {
-                    "x": str(x),
-                    "y": str(y + name_offset),
-                    "font-size": "12px",
-                    "text-anchor": "middle",
-                    "fill": self.COLORS["neutral"],
-                    "font-family": "IBM Plex Mono",
-                    "style": "text-transform: uppercase;",
-                },
-                text_content=name,
-            )
-            content_group.append(text_el)
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        if has_sub_contents:
-            self.render_sub_contents(
-                content_group, content_item_data, circle_props_from_parent
-            )
+    # component rendering function for a deferred ring
+    def render_deferred_ring(self, target, item):
+        """Emit a top-level ring as a placeholder, its content going to a fragment.
 
-    ##############################################################################################################################
-    ##############################################################################################################################
-    # component rendering function for sub_content
-    def render_sub_contents(
-        self, parent_g, content_data_with_subs, parent_circle_props
-    ):
-        """Render sub-contents for a parent content item.
+        The ring group is serialized on its own (with the namespace declarations)
+        into `self.progressive['fragments']`; the document only gets an empty
+        group with the same id and a `data-ring-src` attribute.
 
         Args:
-            parent_g (Element): Parent SVG group to append sub-content elements.
-            content_data_with_subs (dict): {name: [sub1, sub2, ...]} structure.
-            parent_circle_props (dict): Circle properties for the parent used to compute positions.
+            target (SVGTreeBuilder | SVGStreamWriter): Render target of the document.
+            item (dict): Top-level layout group of the ring.
 
         Returns:
             None
         """
-        name, sub_contents_list = list(content_data_with_subs.items())[0]
-        ##print("### -> ",sub_contents_list)
-        if not sub_contents_list:
-            return
-
-        sub_radius = (
-            parent_circle_props["radius"]
-            + self.SLICE_CONSTANTS["innerCircle"]["subContentRadiusOffset"]
+        ring_id = item["attrs"]["id"]
+        buffer = io.StringIO()
+        writer = SVGStreamWriter(buffer)
+        self.render_layout_items(writer, [item])
+        writer.close()
+        self.progressive["fragments"][ring_id] = buffer.getvalue()
+        tag, attributes = self.qualify(
+            "g",
+            {
+                "id": ring_id,
+                "data-ring-src": self.progressive["src"].format(ring=ring_id),
+            },
         )
+        target.start(tag, attributes)
+        target.end(tag)
 
-        start_coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            parent_circle_props["radius"],
-            parent_circle_props["angle"],
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # component rendering function for the tooltip data island
+    def tooltip_island(self):
+        """Serialize the values of every node for the tooltip data island.
+
+        Returns:
+            str: JSON object mapping node ids (content names) to their data
+            dictionary, serialized in a single json.dumps call.
+        """
+        return json.dumps(
+            {
+                node["name"]: self.data.get(node["name"], {})
+                for node in self.layout.nodes
+            },
+            default=json_default,
         )
-        end_coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            sub_radius,
-            parent_circle_props["angle"],
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # * helper function to color the nodes for every metric
+    def metric_fills(self):
+        """Color every node for every key of the custom data in one vectorized pass.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The end of the gradient of each key
+            (see compute_max_value) and the (nodes x keys) array of fills, the
+            column of `color_key` matching bind_data.
+        """
+        values = np.array(
+            [
+                [self.data.get(node["name"], {}).get(key, 0) for key in self.keys]
+                for node in self.layout.nodes
+            ],
+            dtype=np.float64,
+        ).reshape(len(self.layout.nodes), len(self.keys))
+        try:
+            max_values = np.array(
+                [[value[key] for key in self.keys] for value in self.data.values()],
+                dtype=np.float64,
+            ).max(axis=0)
+        except:
+            max_values = np.zeros(len(self.keys))
+        colormap = self.get_colormap()
+        fills = colormap.to_hex(values, max_values)
+        # palette color of null values (a custom property in restyle mode)
+        neutral = "var(--neutral)" if self.restyle else self.COLORS["neutral"]
+        fills[values == 0] = neutral
+        return max_values, fills
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # component rendering function for the metric data island
+    def metric_island(self):
+        """Serialize the fills of every metric for the client-side selector.
+
+        Returns:
+            str: Compact JSON `{"keys", "max", "legend", "colors", "fills"}`: fills
+            are given per key as indices into the table of distinct colors,
+            aligned with the `data-node` markers of the nodes.
+        """
+        max_values, fills = self.metric_fills()
+        colors, codes = np.unique(fills.astype(str), return_inverse=True)
+        codes = codes.reshape(fills.shape)
+        return json.dumps(
+            {
+                "keys": self.keys,
+                "max": [
+                    int(value) if value.is_integer() else value
+                    for value in max_values.tolist()
+                ],
+                "legend": list(self.gradient_colors),
+                "colors": colors.tolist(),
+                "fills": codes.T.tolist(),
+            },
+            separators=(",", ":"),
         )
 
-        # Line connecting to sub-contents
-        line_el = self.create_element(
-            "line",
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # component rendering function for the snapshot frame table
+    def snapshot_island(self):
+        """Serialize the frame table of the snapshots for the client-side player.
+
+        The colors of every node at every timestamp are computed as one
+        (nodes x snapshots) matrix. The first frame lists every node; the next
+        ones only the cells that changed since the previous frame, so the table
+        grows with the number of changes rather than with the number of
+        snapshots.
+
+        Returns:
+            str: Compact JSON `{"times", "colors", "frames"}`: each frame is
+            {'fills': flat [node index, color index, ...] list, 'tooltips':
+            {node index: tooltip}}.
+        """
+        nodes = self.layout.nodes
+        snapshots = list(self.snapshots.values())
+        default = {} if self.kind == "custom" else 0
+        raw = [
+            [data.get(node["name"], default) for data in snapshots] for node in nodes
+        ]
+        if self.kind == "custom":
+            values = [[value.get(self.color_key, 0) for value in row] for row in raw]
+        else:
+            values = raw
+        values = np.array(values, dtype=np.float64).reshape(len(nodes), len(snapshots))
+        colormap = self.get_colormap()
+        fills = colormap.to_hex(values, self.max_value)
+        # palette color of null values (a custom property in restyle mode)
+        neutral = "var(--neutral)" if self.restyle else self.COLORS["neutral"]
+        fills[values == 0] = neutral
+        colors, codes = np.unique(fills.astype(str), return_inverse=True)
+        codes = codes.reshape(fills.shape)
+
+        frames = []
+        for time in range(len(snapshots)):
+            if time == 0:
+                changed = np.arange(len(nodes))
+            else:
+                changed = np.flatnonzero(codes[:, time] != codes[:, time - 1])
+            frames.append(
+                {
+                    "fills": np.column_stack((changed, codes[changed, time]))
+                    .ravel()
+                    .tolist(),
+                    "tooltips": {
+                        # as written in the document (see tooltip_value)
+                        index: self.tooltip_value(row[time])
+                        for index, row in enumerate(raw)
+                        if time == 0 or row[time] != row[time - 1]
+                    },
+                }
+            )
+        return json.dumps(
             {
-                "x1": str(start_coords["x"]),
-                "y1": str(start_coords["y"]),
-                "x2": str(end_coords["x"]),
-                "y2": str(end_coords["y"]),
-                "stroke": self.COLORS["neutral"],
-                "stroke-width": "1",
-                "opacity": "0.5",
-                # Simplified: no gradient
+                "times": list(map(str, self.snapshots)),
+                "colors": colors.tolist(),
+                "frames": frames,
             },
+            separators=(",", ":"),
         )
-        parent_g.append(line_el)
-
-        total_gap_offset = (
-            len(sub_contents_list) - (len(sub_contents_list) % 2)
-        ) * self.SLICE_CONSTANTS["innerCircle"]["subContentGap"]
-
-        for i, sub_name in enumerate(sub_contents_list):
-            gap_offset = self.SLICE_CONSTANTS["innerCircle"]["subContentGap"] * i
-            angle_offset = gap_offset - total_gap_offset / 2
-            sub_angle = parent_circle_props["angle"] + angle_offset
-            sub_circle_props = {
-                **parent_circle_props,
-                "radius": sub_radius,
-                "angle": sub_angle,
-                "contentRadius": parent_circle_props.get(
-                    "subContentRadius",
-                    self.SLICE_CONSTANTS["innerCircle"]["subContentRadius"],
-                ),
-            }
 
-            self.render_content(
-                parent_g,
-                sub_name,
-                sub_circle_props,
-                is_sub_content=True,
-                content_name=None,
-            )
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # tree rendering function for circular map 01
+    def build_svg_tree(self):
+        """Render the compiled layout bound to the current data as an ElementTree.
+
+        Returns:
+            Element | None: The <svg> root element, or None if the graph is empty.
+        """
+        if not self.layout.graph:
+            return None
+        builder = SVGTreeBuilder()
+        handles = self.write_document(builder, index_elements=True)
+        self.theme_style = handles["theme_style"]
+        self.svg_defs = handles["defs"]
+        self.gradients = handles["gradients"]
+        self.gradient_serial = len(self.gradients)
+        self.node_elements = handles["element_index"]
+        self.tooltip_island_element = handles["tooltip_island"]
+        self.metric_island_element = handles["metric_island"]
+        self.snapshot_island_element = handles["snapshot_island"]
+        # in-place patches only know the nodes of a full document
+        self.rendered_detail = self.detail_level
+        return builder.close()
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # main rendering function for circular map 01
+    def render_circular_map01(self, graph_data=None):
+        """Render the compiled layout bound to the current data as an SVG document.
+
+        The result is not cached: use `root_svg` / `graph_svg_text` instead.
+
+        Args:
+            graph_data (dict | None, optional): Kept for compatibility with the
+                former signature: `{"graph": parsed graph_json}`, which must be the
+                compiled graph (`self.graph_dict`). Defaults to None.
+
+        Raises:
+            ValueError: If graph_data is not the graph of the compiled layout.
+
+        Returns:
+            tuple[Element, str]: The <svg> root element and its serialization,
+            or (None, None) if the graph is empty.
+        """
+        if graph_data is not None and graph_data.get("graph", {}) != self.layout.graph:
+            raise ValueError(
+                "graph_data must be the compiled graph (graph_dict): create another "
+                "modular_graph to render another graph_json."
+            )
+        root = self.build_svg_tree()
+        if root is None:
+            return None, None
+        return root, ET2.tostring(root, encoding="unicode")
+
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-    #####################################################################################################################################################
-    #####################################################################################################################################################
+    # streaming rendering function
+    def write_svg(self, fp):
+        """Serialize the graph to a file-like object without building an ElementTree.
 
-    # component rendering function for arc
-    def render_arc(
-        self, parent_group, section_data, circle_config_from_parent, index, id_prefix
-    ):
-        """Render an arc section and its contents.
+        Elements are written as they are produced (see SVGStreamWriter), so memory
+        stays bounded whatever the size of the graph.
 
         Args:
-            parent_group (Element): Parent SVG group to append arc elements.
-            section_data (dict): Section definition (name, contents, inner/outer arcs).
-            circle_config_from_parent (dict): Circle configuration inherited from parent.
-            index (int): Index of this arc within its siblings.
-            id_prefix (str): Prefix string used to build element ids.
+            fp: Text stream (receives str) or binary stream / io.BufferedWriter /
+                socket file (receives UTF-8 bytes).
 
         Returns:
             None
         """
+        if not self.layout.graph:
+            return
+        writer = SVGStreamWriter(fp)
+        self.write_document(writer)
+        writer.close()
 
-        arc_id = f"{id_prefix}-arc-{index + 1}"
-        arc_g = self.create_element("g", {"id": arc_id})
-        parent_group.append(arc_g)
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        arc_coords_data = self.get_arc_coords(
-            center_coords={"x": self.CURRENT_CENTER, "y": self.CURRENT_CENTER},
-            radius=circle_config_from_parent["radius"],
-            arcs_types=circle_config_from_parent["arcs"],  # list of 'slice' or 'line'
-            index=index,
-            gap=circle_config_from_parent.get("gap", 0),
-            ref_arc=circle_config_from_parent.get("refArc"),
-        )
+    # serialization function
+    def to_svg(self) -> str:
+        """Return the SVG document as a string.
 
-        contents = section_data.get("contents", [])
-        single_content = len(contents) == 1
+        Returns:
+            str: The cached serialization (rendered on first call), or a fresh
+            streamed one when the graph was created with retain=False. Empty string
+            for an empty graph.
+        """
+        if self.retain:
+            return self.graph_svg_text or ""
+        buffer = io.StringIO()
+        self.write_svg(buffer)
+        return buffer.getvalue()
 
-        if not single_content:
-            path_el = self.create_element(
-                "path",
-                {
-                    "d": arc_coords_data["path"],
-                    "fill": "none",
-                    "stroke": self.COLORS["grey"],
-                    "stroke-width": "0.25",
-                },
-            )
-            arc_g.append(path_el)
-
-        section_name_data = section_data.get("name", {})
-        if not section_name_data.get("hidden", False) and section_name_data.get("text"):
-            text_path_id = f"{arc_id}-text-path"
-            # Pass necessary config for TextPath from circle_config_from_parent
-            text_path_circle_params = {
-                **circle_config_from_parent,
-            }
-            self.render_text_path(
-                arc_g,
-                section_name_data["text"],
-                text_path_id,
-                index,
-                text_path_circle_params,
-            )
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        # Distribute contents
-        chunk_divider = len(contents) - (0 if arc_coords_data["fullCircle"] else 1)
-        if chunk_divider <= 0:
-            chunk_divider = 1  # Avoid division by zero for single items
+    # progressive serialization function
+    def to_progressive(self, src: str = "{ring}.svg", eager: bool = True) -> dict:
+        """Return the document split into a shell and one fragment per outer ring.
 
-        # Ensure angles are within a consistent range (e.g. 0-360 or -180 to 180) for proper calculation
-        start_angle_norm = arc_coords_data["start"]["angle"] % 360
-        end_angle_norm = arc_coords_data["end"]["angle"] % 360
-        if (
-            end_angle_norm < start_angle_norm and not arc_coords_data["fullCircle"]
-        ):  # handles wrap around 360
-            # this happens if arc crosses the 0/360 degree line
-            if (
-                abs(end_angle_norm - start_angle_norm) > 180
-            ):  # Large arc likely means it crossed 0
-                end_angle_norm += 360
-
-        arc_angle_length = end_angle_norm - start_angle_norm
-        if arc_coords_data["fullCircle"]:
-            arc_angle_length = 360
-
-        chunk_angle = arc_angle_length / chunk_divider if chunk_divider > 0 else 0
-
-        for i, content_item in enumerate(contents):
-            content_angle = (
-                arc_coords_data["middle"]["angle"]
-                if single_content
-                else (start_angle_norm + chunk_angle * i)
-            )
+        The shell holds everything but the middle and outer circles, replaced by
+        empty placeholders: it renders the central point and the inner circle
+        as soon as it is displayed, whatever the size of the other rings. Its
+        script (see ring_loader_script) fetches the fragments and swaps them
+        with the placeholders, after the first paint or on demand.
 
-            content_circle_props = {
-                "radius": circle_config_from_parent[
-                    "radius"
-                ],  # Content sits on the main arc radius
-                "angle": content_angle,
-                "contentRadius": circle_config_from_parent.get("contentRadius", 5),
-                "contentNameOffset": circle_config_from_parent.get(
-                    "contentNameOffset", 34
-                ),
-                # Potentially more from circle_config_from_parent if needed by render_content
+        Args:
+            src (str, optional): URL of the fragments, relative to the page, with
+                a `{ring}` field replaced by the ring id ('middle-circle' or
+                'outer-circle'). Defaults to "{ring}.svg".
+            eager (bool, optional): Load the fragments right after the first paint;
+                if False, the page calls `loadGraphRing(svg, id)` /
+                `loadGraphRings(svg)`. Defaults to True.
+
+        Returns:
+            dict: {'shell': SVG document, 'fragments': {ring id: SVG <g> fragment}}.
+            Empty shell and fragments for an empty graph.
+        """
+        if not self.layout.graph:
+            return {"shell": "", "fragments": {}}
+        self.progressive = {"src": src, "eager": eager, "fragments": {}}
+        try:
+            buffer = io.StringIO()
+            writer = SVGStreamWriter(buffer)
+            self.write_document(writer)
+            writer.close()
+            return {
+                "shell": buffer.getvalue(),
+                "fragments": self.progressive["fragments"],
             }
-            # Pass object_attrs if available for content_item
-            self.render_content(arc_g, content_item, content_circle_props)
+        finally:
+            self.progressive = None
 
     ###############################################################################################################################
     ###############################################################################################################################
 
-    # component rendering function for slice
-    def render_slice(self, parent_group, slice_data, index, all_sections_types):
-        """Render a slice containing entry point, inner arc and outer arcs.
+    # progressive export function
+    def write_progressive(
+        self, directory: str, compress: bool = False, eager: bool = True
+    ) -> str:
+        """Write a page showing the graph progressively (see to_progressive).
+
+        `directory/index.html` inlines the shell; each deferred ring is written
+        next to it as `<ring id>.svg` (or `.svg.gz`). The page must be served
+        over HTTP (browsers do not fetch from file://).
 
         Args:
-            parent_group (Element): Parent SVG group to append slice elements.
-            slice_data (dict): Slice definition (name, innerArc, outerArcs, entryPoint).
-            index (int): Slice index among siblings.
-            all_sections_types (list[str]): Sibling types used to compute angles.
+            directory (str): Output directory (created if needed).
+            compress (bool, optional): Write gzip-compressed fragments, inflated by
+                the page. Defaults to False.
+            eager (bool, optional): Load the fragments right after the first paint
+                (see to_progressive). Defaults to True.
 
         Returns:
-            None
+            str: Path of the written index.html.
         """
-        # slice_data: { name, innerArc, outerArcs, entryPoint }
-
-        slice_id = f"slice-{index + 1}"
-        slice_g = self.create_element("g", {"id": slice_id})
-        parent_group.append(slice_g)
-
-        slice_name_data = slice_data.get("name", {})
-        if not slice_name_data.get("hidden", False) and slice_name_data.get("text"):
-            text_path_id = f"{slice_id}-text-path"
-            # For slice name, use SLICE_CONSTANTS.textCircle
-            text_circle_params = {
-                **self.SLICE_CONSTANTS["textCircle"],
-                "arcs": all_sections_types,
-            }
-            self.render_text_path(
-                slice_g,
-                slice_name_data["text"],
-                text_path_id,
-                index,
-                text_circle_params,
+        os.makedirs(directory, exist_ok=True)
+        parts = self.to_progressive(
+            "{ring}.svg.gz" if compress else "{ring}.svg", eager
+        )
+        for ring_id, fragment in parts["fragments"].items():
+            payload = fragment.encode("utf-8")
+            file_name = f"{ring_id}.svg"
+            if compress:
+                payload = gzip.compress(payload, mtime=0)
+                file_name += ".gz"
+            with open(os.path.join(directory, file_name), "wb") as fp:
+                fp.write(payload)
+        path = os.path.join(directory, "index.html")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(
+                '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+                "<title>Module graph</title>\n</head>\n<body>\n"
+                f"{parts['shell']}\n</body>\n</html>\n"
             )
+        return path
 
-        # Entry Point
-        entry_point_key = slice_data.get("entryPoint")
-        if entry_point_key:
-            # Calculate outerArcCoords for entry point angle
-            outer_arc_coords_for_entry = self.get_arc_coords(
-                center_coords={"x": self.CURRENT_CENTER, "y": self.CURRENT_CENTER},
-                radius=self.SLICE_CONSTANTS["outerCircle"][
-                    "radius"
-                ],  # JS uses SLICE.outerCircle.radius
-                arcs_types=all_sections_types,
-                gap=self.SLICE_CONSTANTS["outerCircle"]["gap"],
-                index=index,
-            )
-            entry_point_circle_props = {
-                **self.SLICE_CONSTANTS["entryPointCircle"],
-                "angle": outer_arc_coords_for_entry["middle"]["angle"],
-            }
-            self.render_content(
-                slice_g,
-                entry_point_key,
-                entry_point_circle_props,
-                object_attrs={"type": "piscine"},
-            )
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        # Inner Arc
-        inner_arc_data = slice_data.get("innerArc")
-        if inner_arc_data:
-            inner_arc_circle_config = {
-                **self.SLICE_CONSTANTS["innerCircle"],
-                "arcs": all_sections_types,
-            }
-            # The 'index' for this arc within the slice is effectively the slice's index itself
-            self.render_arc(
-                slice_g,
-                inner_arc_data,
-                inner_arc_circle_config,
-                index,
-                f"{slice_id}-inner",
-            )
+    # * helper function to bind the skeleton
+    def skeleton_bindings(self):
+        """Return the data independent bindings of the skeleton.
 
-        # Outer Arcs
-        outer_arcs_data = slice_data.get("outerArcs", [])
-        if outer_arcs_data:
-            outer_arcs_types = ["slice"] * len(
-                outer_arcs_data
-            )  # Outer arcs within a slice are always 'slice' type relative to each other
-
-            # Calculate reference arc for these outer arcs based on the slice's position
-            slice_outer_coords = self.get_arc_coords(
-                center_coords={"x": self.CURRENT_CENTER, "y": self.CURRENT_CENTER},
-                radius=self.SLICE_CONSTANTS["outerArc"]["radius"],
-                arcs_types=all_sections_types,
-                gap=self.SLICE_CONSTANTS["textCircle"]["gap"],
-                index=index,
-            )
+        Every node gets the neutral color as a plain attribute (so that the
+        overlay can overwrite it) and an empty tooltip.
 
-            ref_arc_for_outer_arcs = {
-                "startAngle": slice_outer_coords["start"]["angle"],
-                "endAngle": slice_outer_coords["end"]["angle"],
+        Returns:
+            list[dict]: One binding per layout node (see bind_data).
+        """
+        return [
+            {
+                "value": 0,
+                "fill": self.COLORS["neutral"],
+                "fill_key": None,
+                "ratio": 0.0,
+                "tooltip": None if self.tooltip_mode == "island" else "",
             }
-            # Adjust refArc if only one main section (full circle span for slice)
-            if len(all_sections_types) == 1:
-                ref_arc_for_outer_arcs = {
-                    "startAngle": self.SLICE_CONSTANTS["outerArc"]["gap"] / 2,
-                    "endAngle": 360 - self.SLICE_CONSTANTS["outerArc"]["gap"] / 2,
-                }
+            for _ in self.layout.nodes
+        ]
 
-            for arc_idx, arc_data in enumerate(outer_arcs_data):
-                outer_arc_circle_config = {
-                    **self.SLICE_CONSTANTS["outerArc"],
-                    "arcs": outer_arcs_types,
-                    "refArc": ref_arc_for_outer_arcs,
-                }
-                self.render_arc(
-                    slice_g,
-                    arc_data,
-                    outer_arc_circle_config,
-                    arc_idx,
-                    f"{slice_id}-outer",
-                )
+    ###############################################################################################################################
+    ###############################################################################################################################
+
+    # * helper function to identify the skeleton
+    def layout_fingerprint(self) -> str:
+        """Return a short hash identifying the skeleton an overlay applies to.
 
-    ########################################################################################################################################################################
-    ########################################################################################################################################################################
+        Returns:
+            str: Hash of the layout inputs and of the options changing the skeleton.
+        """
+        layout = self.layout
+        description = json.dumps(
+            [
+                layout.graph_json,
+                sorted(layout.piscines_list),
+                sorted(layout.checkpoints_list),
+                sorted(layout.mandatory_list),
+                layout.precision,
+                self.kind,
+                self.keys,
+                self.tooltip_mode,
+            ]
+        )
+        return hashlib.sha1(description.encode("utf-8")).hexdigest()[:12]
 
-    def render_line_section(self, parent_group, line_data, index, all_sections_types):
-        """Render a linear section radiating from the center.
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        This function draws a radial line section used when a section is declared
-        as type 'line' instead of 'slice'. It performs these tasks:
-          - compute the section angle using the innerCircle as reference
-          - draw a line from LINE_CONSTANTS['startRadius'] to ['endRadius']
-          - render an optional rotated title near the line start
-          - evenly distribute contents along the line length and call render_content
-            for each content item
+    # skeleton export function
+    def to_skeleton(self) -> str:
+        """Return the static, data independent SVG skeleton of the graph.
 
-        Args:
-            parent_group (Element): Parent SVG group to append the line and children.
-            line_data (dict): Dictionary with keys 'name' and 'contents' for the section.
-            index (int): Index of this line section among siblings.
-            all_sections_types (list[str]): Types of all sibling sections (used for angle calc).
+        The skeleton only depends on `graph_json`, the lists and the rendering
+        options: it can be served once per graph with long-lived cache headers.
+        Nodes are neutral and marked with `data-node`; a per-dataset overlay (see
+        to_overlay) colors them client-side with the script returned by
+        `circular_graph.tools.renderer_utils.overlay_applier_script`.
 
         Returns:
-            None
+            str: SVG document (empty string for an empty graph).
         """
-        # line_data: { name, contents }
-        line_id = f"line-{index + 1}"
-        line_g = self.create_element("g", {"id": line_id})
-        parent_group.append(line_g)
-
-        # Determine line's angle based on its position among all sections
-        arc_coords_for_line_angle = self.get_arc_coords(
-            center_coords={"x": self.CURRENT_CENTER, "y": self.CURRENT_CENTER},
-            radius=self.SLICE_CONSTANTS["innerCircle"][
-                "radius"
-            ],  # Radius reference from JS for angle
-            arcs_types=all_sections_types,
-            gap=self.SLICE_CONSTANTS["innerCircle"]["gap"],
-            index=index,
-        )
-        line_angle = arc_coords_for_line_angle["start"][
-            "angle"
-        ]  # Use start angle for line orientation
-
-        start_coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            self.LINE_CONSTANTS["startRadius"],
-            line_angle,
-        )
-        end_coords = self.polar_to_cartesian(
-            self.CURRENT_CENTER,
-            self.CURRENT_CENTER,
-            self.LINE_CONSTANTS["endRadius"],
-            line_angle,
-        )
+        if not self.layout.graph:
+            return ""
+        buffer = io.StringIO()
+        writer = SVGStreamWriter(buffer)
+        self.write_document(writer, skeleton=True)
+        writer.close()
+        return buffer.getvalue()
 
-        # Line element (simplified, no gradient for now)
-        line_el = self.create_element(
-            "line",
-            {
-                "x1": str(start_coords["x"]),
-                "y1": str(start_coords["y"]),
-                "x2": str(end_coords["x"]),
-                "y2": str(end_coords["y"]),
-                "stroke": self.COLORS["neutral"],
-                "stroke-width": "1",
-                "opacity": "0.5",
-            },
-        )
-        line_g.append(line_el)
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        # Text title
-        line_name_data = line_data.get("name", {})
-        if not line_name_data.get("hidden", False) and line_name_data.get("text"):
-            on_circle_right_side = 0 <= line_angle < 180
-            text_rotation = line_angle + (-90 if on_circle_right_side else 90)
-            text_anchor = "end" if on_circle_right_side else "start"
+    # * helper function to send tooltips to client-side scripts
+    def tooltip_value(self, value):
+        """Return the tooltip of a data value as sent to the client-side scripts.
 
-            text_el = self.create_element(
-                "text",
-                {
-                    "x": str(start_coords["x"]),
-                    "y": str(start_coords["y"]),
-                    "font-size": "21px",
-                    "fill": self.COLORS["neutral"],
-                    "font-family": "IBM Plex Mono",
-                    "alignment-baseline": "middle",
-                    "text-anchor": text_anchor,
-                    "transform": f"rotate({text_rotation} {start_coords['x']} {start_coords['y']})",
-                },
-                text_content=line_name_data["text"],
-            )
-            line_g.append(text_el)
-
-        # Contents along the line
-        contents = line_data.get("contents", [])
-        line_offset_for_content = (
-            0
-            if line_name_data.get("hidden", True)
-            else self.LINE_CONSTANTS["startOffset"]
-        )
-        line_length_for_content = (
-            self.LINE_CONSTANTS["endRadius"]
-            - self.LINE_CONSTANTS["startRadius"]
-            - line_offset_for_content
-        )
+        Attribute tooltips are sent as written in the document (see bind_data),
+        so scripts set them as is (`String(5.0)` would give "5", not "5.0");
+        values of the data island are sent with native Python types.
 
-        num_contents = len(contents)
-        chunk_length = (
-            line_length_for_content / (num_contents - 1) if num_contents > 1 else 0
-        )
+        Args:
+            value: Data value of a node (number, or dictionary for custom graphs).
 
-        for i, content_item in enumerate(contents):
-            radius_for_content = (
-                self.LINE_CONSTANTS["endRadius"]
-                if num_contents == 1
-                else self.LINE_CONSTANTS["startRadius"]
-                + line_offset_for_content
-                + chunk_length * i
-            )
-            content_circle_props = {
-                "radius": radius_for_content,
-                "angle": line_angle,
-                "contentRadius": self.SLICE_CONSTANTS["innerCircle"][
-                    "contentRadius"
-                ],  # Example from inner circle
-                "contentNameOffset": self.SLICE_CONSTANTS["innerCircle"][
-                    "contentNameOffset"
-                ],
-            }
-            self.render_content(line_g, content_item, content_circle_props)
+        Returns:
+            str | dict: Tooltip text, or the value (see
+            `circular_graph.tools.json_values.to_native`) for the data island.
+        """
+        if self.kind == "classic":
+            return str(value)
+        if self.tooltip_mode == "attribute":
+            return json.dumps(value, default=json_default)
+        return to_native(value)
 
     ###############################################################################################################################
     ###############################################################################################################################
 
-    # main rendering function for circular map 01
-    def render_circular_map01(self, graph_data):
+    # overlay export function
+    def to_overlay(self) -> str:
+        """Return the per-dataset JSON overlay of the skeleton.
 
-        graph_attr = graph_data.get("graph", {})
-        if not graph_attr:
-            return None
-        # Determine SVG_SIZE and CENTER
-        svg_size = 2300 if graph_attr.get("outerCircle") else 2000
-        self.CURRENT_CENTER = svg_size / 2
+        Fills are given as indices into a table of the distinct colors; tooltips
+        are given as sent to the scripts (see tooltip_value), both aligned with
+        the `data-node` markers of the skeleton. Nothing but the data binding is
+        computed.
 
-        # CORRECTED: Removed explicit xmlns and xmlns:xlink from attributes here
-        root = self.create_element(
-            "svg",
+        Returns:
+            str: Compact JSON `{"layout", "colors", "fills", "tooltips"}`.
+        """
+        colors = {}
+        fills = [
+            colors.setdefault(binding["fill"], len(colors))
+            for binding in self.bind_data(with_tooltips=False)
+        ]
+        default = {} if self.kind == "custom" else 0
+        tooltips = [
+            self.tooltip_value(self.data.get(node["name"], default))
+            for node in self.layout.nodes
+        ]
+        return json.dumps(
             {
-                "style": "max-width: 1500px; display: block; margin: 0 auto; ",  # Added bg for visibility
-                # "xmlns": SVG_NS, # REMOVED
-                # "xmlns:xlink": XLINK_NS, # REMOVED - create_element handles namespacing the tag, ET.tostring handles declaring the namespace
-                "viewBox": f"0 0 {svg_size} {svg_size}",
-                "id": "canevas",
-                "fill": "none",
+                "layout": self.layout_fingerprint(),
+                "colors": list(colors),
+                "fills": fills,
+                "tooltips": tooltips,
             },
+            separators=(",", ":"),
+            default=json_default,
         )
-        root.append(self.create_element("title", text_content="Module graph"))
-        self.defs = self.create_element("defs")
-        root.append(self.defs)
-
-        # Central Point
-        central_point_key = graph_attr.get("centralPoint")
-        if central_point_key:
-            # Ensure object_attrs for central_point_key if its type needs to be specific
-            # Based on PDF, central point for "01 curriculums" is a "repeating checkpoint"
-            # Based on JS, this would be type: 'exam'
-            cp_attrs = {
-                "type": "exam"
-            }  # Defaulting to exam type as per JS 'Checkpoint' icon
-            # Ensure the central point's circle properties are passed correctly
-            cp_circle_props = {
-                "radius": self.SLICE_CONSTANTS["centralPointCircle"]["radius"],
-                "angle": self.SLICE_CONSTANTS["centralPointCircle"]["angle"],
-                "contentRadius": self.SLICE_CONSTANTS["centralPointCircle"][
-                    "contentRadius"
-                ],
-                # Add other necessary props if render_content expects them, e.g., contentNameOffset
-                "contentNameOffset": self.SLICE_CONSTANTS["centralPointCircle"].get(
-                    "contentNameOffset", 34
-                ),
-            }
-            self.render_content(
-                root, central_point_key, cp_circle_props, object_attrs=cp_attrs
-            )
 
-        # Inner Circle
-        inner_circle_sections = graph_attr.get("innerCircle", [])
-        if inner_circle_sections:
-            inner_g = self.create_element("g", {"id": "inner-circle"})
-            root.append(inner_g)
-            sections_types = [s.get("type", "slice") for s in inner_circle_sections]
-            for i, section in enumerate(inner_circle_sections):
-                if section.get("type") == "slice":
-                    self.render_slice(inner_g, section, i, sections_types)
-                elif section.get("type") == "line":
-                    self.render_line_section(inner_g, section, i, sections_types)
-
-        # Middle Circle
-        middle_circle_sections = graph_attr.get("middleCircle", [])
-        if middle_circle_sections:
-            middle_g = self.create_element("g", {"id": "middle-circle"})
-            root.append(middle_g)
-            middle_sections_types = ["slice"] * len(middle_circle_sections)
-            middle_circle_config = {
-                **self.MIDDLE_CIRCLE_CONSTANTS,
-                "arcs": middle_sections_types,
-            }
-            for i, section in enumerate(middle_circle_sections):
-                self.render_arc(
-                    middle_g, section, middle_circle_config, i, "middle-circle"
-                )
+    ###############################################################################################################################
+    ###############################################################################################################################
 
-        # Outer Circle
-        outer_circle_sections = graph_attr.get("outerCircle", [])
-        if outer_circle_sections:
-            outer_g = self.create_element("g", {"id": "outer-circle"})
-            root.append(outer_g)
-            outer_sections_types = ["slice"] * len(outer_circle_sections)
-            outer_circle_config = {
-                **self.OUTER_CIRCLE_CONSTANTS,
-                "arcs": outer_sections_types,
-            }
-            for i, section in enumerate(outer_circle_sections):
-                self.render_arc(
-                    outer_g, section, outer_circle_config, i, "outer-circle"
-                )
+    # layout export function
+    def layout_frame(self) -> pd.DataFrame:
+        """Return the computed layout bound to the current data as a DataFrame.
 
-        # Info Card
-        root.append(self.generate_info_card())
+        Built from the node arrays kept on the layout (see CompiledLayout.place_nodes
+        and CompiledLayout.index_nodes) and the data binding (see bind_data):
+        nothing is rendered or parsed. Rows follow the document order of the
+        nodes at full detail; the index is the node index used by the
+        `data-node` markers.
 
-        # Add filter
+        Returns:
+            pd.DataFrame: One row per node, with the columns
+                - id (string): id of the node elements (content name)
+                - display_name (string): label text as displayed (uppercase), NA
+                  for sub-contents (no label)
+                - parent (string): parent content of a sub-content, NA otherwise
+                - ring (category): one of LAYOUT_RINGS
+                - slice, section (string): ids of the enclosing groups, NA for the
+                  central point
+                - role (category): one of NODE_ROLES
+                - angle (float64): polar angle in degrees (0 at the top, clockwise)
+                - radius, x, y (float64): polar radius and position, in SVG units
+                - value (float64): value bound to the node (color_key value for
+                  custom graphs), 0 when missing
+                - fill (string): bound color (the center color of the gradient of
+                  a piscine)
         """
-        <filter color-interpolation-filters="sRGB" filterunits="userSpaceOnUse" height="63" id="filter7_f_1_272"
-                width="65" x="855" y="994">
-                <feflood flood-opacity="0" result="BackgroundImageFix"></feflood>
-                <feblend in="SourceGraphic" in2="BackgroundImageFix" mode="normal" result="shape"></feblend>
-                <fegaussianblur result="effect1_foregroundBlur_1_272" stddeviation="8.5"></fegaussianblur>
-            </filter>"""
-        filter = self.create_element(
-            "filter",
+        layout = self.layout
+        bindings = self.bind_data(with_tooltips=False)
+        ids = pd.Series(layout.names, dtype="string")
+        return pd.DataFrame(
             {
-                "color-interpolation-filters": "sRGB",
-                "filterunits": "userSpaceOnUse",
-                "height": "63",
-                "id": "filter7_f_1_272",
-                "width": "65",
-                "x": "855",
-                "y": "994",
+                "id": ids.array,
+                "display_name": ids.str.upper().where(layout.has_label).array,
+                "parent": pd.array(layout.parents, dtype="string"),
+                "ring": pd.Categorical.from_codes(
+                    layout.ring_codes, categories=LAYOUT_RINGS
+                ),
+                "slice": pd.array(layout.slices, dtype="string"),
+                "section": pd.array(layout.sections, dtype="string"),
+                "role": pd.Categorical.from_codes(
+                    layout.role_codes, categories=NODE_ROLES
+                ),
+                "angle": layout.angles,
+                "radius": layout.radii,
+                "x": layout.xs,
+                "y": layout.ys,
+                "value": np.array(
+                    [binding["value"] for binding in bindings], dtype=np.float64
+                ),
+                "fill": pd.array(
+                    [binding["fill"] for binding in bindings], dtype="string"
+                ),
             },
+            index=pd.RangeIndex(len(layout.nodes), name="node"),
         )
 
-        self.defs.append(filter)
-        filter.append(
-            self.create_element(
-                "feflood", {"flood-opacity": "0", "result": "BackgroundImageFix"}
-            )
-        )
-        filter.append(
-            self.create_element(
-                "feblend",
-                {
-                    "in": "SourceGraphic",
-                    "in2": "BackgroundImageFix",
-                    "mode": "normal",
-                    "result": "shape",
-                },
-            )
-        )
-        filter.append(
-            self.create_element(
-                "fegaussianblur",
-                {"result": "effect1_foregroundBlur_1_272", "stddeviation": "8.5"},
-            )
-        )
-        return root, ET2.tostring(root, encoding="unicode")
-
     ###############################################################################################################################
     ###############################################################################################################################
     # main function to generate info card
@@ -1816,23 +2356,181 @@ class modular_graph:
     ###############################################################################################################################
     ###############################################################################################################################
     # component display graph visualization
-    def show(self):
+    def show(
+        self,
+        reference: bool = False,
+        directory: str | None = None,
+        compress: bool | None = None,
+    ):
         """Display the rendered SVG as HTML in an IPython environment.
 
+        The gradient legend and the graph (with its controls) are displayed in
+        one `<div class="graph-view">`, where the client-side scripts updating
+        the legend look for it.
+
+        Args:
+            reference (bool, optional): If True, the SVG is written to a
+                content-addressed file (see save_svg) and the notebook only stores a
+                reference to it, loaded by the page. Defaults to False (inlined).
+            directory (str | None, optional): Directory of the file, relative to the
+                notebook. Defaults to DISPLAY_DIRECTORY.
+            compress (bool | None, optional): Write the file gzip-compressed.
+                Defaults to DISPLAY_COMPRESS.
+
         Returns:
             None
         """
-        if not self.graph_svg_text:
+        svg_text = self.to_svg()
+        if not svg_text:
             print("No SVG data to display.")
             return
-        create_gradient_html(
-            start_color_hex=self.gradient_colors[0],
-            mid_color_hex=self.gradient_colors[1],
-            end_color_hex=self.gradient_colors[2],
-            min_val=0,
-            max_val=int(self.max_value),
+        if reference:
+            svg_text = self.reference_html(directory, compress)
+        if self.metrics:
+            svg_text = f"<div>{metric_selector_html(self.keys, self.color_key)}{svg_text}</div>"
+        if self.snapshots is not None:
+            svg_text = f"<div>{snapshot_player_html(list(map(str, self.snapshots)))}{svg_text}</div>"
+        display(HTML(f'<div class="graph-view">{self.legend_svg()}{svg_text}</div>'))
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # component gradient legend
+    def legend_svg(self, standalone: bool = True) -> str:
+        """Return the gradient legend of the graph (0 to max_value) as SVG markup.
+
+        Args:
+            standalone (bool, optional): If True, an `<svg>` document; otherwise a
+                `<g>` fragment to embed in another SVG (see
+                color_tools.gradient.gradient_legend_svg). Defaults to True.
+
+        Returns:
+            str: SVG markup of the legend, cached per colors and bounds.
+        """
+        return gradient_legend_svg(
+            *self.gradient_colors[:3], 0, int(self.max_value), standalone
+        )
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # content-addressed export
+    def save_svg(
+        self, directory: str | None = None, compress: bool | None = None
+    ) -> str:
+        """Write the SVG document to a file named after the hash of its content.
+
+        A document already written (same content, same compression) is not
+        written again, so repeated displays of the same graph reuse the file.
+
+        Args:
+            directory (str | None, optional): Directory of the file (created if
+                needed). Defaults to DISPLAY_DIRECTORY.
+            compress (bool | None, optional): Write the file gzip-compressed
+                (`.svg.gz`). Defaults to DISPLAY_COMPRESS.
+
+        Returns:
+            str: Path of the file ('<directory>/<sha1 prefix>.svg[.gz]').
+        """
+        if directory is None:
+            directory = self.DISPLAY_DIRECTORY
+        if compress is None:
+            compress = self.DISPLAY_COMPRESS
+        payload = self.to_svg().encode("utf-8")
+        name = hashlib.sha1(payload).hexdigest()[:16] + (
+            ".svg.gz" if compress else ".svg"
+        )
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            if compress:
+                payload = gzip.compress(payload, mtime=0)
+            # written next to its final name, so a partial file is never reused
+            with open(f"{path}.tmp", "wb") as fp:
+                fp.write(payload)
+            os.replace(f"{path}.tmp", path)
+        return path
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # component display by reference
+    def reference_html(
+        self, directory: str | None = None, compress: bool | None = None
+    ) -> str:
+        """Return an HTML fragment loading the SVG from its file (see save_svg).
+
+        The document is fetched by the page (and inflated if compressed) once
+        the fragment is displayed; its scripts are run, so the info card works as
+        with an inlined document. The file is looked up relative to the page
+        first, then through the `/files/` route of the Jupyter server when the
+        notebook path is known (see jupyter_files_path): JupyterLab answers the
+        relative URL with its own page.
+
+        Args:
+            directory (str | None, optional): Directory of the file, relative to the
+                page. Defaults to DISPLAY_DIRECTORY.
+            compress (bool | None, optional): Write the file gzip-compressed.
+                Defaults to DISPLAY_COMPRESS.
+
+        Returns:
+            str: HTML fragment (a few hundred bytes plus the loader script).
+        """
+        path = self.save_svg(directory, compress)
+        files_path = self.jupyter_files_path(path)
+        files_src = f' data-files-src="{files_path}"' if files_path else ""
+        return (
+            f'<div class="graph-panel" data-src="{path.replace(os.sep, "/")}"{files_src}>'
+            '<div class="graph-frame"></div></div>'
+            f"<script>{lazy_panel_script()}</script>"
+        )
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # * helper function to reach a file through the Jupyter server
+    def jupyter_files_path(self, path: str) -> str | None:
+        """Return the URL of a file under the `/files/` route of the Jupyter server.
+
+        Jupyter Server (2.0 and later) gives the kernel the path of its notebook,
+        relative to the server root, in the JPY_SESSION_NAME environment
+        variable; relative paths are taken from the notebook directory, where
+        the kernel is started.
+
+        Args:
+            path (str): Path of the file, relative to the notebook directory.
+
+        Returns:
+            str | None: URL of the file relative to the server base URL
+            ('files/<path from the server root>'), or None outside Jupyter or if
+            either path is absolute.
+        """
+        session = os.environ.get("JPY_SESSION_NAME", "")
+        if not session or os.path.isabs(session) or os.path.isabs(path):
+            return None
+        notebook_directory = posixpath.dirname(session.replace(os.sep, "/"))
+        file_path = posixpath.normpath(
+            posixpath.join(notebook_directory, path.replace(os.sep, "/"))
         )
-        display(HTML(self.graph_svg_text))
+        if file_path.startswith("../"):
+            return None
+        return "files/" + urllib.parse.quote(file_path)
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # IPython rich display
+    def _repr_html_(self):
+        """Return the HTML representation used by IPython for the graph.
+
+        Documents up to DISPLAY_INLINE_LIMIT characters are inlined; longer ones
+        are written to a file (see save_svg) and only referenced. There is no
+        _repr_svg_, so that IPython stores a single copy of the document per output.
+
+        Returns:
+            str | None: SVG document or reference fragment, None for an empty graph.
+        """
+        svg_text = self.to_svg()
+        if not svg_text:
+            return None
+        if len(svg_text) <= self.DISPLAY_INLINE_LIMIT:
+            return svg_text
+        return self.reference_html()
 
     ###############################################################################################################################
     ###############################################################################################################################
@@ -1845,6 +2543,10 @@ class modular_graph:
     ) -> None:
         """Set the gradient colors used for node coloring and the legend.
 
+        Nothing is rendered here. In restyle mode an already rendered document is
+        recolored in place; otherwise it is dropped and rendered again on next
+        access.
+
         Args:
             start_color_hex (str): Hex code for the start color (e.g., '#FFD700').
             mid_color_hex (str): Hex code for the middle color (e.g., '#32CD32').
@@ -1853,5 +2555,205 @@ class modular_graph:
         Returns:
             None
         """
-        self.gradient_colors = [start_color_hex, mid_color_hex, end_color_hex]
-        self.root_svg, self.graph_svg_text = self.render_circular_map01(self.graph_dict)
+        gradient_colors = [start_color_hex, mid_color_hex, end_color_hex]
+        if gradient_colors == self.gradient_colors:
+            return
+        self.gradient_colors = gradient_colors
+        if (
+            not self.restyle
+            or self.svg_cache is None
+            or self.svg_cache["root"] is None
+            or self.rendered_detail != "full"
+        ):
+            self.invalidate()
+            return
+        # restyle mode: patch the indexed fills only
+        fills = self.get_colormap().ratio_hex(
+            [binding["ratio"] for binding in self.bindings]
+        )
+        for binding, entry, fill_color in zip(
+            self.bindings, self.node_elements, fills.tolist()
+        ):
+            if binding["fill_key"] is not None:
+                continue
+            binding["fill"] = fill_color
+            for element, attribute in entry["fills"]:
+                element.set(attribute, binding["fill"])
+        for gradient in self.gradients.values():
+            binding = self.bindings[min(gradient["nodes"])]
+            if binding["fill_key"] is None:
+                for stop in gradient["element"]:
+                    stop.set("stop-color", binding["fill"])
+        if self.metric_island_element is not None:
+            self.metric_island_element.text = self.metric_island()
+        if self.snapshot_island_element is not None:
+            self.snapshot_island_element.text = self.snapshot_island()
+        self.svg_cache["text"] = None
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # customization
+    def set_theme(self, **colors: str) -> None:
+        """Change colors of the palette (`self.COLORS`).
+
+        Nothing is rendered here. In restyle mode only the <style> block of an
+        already rendered document is rewritten; otherwise the document is dropped
+        and rendered again on next access.
+
+        Args:
+            **colors (str): New colors keyed by palette name (e.g. neutral="#777777").
+
+        Raises:
+            ValueError: If a key is not a palette name.
+
+        Returns:
+            None
+        """
+        unknown = set(colors) - set(self.COLORS)
+        if unknown:
+            raise ValueError(
+                f"Unknown palette colors {sorted(unknown)}. Must be among: {list(self.COLORS)}"
+            )
+        if all(self.COLORS[k] == v for k, v in colors.items()):
+            return
+        self.COLORS.update(colors)
+        if not self.restyle or self.svg_cache is None or self.svg_cache["root"] is None:
+            self.invalidate()
+            return
+        self.theme_style.text = self.document_css()
+        for binding in self.bindings:
+            if binding["fill_key"] is not None:
+                binding["fill"] = self.COLORS[binding["fill_key"]]
+        self.svg_cache["text"] = None
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # data update
+    def update_data(self, new_data: dict | pd.Series) -> None:
+        """Update values of the graph, patching only the affected nodes.
+
+        `new_data` is merged into `self.data`. If the document is already
+        rendered, the elements of the nodes indexed during the render are patched
+        in place (fill, data-tooltip, piscine gradient) and the text is serialized
+        again on next access: layout and static elements are not touched. Every
+        node is recolored only if `max_value` changes.
+
+        Args:
+            new_data (dict | pd.Series): New values keyed by content name, in the
+                format of `data` (see __init__). Contents not listed keep their value.
+
+        Raises:
+            ValueError: In custom mode, if a value is not a dictionary with the
+                keys of the graph.
+
+        Returns:
+            None
+        """
+        new_data = dict(new_data)
+        if not new_data:
+            return
+        if self.kind == "custom":
+            for key, val in new_data.items():
+                if not isinstance(val, dict) or list(val.keys()) != self.keys:
+                    raise ValueError(
+                        f"Inconsistent keys in data for project '{key}'. All dictionaries must have keys: {self.keys}"
+                    )
+
+        # max_value is only scanned again if its holder decreased
+        previous_max = self.max_value
+        replaced = [
+            self.color_value(self.data[name]) for name in new_data if name in self.data
+        ]
+        self.data = {**self.data, **new_data}
+        try:
+            new_max = max(self.color_value(v) for v in new_data.values())
+        except:
+            new_max = None
+        if new_max is not None and new_max >= previous_max:
+            self.max_value = new_max
+        elif previous_max in replaced:
+            self.max_value = self.compute_max_value()
+
+        root = self.svg_cache["root"] if self.svg_cache is not None else None
+        # aggregates and budgets depend on every value: rendered again
+        if root is None or self.rendered_detail != "full" or self.max_bytes is not None:
+            self.invalidate()
+            return
+        if self.max_value != previous_max:
+            nodes = self.layout.nodes
+        else:
+            nodes = [
+                self.layout.nodes[index]
+                for name in new_data
+                for index in self.layout.node_indices.get(name, ())
+            ]
+        for node, binding in zip(nodes, self.bind_data(nodes)):
+            self.patch_node(node, binding)
+        if self.tooltip_island_element is not None:
+            self.tooltip_island_element.text = self.tooltip_island()
+        if self.metric_island_element is not None:
+            self.metric_island_element.text = self.metric_island()
+        self.svg_cache["text"] = None
+
+    ###############################################################################################################################
+    ###############################################################################################################################
+    # data update of one node
+    def patch_node(self, node, binding):
+        """Apply a new binding to the indexed elements of a rendered node.
+
+        Args:
+            node (dict): Layout node.
+            binding (dict): New binding of the node (see bind_data).
+
+        Returns:
+            None
+        """
+        index = node["index"]
+        entry = self.node_elements[index]
+        previous = self.bindings[index]
+        self.bindings[index] = binding
+
+        if entry["tooltip"] is not None and binding["tooltip"] != previous["tooltip"]:
+            entry["tooltip"].set("data-tooltip", binding["tooltip"])
+
+        if entry["piscine"] is not None and self.marks_nodes():
+            # every piscine has its own gradient (see render_defs)
+            if (binding["fill"], binding["fill_key"]) != (
+                previous["fill"],
+                previous["fill_key"],
+            ):
+                for stop in self.gradients[entry["gradient_key"]]["element"]:
+                    self.apply_fill(stop, "stop-color", binding)
+            return
+
+        if entry["piscine"] is not None:
+            key = self.gradient_key(binding)
+            if key == entry["gradient_key"]:
+                return
+            # leave the shared gradient, dropping it if no piscine uses it anymore
+            gradient = self.gradients[entry["gradient_key"]]
+            gradient["nodes"].discard(index)
+            if not gradient["nodes"]:
+                self.svg_defs.remove(gradient["element"])
+                del self.gradients[entry["gradient_key"]]
+            gradient = self.gradients.get(key)
+            if gradient is None:
+                gradient_id = f"{node['name']}_gradient"
+                # the name may still be held by a gradient shared with other piscines
+                if any(item["id"] == gradient_id for item in self.gradients.values()):
+                    gradient_id = f"{gradient_id}_{self.gradient_serial}"
+                    self.gradient_serial += 1
+                gradient = self.render_piscine_gradient(gradient_id, binding)
+                self.gradients[key] = gradient
+                self.svg_defs.append(gradient["element"])
+            gradient["nodes"].add(index)
+            entry["gradient_key"] = key
+            entry["piscine"].set("fill", f"url(#{gradient['id']})")
+            return
+
+        if (binding["fill"], binding["fill_key"]) != (
+            previous["fill"],
+            previous["fill_key"],
+        ):
+            for element, attribute in entry["fills"]:
+                self.apply_fill(element, attribute, binding)
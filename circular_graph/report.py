@@ -0,0 +1,302 @@
+from xml.etree import ElementTree as ET2
+from collections.abc import Iterable, Mapping
+from itertools import chain
+from typing import Any, Literal
+import gzip
+import hashlib
+import html
+import os
+from circular_graph.batch import (
+    WORKER_STATE,
+    build_graph,
+    iter_keyed_data,
+    render_many,
+)
+from circular_graph.grid import SVG, namespace_ids
+from circular_graph.layout import CompiledLayout
+from circular_graph.modular_graph import modular_graph
+from circular_graph.tools.renderer_utils import (
+    grid_info_card_script,
+    lazy_panel_script,
+)
+from circular_graph.tools.svg_writer import SVGTreeBuilder
+from circular_graph.tools.text_conversion import to_slug
+
+# id of the element holding the panels, listened to by the info-card script
+REPORT_ID = "report"
+# sub-directory of the report holding the graph files
+GRAPHS_DIRECTORY = "graphs"
+
+REPORT_CSS = """
+body { font-family: 'Inter', sans-serif; background: #111111; color: #D3D3D3; margin: 0; }
+h1 { text-align: center; font-weight: 600; }
+#report { display: grid; grid-template-columns: repeat(auto-fill, minmax(480px, 1fr)); gap: 24px; padding: 24px; }
+.graph-panel { margin: 0; }
+.graph-panel figcaption { text-align: center; margin-bottom: 8px; }
+.graph-frame { aspect-ratio: 1; }
+.graph-frame svg { width: 100%; height: 100%; }
+.legend { display: flex; align-items: center; gap: 12px; max-width: 640px; margin: 0 auto; }
+.legend-bar { flex: 1; height: 16px; border-radius: 4px; }
+"""
+
+
+# * helper function to remove the parts shared by every graph of a report
+def strip_shared(root):
+    """Remove the parts of a rendered graph provided once by the report shell.
+
+    Icon symbols and filters are moved out of the <defs> (piscine gradients
+    stay), the info card is removed and the scripts are dropped.
+
+    Args:
+        root (Element): <svg> root of a rendered graph.
+
+    Returns:
+        tuple[list[Element], Element | None]: The shared <defs> children and the
+        info card.
+    """
+    shared = []
+    info_card = None
+    for child in list(root):
+        if child.tag == f"{SVG}defs":
+            for item in list(child):
+                if item.tag != f"{SVG}radialGradient":
+                    child.remove(item)
+                    shared.append(item)
+        elif child.tag == f"{SVG}g" and child.get("id") == "info_card":
+            info_card = child
+            root.remove(child)
+        elif child.tag == f"{SVG}script":
+            root.remove(child)
+    return shared, info_card
+
+
+###############################################################################################
+###############################################################################################
+
+
+# * helper function to render the panel of one graph
+def render_panel(graph: modular_graph, prefix: str) -> str:
+    """Render a graph as a report panel: shared parts removed, ids namespaced.
+
+    Args:
+        graph (modular_graph): Graph to render.
+        prefix (str): Prefix of the ids of the panel.
+
+    Returns:
+        str: SVG document of the panel.
+    """
+    builder = SVGTreeBuilder()
+    graph.write_document(builder)
+    root = builder.close()
+    shared, _ = strip_shared(root)
+    namespace_ids(root, prefix, {}, {item.get("id") for item in shared})
+    for style in root.iter(f"{SVG}style"):
+        style.text = style.text.replace("#canevas", f"#{prefix}canevas")
+    return ET2.tostring(root, encoding="unicode")
+
+
+###############################################################################################
+###############################################################################################
+
+
+# * helper function to name the file of a graph
+def panel_name(key: Any) -> str:
+    """Return the file stem of the graph of a dataset, also used as id prefix.
+
+    Args:
+        key (Any): Identifier of the dataset.
+
+    Returns:
+        str: 'graph-<hash>-<slug>' (the hash keeps stems of distinct keys apart).
+    """
+    digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:8]
+    return f"graph-{digest}-{to_slug(str(key), {})}"
+
+
+###############################################################################################
+###############################################################################################
+
+
+# * worker job
+def write_panel_job(key: Any, data: dict) -> tuple[Any, str, int | float]:
+    """Render one dataset as a report panel and write it to the graphs directory.
+
+    Only the file name travels back to the parent process.
+
+    Args:
+        key (Any): Identifier of the dataset, returned unchanged.
+        data (dict): Data map of the graph (see modular_graph).
+
+    Returns:
+        tuple[Any, str, int | float]: (key, file name, end of the color scale).
+    """
+    options = WORKER_STATE["job_options"]
+    graph = build_graph(data)
+    if options["max_value"] is not None:
+        graph.max_value = options["max_value"]
+    name = panel_name(key)
+    payload = render_panel(graph, f"{name}-").encode("utf-8")
+    file_name = f"{name}.svg"
+    if options["compress"]:
+        payload = gzip.compress(payload, compresslevel=9, mtime=0)
+        file_name += ".gz"
+    with open(
+        os.path.join(options["directory"], GRAPHS_DIRECTORY, file_name), "wb"
+    ) as fp:
+        fp.write(payload)
+    return key, file_name, graph.max_value
+
+
+###############################################################################################
+###############################################################################################
+
+
+def build_report(
+    directory: str,
+    graph_json: str | CompiledLayout,
+    data_maps: Mapping | Iterable,
+    piscines_list: list[str] | None = None,
+    checkpoints_list: list[str] | None = None,
+    mandatory_list: list[str] | None = None,
+    kind: Literal["classic", "custom"] = "classic",
+    title: str = "Module graphs",
+    compress: bool = True,
+    max_value: int | float | None = None,
+    max_workers: int | None = None,
+    **graph_options,
+) -> str:
+    """Write an HTML report of one graph per dataset, loading the graphs lazily.
+
+    `directory/index.html` is a shell holding the shared CSS, scripts, icon
+    symbols, info card and legend; each graph is written by a worker process
+    to `directory/graphs/` as a (gzip-compressed) SVG file with namespaced ids,
+    and fetched by the page when its panel scrolls into view. Graphs are
+    rendered over a process pool (see render_many) and the shell is written as
+    results come in, in input order, so memory does not depend on the number
+    of graphs.
+    The report must be served over HTTP (browsers do not fetch from file://).
+
+    Args:
+        directory (str): Output directory (created if needed).
+        graph_json (str | CompiledLayout): JSON string describing the graph layout,
+            or an already compiled layout (the lists are then taken from it).
+        data_maps (Mapping | Iterable): {title: data}, an iterable of (title, data)
+            tuples or an iterable of data maps (titles are then their positions).
+            Consumed lazily.
+        piscines_list (list[str] | None, optional): List of  "piscines".
+        checkpoints_list (list[str] | None, optional): List of checkpoints.
+        mandatory_list (list[str] | None, optional): List of mandatory projects.
+        kind (Literal['classic','custom'], optional): Visualization mode. Defaults to "classic".
+        title (str, optional): Title of the page. Defaults to "Module graphs".
+        compress (bool, optional): Write gzip-compressed graphs (`.svg.gz`).
+            Defaults to True.
+        max_value (int | float | None, optional): End of the color scale shared by
+            every graph (shown by the legend). None lets each graph use its own
+            maximum, given in its caption. Defaults to None.
+        max_workers (int | None, optional): Number of worker processes. Defaults to
+            the number of CPUs.
+        **graph_options: Extra keyword arguments for modular_graph (e.g. color_key,
+            css_classes, precision); nodes get no inline handlers since the shell
+            installs the listeners.
+
+    Raises:
+        ValueError: If the lists are missing while `graph_json` is a string, or if
+            tooltip_mode='island' or metrics=True is given.
+
+    Returns:
+        str: Path of the written index.html.
+    """
+    if graph_options.get("tooltip_mode") == "island" or graph_options.get("metrics"):
+        raise ValueError(
+            "Reports do not support tooltip_mode='island' or metrics=True."
+        )
+    if isinstance(graph_json, CompiledLayout):
+        layout = graph_json
+        graph_options.setdefault("precision", layout.precision)
+    else:
+        if piscines_list is None or checkpoints_list is None or mandatory_list is None:
+            raise ValueError(
+                "piscines_list, checkpoints_list and mandatory_list are required "
+                "when graph_json is not a CompiledLayout."
+            )
+        layout = CompiledLayout(
+            graph_json,
+            piscines_list,
+            checkpoints_list,
+            mandatory_list,
+            precision=graph_options.get("precision"),
+        )
+    # listeners are installed once by the shell
+    graph_options["event_mode"] = "delegated"
+    os.makedirs(os.path.join(directory, GRAPHS_DIRECTORY), exist_ok=True)
+    path = os.path.join(directory, "index.html")
+
+    items = iter_keyed_data(data_maps)
+    first = next(items, None)
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+            f"<title>{html.escape(title)}</title>\n<style>{REPORT_CSS}</style>\n"
+            f"</head>\n<body>\n<h1>{html.escape(title)}</h1>\n"
+        )
+        if first is None:
+            fp.write("</body>\n</html>\n")
+            return path
+
+        # shared parts, taken from the graph of the first dataset
+        template = modular_graph(
+            layout.graph_json,
+            first[1],
+            layout.piscines_list,
+            layout.checkpoints_list,
+            layout.mandatory_list,
+            kind=kind,
+            layout=layout,
+            **graph_options,
+        )
+        builder = SVGTreeBuilder()
+        template.write_document(builder)
+        shared, info_card = strip_shared(builder.close())
+        holder = ET2.Element(
+            f"{SVG}svg", {"width": "0", "height": "0", "style": "position: absolute;"}
+        )
+        ET2.SubElement(holder, f"{SVG}defs").extend(shared)
+        holder.append(info_card)
+        fp.write(ET2.tostring(holder, encoding="unicode"))
+
+        colors = ", ".join(template.gradient_colors)
+        fp.write(
+            '\n<div class="legend"><span>0</span>'
+            f'<div class="legend-bar" style="background: linear-gradient(to right, {colors});"></div>'
+            f"<span>{'max' if max_value is None else html.escape(str(max_value))}</span></div>\n"
+            f'<main id="{REPORT_ID}">\n'
+        )
+
+        for key, file_name, graph_max in render_many(
+            layout,
+            chain([first], items),
+            kind=kind,
+            max_workers=max_workers,
+            ordered=True,
+            job=write_panel_job,
+            job_options={
+                "directory": directory,
+                "compress": compress,
+                "max_value": max_value,
+            },
+            **graph_options,
+        ):
+            caption = html.escape(str(key))
+            if max_value is None:
+                caption += f" &middot; max {html.escape(str(graph_max))}"
+            fp.write(
+                f'<figure class="graph-panel" data-src="{GRAPHS_DIRECTORY}/{file_name}">'
+                f'<figcaption>{caption}</figcaption><div class="graph-frame"></div></figure>\n'
+            )
+
+        fp.write(
+            "</main>\n<script>"
+            f"{grid_info_card_script(template.kind, template.keys, REPORT_ID)}"
+            f"{lazy_panel_script()}</script>\n</body>\n</html>\n"
+        )
+    return path
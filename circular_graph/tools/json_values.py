@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+# * helper function to serialize pandas and NumPy data values
+def json_default(value):
+    """Convert a value json.dumps cannot serialize to native Python types.
+
+    Meant as the `default` argument of json.dumps: data maps built with pandas
+    (e.g. `dict(series)` or DataFrame rows) hold NumPy scalars, arrays or Series.
+    Native values are serialized without calling it.
+
+    Args:
+        value: Value json.dumps does not serialize natively.
+
+    Raises:
+        TypeError: If the value is not a NumPy scalar, a NumPy array or a Series.
+
+    Returns:
+        Python number, list or dictionary (its items are serialized in turn).
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.Series):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# * helper function to convert pandas and NumPy data values
+def to_native(value):
+    """Convert a data value to native Python types, recursively.
+
+    Args:
+        value: Data value (number, string, dictionary, list, NumPy scalar or
+            array, Series).
+
+    Returns:
+        Same value with NumPy scalars as Python numbers, arrays as lists and
+        Series as dictionaries (see json_default).
+    """
+    if isinstance(value, dict):
+        return {key: to_native(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_native(item) for item in value]
+    if isinstance(value, (np.generic, np.ndarray, pd.Series)):
+        return to_native(json_default(value))
+    return value
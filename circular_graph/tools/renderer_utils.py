@@ -1,10 +1,67 @@
+import html
 from typing import Literal
 
+# id of the <script type="application/json"> element holding the custom tooltips
+TOOLTIP_ISLAND_ID = "tooltip_data"
+# id of the <script type="application/json"> element holding the fills of every metric
+METRIC_ISLAND_ID = "metric_data"
+# id of the <script type="application/json"> element holding the snapshot frames
+SNAPSHOT_ISLAND_ID = "snapshot_data"
+
+# JS function updating the gradient legend (see color_tools.gradient) of a graph
+# to {min, max, colors}, shared by the client-side appliers. The legend is looked
+# up in the graph, or else in its enclosing ".graph-view" element (see
+# modular_graph.show), so that other graphs of the page keep their legend. The
+# legend gradient is renamed after its colors, like gradient_legend_svg does, so
+# legends sharing an id always share their colors
+UPDATE_GRADIENT_LEGEND = """function updateGradientLegend(root, legend) {
+        const scope = root.querySelector("#gradient-legend") ? root : root.closest(".graph-view");
+        if (!scope) return;
+        const find = (id) => scope.querySelector("#" + CSS.escape(id));
+        const bar = find("gradient-bar");
+        if (!bar) return;
+        const { min, max, colors } = legend;
+        const format = (value) => Number.isInteger(value) ? String(value) : value.toFixed(2);
+        bar.setAttribute("data-min", min);
+        bar.setAttribute("data-max", max);
+        const fill = find(bar.getAttribute("fill").slice(5, -1));
+        if (fill) {
+            fill.querySelectorAll("stop").forEach((stop, index) => stop.setAttribute("stop-color", colors[index]));
+            fill.setAttribute("id", "legend_gradient_" + colors.map((color) => color.replace("#", "")).join(""));
+            bar.setAttribute("fill", "url(#" + fill.getAttribute("id") + ")");
+        }
+        ["start", "mid", "end"].forEach((name, index) => {
+            const value = find(name + "-value");
+            if (value) value.textContent = format([min, (min + max) / 2, max][index]);
+            const swatch = find(name + "-swatch");
+            if (swatch) swatch.setAttribute("fill", colors[index]);
+        });
+    }"""
+
+
+# JS function fetching the text of a graph file, shared by the loaders; gzip
+# files are inflated with DecompressionStream unless the server decoded them.
+# Servers may answer a missing file with one of their pages (JupyterLab serves
+# its application page), so HTML responses are rejected like errors
+FETCH_GRAPH_TEXT = """async function fetchGraphText(src) {
+        const response = await fetch(src);
+        const type = response.headers.get("Content-Type") || "";
+        if (!response.ok || type.startsWith("text/html")) {
+            throw new Error("No graph document at " + src);
+        }
+        const inflate = src.endsWith(".gz")
+            && response.headers.get("Content-Encoding") !== "gzip";
+        return inflate
+            ? await new Response(response.body.pipeThrough(new DecompressionStream("gzip"))).text()
+            : await response.text();
+    }"""
+
 
 # Function to return the appropriate JS function based on the type of info card
 def show_info_card(
     type: Literal["classic", "distribution", "custom"] = "classic",
     keys: list[str] | None = None,
+    tooltip_source: Literal["attribute", "island"] = "attribute",
 ) -> str:
     """Return the appropriate JS function based on the visualization type.
 
@@ -12,6 +69,8 @@ def show_info_card(
         type (Literal["classic", "distribution", "custom"], optional): Type of visualization.
             Defaults to "classic".
         keys (list[str] | None, optional): List of keys to display for custom type. Required when type="custom".
+        tooltip_source (Literal["attribute", "island"], optional): Where custom cards
+            read the node values (see custom_info_card_function). Defaults to "attribute".
 
     Returns:
         str: JavaScript function as a string.
@@ -22,7 +81,7 @@ def show_info_card(
     elif type == "custom":
         if keys is None:
             raise ValueError("keys parameter is required when type='custom'")
-        return show_custom_info_card(keys)
+        return show_custom_info_card(keys, tooltip_source)
     else:
         raise ValueError("Invalid visualization type")
 
@@ -38,8 +97,20 @@ def show_classic_info_card() -> str:
         str: JavaScript function as a string.
     """
 
-    return """
-    (function showInfoCard(el) { 
+    return f"""
+    ({classic_info_card_function()})(this)
+    """
+
+
+# JS function literal shared by the inline and the delegated classic handlers
+def classic_info_card_function() -> str:
+    """Return the JavaScript `showInfoCard(el)` function literal for classic cards.
+
+    Returns:
+        str: JavaScript function expression (not invoked).
+    """
+
+    return """function showInfoCard(el) { 
     el.style.cursor= "pointer";
     const infoCard = document.getElementById("info_card");
     const cardA = document.getElementById("card_a");
@@ -95,24 +166,54 @@ def show_classic_info_card() -> str:
     dataText.setAttribute("text-anchor", "middle");
     dataText.setAttribute("y", y + data_text_y_shift);
     infoCard.style.visibility = "visible";
-    })(this)
-    """
+    }"""
 
 
 # JS function to display custom informations dynamically (project name -> dictionary)
-def show_custom_info_card(keys: list[str]) -> str:
+def show_custom_info_card(
+    keys: list[str], tooltip_source: Literal["attribute", "island"] = "attribute"
+) -> str:
     """Return a JavaScript function string to display custom info cards.
 
     Args:
         keys (list[str]): List of keys to display from the data dictionary.
+        tooltip_source (Literal["attribute", "island"], optional): Where the node
+            values are read (see custom_info_card_function). Defaults to "attribute".
 
     Returns:
         str: JavaScript function as a string.
     """
+    return f"""
+    ({custom_info_card_function(keys, tooltip_source)})(this)
+    """
+
+
+# JS function literal shared by the inline and the delegated custom handlers
+def custom_info_card_function(
+    keys: list[str], tooltip_source: Literal["attribute", "island"] = "attribute"
+) -> str:
+    """Return the JavaScript `showInfoCard(el)` function literal for custom cards.
+
+    Args:
+        keys (list[str]): List of keys to display from the data dictionary.
+        tooltip_source (Literal["attribute", "island"], optional): "attribute" parses
+            the JSON `data-tooltip` attribute of the node; "island" looks the node id
+            up in the JSON data island (parsed once, on first hover). Defaults to
+            "attribute".
+
+    Returns:
+        str: JavaScript function expression (not invoked).
+    """
     keys_json = str(keys).replace("'", '"')
+    if tooltip_source == "island":
+        read_data = f"""const island = document.getElementById("{TOOLTIP_ISLAND_ID}");
+    island.tooltips = island.tooltips || JSON.parse(island.textContent);
+    const data = island.tooltips[el.getAttribute("id")] || {{}};"""
+    else:
+        read_data = """const datajson = el.getAttribute("data-tooltip") || "{}";
+    const data = JSON.parse(datajson); """
 
-    return f"""
-    (function showInfoCard(el) {{ 
+    return f"""function showInfoCard(el) {{ 
     el.style.cursor= "pointer";
     const infoCard = document.getElementById("info_card");
     const cardA = document.getElementById("card_a");
@@ -121,8 +222,7 @@ def show_custom_info_card(keys: list[str]) -> str:
     const projectText = document.getElementById("project_name_card");
     const statHolder = document.getElementById("stat-holder");
 
-    const datajson = el.getAttribute("data-tooltip") || "{{}}";
-    const data = JSON.parse(datajson); 
+    {read_data}
     const sep = document.getElementById("separator");
 
     /*****************************/
@@ -174,7 +274,7 @@ def show_custom_info_card(keys: list[str]) -> str:
     const card_width = Math.max(base_card_width, maxContentWidth + 40);
     const cardX = x + card_a_x_shift;
     
-    const size = document.getElementById('canevas').getAttribute('viewBox').split(' ').slice(2),
+    const size = el.ownerSVGElement.getAttribute('viewBox').split(' ').slice(2),
     total_width = parseFloat(size[0]), 
     total_height = parseFloat(size[1]), 
     limit_width = total_width / (1+1/5), 
@@ -230,5 +330,525 @@ def show_custom_info_card(keys: list[str]) -> str:
 
     infoCard.style.visibility = "visible";
 
-    }})(this)
+    }}"""
+
+
+# JS statement hiding the info card (inline `onpointerleave` handler)
+HIDE_INFO_CARD = 'document.getElementById("info_card").style.visibility = "hidden";'
+
+
+# Document-level script replacing the per-node inline handlers
+def delegated_info_card_script(
+    type: Literal["classic", "custom"] = "classic",
+    keys: list[str] | None = None,
+    tooltip_source: Literal["attribute", "island"] = "attribute",
+) -> str:
+    """Return a JavaScript snippet installing delegated info-card listeners.
+
+    A single `pointerover` / `pointerout` pair is registered on the SVG root
+    enclosing the script, so that several graphs can share a page. Hovered
+    nodes are resolved through their `data-tooltip` attribute (`project-name`
+    when the values come from the data island), so nodes only need to carry
+    data attributes instead of their own copy of the handler. The info card and
+    the data island are looked up in that root only.
+
+    Args:
+        type (Literal["classic", "custom"], optional): Type of visualization.
+            Defaults to "classic".
+        keys (list[str] | None, optional): List of keys to display for custom type. Required when type="custom".
+        tooltip_source (Literal["attribute", "island"], optional): Where custom cards
+            read the node values (see custom_info_card_function). Defaults to "attribute".
+
+    Returns:
+        str: JavaScript code to embed once in a <script> element.
+    """
+    if type == "classic":
+        show_function = classic_info_card_function()
+    elif type == "custom":
+        if keys is None:
+            raise ValueError("keys parameter is required when type='custom'")
+        show_function = custom_info_card_function(keys, tooltip_source)
+    else:
+        raise ValueError("Invalid visualization type")
+    selector = "[project-name]" if tooltip_source == "island" else "[data-tooltip]"
+
+    # the enclosing <svg> is found from the running script; the shared card
+    # functions use document.getElementById, which is shadowed to search it only
+    return f"""
+    (function (root) {{
+    const document = {{
+        getElementById: (id) => root.querySelector("#" + CSS.escape(id)),
+        createElementNS: (ns, name) => root.ownerDocument.createElementNS(ns, name),
+    }};
+    const showInfoCard = {show_function};
+    root.addEventListener("pointerover", function (event) {{
+        const el = event.target.closest("{selector}");
+        if (el) showInfoCard(el);
+    }});
+    root.addEventListener("pointerout", function (event) {{
+        const el = event.target.closest("{selector}");
+        if (el && !el.contains(event.relatedTarget)) {{
+            {HIDE_INFO_CARD}
+        }}
+    }});
+    }})(
+        (document.currentScript && document.currentScript.closest("svg")) ||
+            document.getElementById("canevas")
+    );
+    """
+
+
+# Grid-level script sharing one info card between the panels of a grid
+def grid_info_card_script(
+    type: Literal["classic", "custom"] = "classic",
+    keys: list[str] | None = None,
+    grid_id: str = "graph_grid",
+) -> str:
+    """Return a JavaScript snippet installing the info-card listeners of a grid.
+
+    Like delegated_info_card_script, a single `pointerover` / `pointerout` pair
+    is registered, on the grid root. The only info card of the document is
+    moved into the panel (nested <svg>) of the hovered node before being shown,
+    so that it is positioned in the coordinates of that panel.
+
+    Args:
+        type (Literal["classic", "custom"], optional): Type of visualization.
+            Defaults to "classic".
+        keys (list[str] | None, optional): List of keys to display for custom type. Required when type="custom".
+        grid_id (str, optional): Id of the grid root. Defaults to "graph_grid".
+
+    Returns:
+        str: JavaScript code to embed once in a <script> element.
+    """
+    if type == "classic":
+        show_function = classic_info_card_function()
+    elif type == "custom":
+        if keys is None:
+            raise ValueError("keys parameter is required when type='custom'")
+        show_function = custom_info_card_function(keys)
+    else:
+        raise ValueError("Invalid visualization type")
+
+    return f"""
+    (function () {{
+    const grid = document.getElementById("{grid_id}");
+    const infoCard = document.getElementById("info_card");
+    const showInfoCard = {show_function};
+    grid.addEventListener("pointerover", function (event) {{
+        const el = event.target.closest("[data-tooltip]");
+        if (!el) return;
+        if (infoCard.parentNode !== el.ownerSVGElement) {{
+            el.ownerSVGElement.appendChild(infoCard);
+        }}
+        showInfoCard(el);
+    }});
+    grid.addEventListener("pointerout", function (event) {{
+        const el = event.target.closest("[data-tooltip]");
+        if (el && !el.contains(event.relatedTarget)) {{
+            {HIDE_INFO_CARD}
+        }}
+    }});
+    }})();
+    """
+
+
+# Client-side applier of the per-dataset overlays of a skeleton
+def overlay_applier_script() -> str:
+    """Return the JavaScript `applyGraphOverlay(root, overlay)` function.
+
+    The function colors a skeleton SVG (see `modular_graph.to_skeleton`) with a
+    per-dataset overlay (see `modular_graph.to_overlay`): fills, piscine
+    gradient stops and tooltips of the elements marked with `data-node`.
+
+    Returns:
+        str: JavaScript function declaration, to embed once in the page.
+    """
+    return f"""
+    function applyGraphOverlay(root, overlay) {{
+    if (typeof overlay === "string") overlay = JSON.parse(overlay);
+    if (root.getAttribute("data-layout") !== overlay.layout) {{
+        throw new Error("The overlay was not exported for this graph skeleton.");
+    }}
+    const island = root.querySelector("#{TOOLTIP_ISLAND_ID}");
+    const tooltips = {{}};
+    root.querySelectorAll("[data-node]").forEach((el) => {{
+        const index = parseInt(el.getAttribute("data-node"), 10);
+        const fill = overlay.colors[overlay.fills[index]];
+        if (el.tagName === "radialGradient") {{
+            for (const stop of el.children) stop.setAttribute("stop-color", fill);
+            return;
+        }}
+        const current = el.getAttribute("fill");
+        if (current && !current.startsWith("url(")) el.setAttribute("fill", fill);
+        const value = overlay.tooltips[index];
+        if (island) {{
+            if (el.hasAttribute("project-name")) tooltips[el.getAttribute("id")] = value;
+        }} else if (el.hasAttribute("data-tooltip")) {{
+            el.setAttribute(
+                "data-tooltip",
+                typeof value === "object" ? JSON.stringify(value) : String(value)
+            );
+        }}
+    }});
+    if (island) {{
+        island.textContent = JSON.stringify(tooltips);
+        island.tooltips = tooltips;
+    }}
+    }}
+    """
+
+
+# Client-side applier of the patches computed by circular_graph.delta.diff
+def delta_applier_script() -> str:
+    """Return the JavaScript `applyGraphDelta(root, delta)` function.
+
+    The function patches a displayed graph with a delta (see
+    `circular_graph.delta.diff`): fills and tooltips of the nodes given by id
+    (piscine gradients are created per color when needed) and the bounds and
+    colors of the gradient legend of the graph, if any: inside the <svg>, or in
+    the enclosing `.graph-view` element (see `modular_graph.show`).
+
+    Returns:
+        str: JavaScript function declaration, to embed once in the page.
+    """
+    return f"""
+    function applyGraphDelta(root, delta) {{
+    if (typeof delta === "string") delta = JSON.parse(delta);
+    const layout = root.getAttribute("data-layout");
+    if (layout && layout !== delta.layout) {{
+        throw new Error("The delta was not computed for this graph.");
+    }}
+    {UPDATE_GRADIENT_LEGEND}
+    const svgNS = "http://www.w3.org/2000/svg";
+    const icon = (id) => {{
+        const group = root.querySelector("g#" + CSS.escape(id));
+        return group && group.firstElementChild;
+    }};
+    const gradientFor = (color) => {{
+        const id = "piscine_gradient_" + color.replace(/[^0-9a-zA-Z]/g, "");
+        if (!root.querySelector("#" + id)) {{
+            const gradient = document.createElementNS(svgNS, "radialGradient");
+            gradient.setAttribute("id", id);
+            ["cx", "cy", "r", "fx", "fy"].forEach((name) => gradient.setAttribute(name, "50%"));
+            [["0%", "1"], ["40%", "0.5"], ["100%", "0"]].forEach(([offset, opacity]) => {{
+                const stop = document.createElementNS(svgNS, "stop");
+                stop.setAttribute("offset", offset);
+                stop.setAttribute("stop-color", color);
+                stop.setAttribute("stop-opacity", opacity);
+                gradient.appendChild(stop);
+            }});
+            root.querySelector("defs").appendChild(gradient);
+        }}
+        return id;
+    }};
+
+    Object.entries(delta.fills).forEach(([id, fill]) => {{
+        const el = icon(id);
+        if (!el) return;
+        el.style.removeProperty("fill");
+        const current = el.getAttribute("fill") || "";
+        el.setAttribute("fill", current.startsWith("url(") ? "url(#" + gradientFor(fill) + ")" : fill);
+    }});
+
+    const island = root.querySelector("#{TOOLTIP_ISLAND_ID}");
+    if (island) island.tooltips = island.tooltips || JSON.parse(island.textContent);
+    Object.entries(delta.tooltips).forEach(([id, value]) => {{
+        if (island) {{
+            island.tooltips[id] = value;
+            return;
+        }}
+        const el = icon(id);
+        if (el && el.hasAttribute("data-tooltip")) {{
+            el.setAttribute(
+                "data-tooltip",
+                typeof value === "object" ? JSON.stringify(value) : String(value)
+            );
+        }}
+    }});
+    if (island) island.textContent = JSON.stringify(island.tooltips);
+
+    if (delta.legend) updateGradientLegend(root, delta.legend);
+    }}
+    """
+
+
+# Client-side switch of the metric coloring the nodes (custom graphs with metrics=True)
+def metric_selector_script() -> str:
+    """Return the JavaScript `selectGraphMetric(root, key)` function.
+
+    The function recolors the nodes of a graph rendered with `metrics=True`
+    from the fills of every metric embedded in the document (see
+    `modular_graph.metric_island`), and moves the gradient legend of the graph,
+    if any (see delta_applier_script), to the bounds of the selected metric.
+
+    Returns:
+        str: JavaScript function declaration, to embed once in the page.
+    """
+    return f"""
+    function selectGraphMetric(root, key) {{
+    {UPDATE_GRADIENT_LEGEND}
+    if (!root.metrics) {{
+        root.metrics = JSON.parse(root.querySelector("#{METRIC_ISLAND_ID}").textContent);
+    }}
+    const metrics = root.metrics;
+    const column = metrics.keys.indexOf(key);
+    if (column < 0) throw new Error("Unknown metric: " + key);
+    const fills = metrics.fills[column];
+    root.querySelectorAll("[data-node]").forEach((el) => {{
+        const color = metrics.colors[fills[+el.getAttribute("data-node")]];
+        if (el.tagName === "radialGradient") {{
+            el.querySelectorAll("stop").forEach((stop) => {{ stop.style.stopColor = color; }});
+        }} else if (!(el.getAttribute("fill") || "").startsWith("url(")) {{
+            el.style.fill = color;
+        }}
+    }});
+    root.setAttribute("data-metric", key);
+    updateGradientLegend(root, {{ min: 0, max: metrics.max[column], colors: metrics.legend }});
+    }}
+    """
+
+
+# HTML selector of the metric coloring a graph rendered with metrics=True
+def metric_selector_html(keys: list[str], active_key: str) -> str:
+    """Return a <select> switching the metric of the graph following it.
+
+    The selector must be placed in the same parent element as the <svg>, which
+    must embed the script returned by metric_selector_script.
+
+    Args:
+        keys (list[str]): Metrics of the graph (`modular_graph.keys`).
+        active_key (str): Metric selected initially (`modular_graph.color_key`).
+
+    Returns:
+        str: HTML <select> element.
+    """
+    options = "".join(
+        f'<option value="{html.escape(key)}"{" selected" if key == active_key else ""}>'
+        f"{html.escape(key)}</option>"
+        for key in keys
+    )
+    return (
+        '<select onchange="selectGraphMetric('
+        "this.parentElement.querySelector('svg'), this.value)\">"
+        f"{options}</select>"
+    )
+
+
+# Client-side player of the snapshot frames (see modular_graph.from_snapshots)
+def snapshot_player_script() -> str:
+    """Return the JavaScript `showGraphFrame` and `playGraphSnapshots` functions.
+
+    `showGraphFrame(root, index)` applies the changed cells of the frame table
+    embedded in the document (see `modular_graph.snapshot_island`) up to the
+    given frame, and returns its timestamp. `playGraphSnapshots(root, interval,
+    onFrame)` shows every frame in turn, calling `onFrame(index, timestamp)`,
+    and returns a function stopping the animation.
+
+    Returns:
+        str: JavaScript function declarations, to embed once in the page.
+    """
+    return f"""
+    function showGraphFrame(root, index) {{
+    if (!root.snapshots) {{
+        const snapshots = JSON.parse(root.querySelector("#{SNAPSHOT_ISLAND_ID}").textContent);
+        snapshots.nodes = [];
+        root.querySelectorAll("[data-node]").forEach((el) => {{
+            const node = +el.getAttribute("data-node");
+            (snapshots.nodes[node] = snapshots.nodes[node] || []).push(el);
+        }});
+        snapshots.current = 0;
+        root.snapshots = snapshots;
+    }}
+    const snapshots = root.snapshots;
+    const island = root.querySelector("#{TOOLTIP_ISLAND_ID}");
+    const tooltips = island && JSON.parse(island.textContent);
+    const apply = (frame) => {{
+        for (let i = 0; i < frame.fills.length; i += 2) {{
+            const color = snapshots.colors[frame.fills[i + 1]];
+            (snapshots.nodes[frame.fills[i]] || []).forEach((el) => {{
+                if (el.tagName === "radialGradient") {{
+                    el.querySelectorAll("stop").forEach((stop) => {{ stop.style.stopColor = color; }});
+                }} else if (!(el.getAttribute("fill") || "").startsWith("url(")) {{
+                    el.style.fill = color;
+                }}
+            }});
+        }}
+        Object.entries(frame.tooltips).forEach(([node, value]) => {{
+            (snapshots.nodes[node] || []).forEach((el) => {{
+                if (!el.hasAttribute("project-name")) return;
+                if (tooltips) tooltips[el.id] = value;
+                else el.setAttribute("data-tooltip", value);
+            }});
+        }});
+    }};
+    const start = index < snapshots.current ? 0 : snapshots.current + 1;
+    for (let frame = start; frame <= index; frame++) apply(snapshots.frames[frame]);
+    if (tooltips) {{
+        island.textContent = JSON.stringify(tooltips);
+        // values read by the info cards (see custom_info_card_function)
+        island.tooltips = tooltips;
+    }}
+    snapshots.current = index;
+    root.setAttribute("data-frame", snapshots.times[index]);
+    return snapshots.times[index];
+    }}
+
+    function playGraphSnapshots(root, interval = 1000, onFrame = null) {{
+    let index = 0;
+    const step = () => {{
+        const time = showGraphFrame(root, index);
+        if (onFrame) onFrame(index, time);
+        index += 1;
+        if (index >= root.snapshots.times.length) clearInterval(timer);
+    }};
+    const timer = setInterval(step, interval);
+    step();
+    return () => clearInterval(timer);
+    }}
+    """
+
+
+# HTML controls of a graph created by modular_graph.from_snapshots
+def snapshot_player_html(times: list[str]) -> str:
+    """Return a slider and a play button driving the snapshots of the graph following them.
+
+    The controls must be placed in the same parent element as the <svg>, which
+    must embed the script returned by snapshot_player_script.
+
+    Args:
+        times (list[str]): Timestamps of the snapshots, in display order.
+
+    Returns:
+        str: HTML <div> element.
+    """
+    svg = "this.parentElement.parentElement.querySelector('svg')"
+    return (
+        "<div>"
+        f'<input type="range" min="0" max="{len(times) - 1}" value="0" '
+        f'oninput="this.nextElementSibling.textContent = showGraphFrame({svg}, +this.value)">'
+        f"<span>{html.escape(times[0])}</span> "
+        f"<button onclick=\"const range = this.parentElement.querySelector('input'); "
+        f"playGraphSnapshots({svg}, 1000, (index, time) => "
+        '{ range.value = index; range.nextElementSibling.textContent = time; })">'
+        "Play</button>"
+        "</div>"
+    )
+
+
+# Lazy loading of the external graphs of a report (see circular_graph.report)
+def lazy_panel_script(root_margin: str = "200px") -> str:
+    """Return a JavaScript snippet loading the report panels as they scroll into view.
+
+    Every element with a `data-src` attribute is observed; when it gets close
+    to the viewport, the SVG at `data-src` is fetched (gzip files are inflated
+    with DecompressionStream unless the server already decoded them) and
+    inserted in its `.graph-frame` child, whose scripts are then run.
+
+    If that URL does not give an SVG document (error or HTML page) and the
+    element has a `data-files-src` attribute, the file is fetched from that
+    path under the base URL of the Jupyter server (`baseUrl` of the page's
+    `jupyter-config-data`, "/" by default): notebook pages of JupyterLab are not
+    served from the notebook directory. A message replaces the graph if no URL
+    gives it.
+
+    Args:
+        root_margin (str, optional): Distance to the viewport at which panels
+            start loading (IntersectionObserver rootMargin). Defaults to "200px".
+
+    Returns:
+        str: JavaScript code to embed once in a <script> element.
+    """
+    return f"""
+    (function () {{
+    {FETCH_GRAPH_TEXT}
+    const load = async (panel) => {{
+        // loaded once, even if several loaders observe the panel
+        const src = panel.dataset.src;
+        if (!src) return;
+        panel.removeAttribute("data-src");
+        const sources = [src];
+        if (panel.dataset.filesSrc) {{
+            const config = document.getElementById("jupyter-config-data");
+            const baseUrl = (config && JSON.parse(config.textContent).baseUrl) || "/";
+            sources.push(baseUrl + panel.dataset.filesSrc);
+        }}
+        let text = null;
+        for (const source of sources) {{
+            text = await fetchGraphText(source).catch(() => null);
+            if (text !== null) break;
+        }}
+        const frame = panel.querySelector(".graph-frame");
+        if (text === null) {{
+            frame.textContent = "Graph document not found: " + sources.join(", ");
+            return;
+        }}
+        frame.innerHTML = text;
+        // scripts inserted through innerHTML do not run
+        frame.querySelectorAll("script").forEach((inert) => {{
+            if (inert.type === "application/json") return;
+            const script = document.createElement("script");
+            script.textContent = inert.textContent;
+            inert.replaceWith(script);
+        }});
+    }};
+    const observer = new IntersectionObserver((entries) => {{
+        entries.forEach((entry) => {{
+            if (!entry.isIntersecting) return;
+            observer.unobserve(entry.target);
+            load(entry.target);
+        }});
+    }}, {{ rootMargin: "{root_margin}" }});
+    document.querySelectorAll("[data-src]").forEach((panel) => observer.observe(panel));
+    }})();
+    """
+
+
+# Function returning the JS loading the deferred rings of a progressive graph
+def ring_loader_script(eager: bool = True) -> str:
+    """Return a JavaScript snippet loading the deferred rings of a progressive graph.
+
+    Deferred rings are emitted as empty `<g data-ring-src="...">` placeholders
+    (see modular_graph.to_progressive). Their fragment is fetched (and inflated
+    if compressed), parsed and swapped with the placeholder, so that the rings
+    keep their place in the document. Defines
+    `loadGraphRing(root, id)` / `loadGraphRings(root)`, resolving to the inserted
+    groups.
+
+    Args:
+        eager (bool, optional): If True, the rings of the enclosing SVG are loaded
+            right after the first paint; otherwise only when the page calls
+            loadGraphRing / loadGraphRings (e.g. on zoom). Defaults to True.
+
+    Returns:
+        str: JavaScript code to embed in the <svg> of the graph.
+    """
+    # the enclosing <svg> is found from the running script
+    auto_load = (
+        """const root = document.currentScript && document.currentScript.closest("svg");
+    if (root) requestAnimationFrame(() => setTimeout(() => loadGraphRings(root), 0));"""
+        if eager
+        else ""
+    )
+    return f"""
+    (function () {{
+    {FETCH_GRAPH_TEXT}
+    const loadRing = async (placeholder) => {{
+        // loaded once, even if requested again while fetching
+        const src = placeholder.getAttribute("data-ring-src");
+        if (!src) return null;
+        placeholder.removeAttribute("data-ring-src");
+        const text = await fetchGraphText(src);
+        const fragment = new DOMParser().parseFromString(text, "image/svg+xml");
+        const ring = document.importNode(fragment.documentElement, true);
+        placeholder.replaceWith(ring);
+        return ring;
+    }};
+    window.loadGraphRing = (root, id) => {{
+        const placeholder = root.querySelector("g[data-ring-src]#" + CSS.escape(id));
+        return placeholder ? loadRing(placeholder) : Promise.resolve(null);
+    }};
+    window.loadGraphRings = (root) =>
+        Promise.all(Array.from(root.querySelectorAll("g[data-ring-src]"), loadRing));
+    {auto_load}
+    }})();
     """
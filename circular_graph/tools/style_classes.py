@@ -0,0 +1,126 @@
+import re
+
+# SVG presentation attributes that can be moved to a CSS rule
+PRESENTATION_ATTRIBUTES = frozenset(
+    {
+        "alignment-baseline",
+        "dominant-baseline",
+        "fill",
+        "fill-opacity",
+        "font-family",
+        "font-size",
+        "font-weight",
+        "letter-spacing",
+        "opacity",
+        "stroke",
+        "stroke-dasharray",
+        "stroke-linecap",
+        "stroke-linejoin",
+        "stroke-opacity",
+        "stroke-width",
+        "text-anchor",
+    }
+)
+
+# Properties whose unitless attribute values need a unit in CSS
+LENGTH_PROPERTIES = frozenset({"font-size", "letter-spacing"})
+
+NUMBER_PATTERN = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)")
+
+
+# * helper function to convert a presentation attribute to a CSS declaration
+def to_declaration(name: str, value: str) -> str:
+    """Return the CSS declaration equivalent to a presentation attribute.
+
+    Args:
+        name (str): Attribute name (e.g. 'font-size').
+        value (str): Attribute value (e.g. '50').
+
+    Returns:
+        str: CSS declaration (e.g. 'font-size: 50px;').
+    """
+    if name in LENGTH_PROPERTIES and NUMBER_PATTERN.fullmatch(value):
+        value = f"{value}px"
+    return f"{name}: {value};"
+
+
+# * helper function to split a style attribute
+def split_style(style: str) -> list[str]:
+    """Split the value of a `style` attribute into normalized declarations.
+
+    Args:
+        style (str): Style attribute (e.g. 'text-transform: uppercase;').
+
+    Returns:
+        list[str]: Declarations, each formatted as 'name: value;'.
+    """
+    declarations = []
+    for declaration in style.split(";"):
+        name, _, value = declaration.partition(":")
+        if name.strip():
+            declarations.append(f"{name.strip()}: {value.strip()};")
+    return declarations
+
+
+class StyleClasses:
+    def __init__(self, scope: str = "#canevas", prefix: str = "s"):
+        """Hash-cons sets of presentation attributes into CSS classes.
+
+        Every distinct set of presentation attributes (and `style` declarations)
+        is given one class; elements then only carry `class=`, and all the rules
+        are emitted once by css().
+
+        Args:
+            scope (str, optional): Selector prefixed to every rule. Defaults to
+                "#canevas".
+            prefix (str, optional): Prefix of the generated class names. Defaults
+                to "s".
+
+        Returns:
+            None
+        """
+        self.scope = scope
+        self.prefix = prefix
+        # sorted declarations -> class name
+        self.classes = {}
+
+    def classify(self, attributes: dict) -> dict:
+        """Replace the presentation attributes of an element by a class.
+
+        Args:
+            attributes (dict): Attributes of the element (string values).
+
+        Returns:
+            dict: Remaining attributes plus `class`, or the given attributes if
+            there is nothing to move.
+        """
+        declarations = []
+        remaining = {}
+        for name, value in attributes.items():
+            if name in PRESENTATION_ATTRIBUTES:
+                declarations.append(to_declaration(name, value))
+            elif name == "style":
+                declarations.extend(split_style(value))
+            else:
+                remaining[name] = value
+        if not declarations:
+            return attributes
+        key = tuple(sorted(declarations))
+        class_name = self.classes.get(key)
+        if class_name is None:
+            class_name = f"{self.prefix}{len(self.classes)}"
+            self.classes[key] = class_name
+        existing = remaining.get("class")
+        remaining["class"] = f"{existing} {class_name}" if existing else class_name
+        return remaining
+
+    def css(self) -> str:
+        """Return the CSS rules of the registered classes.
+
+        Returns:
+            str: One `<scope> .<class> { ... }` rule per line.
+        """
+        return "\n".join(
+            f"{self.scope} .{class_name} {{ {' '.join(declarations)} }}"
+            for declarations, class_name in self.classes.items()
+        )
@@ -0,0 +1,379 @@
+from xml.etree import ElementTree as ET2
+import io
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+
+# * helper function to escape text content
+def escape_text(text: str) -> str:
+    """Escape XML text content (same rules as ElementTree).
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: Escaped text.
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+# * helper function to escape attribute values
+def escape_attribute(value: str) -> str:
+    """Escape an XML attribute value (same rules as ElementTree).
+
+    Args:
+        value (str): Raw attribute value.
+
+    Returns:
+        str: Escaped value, to be written between double quotes.
+    """
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+# __________________________________________________________________________________#
+# |                                                                                  |#
+# |                                  Render targets                                  |#
+# |__________________________________________________________________________________|#
+#
+# The renderer of modular_graph emits the document through a target exposing
+# start(tag, attrs) / data(text) / end(tag) / element(element). Tags and attribute
+# names are ElementTree qualified names ("{namespace}local").
+
+
+class SVGTreeBuilder:
+    def __init__(self):
+        """Render target building an ElementTree of the document.
+
+        Returns:
+            None
+        """
+        self.stack = []
+        self.root = None
+
+    def start(self, tag: str, attrs: dict) -> ET2.Element:
+        """Open a new element as the last child of the current one.
+
+        Args:
+            tag (str): Qualified tag name.
+            attrs (dict): Qualified attribute names -> string values.
+
+        Returns:
+            xml.etree.ElementTree.Element: The opened element.
+        """
+        element = ET2.Element(tag, attrs)
+        if self.stack:
+            self.stack[-1].append(element)
+        else:
+            self.root = element
+        self.stack.append(element)
+        return element
+
+    def data(self, text: str) -> None:
+        """Add text content to the current element.
+
+        Args:
+            text (str): Text content.
+
+        Returns:
+            None
+        """
+        current = self.stack[-1]
+        current.text = (current.text or "") + text
+
+    def end(self, tag: str) -> ET2.Element:
+        """Close the current element.
+
+        Args:
+            tag (str): Qualified tag name of the element to close.
+
+        Returns:
+            xml.etree.ElementTree.Element: The closed element.
+        """
+        return self.stack.pop()
+
+    def element(self, element: ET2.Element) -> ET2.Element:
+        """Append a complete element (with its subtree) to the current element.
+
+        Args:
+            element (Element): Element to append.
+
+        Returns:
+            xml.etree.ElementTree.Element: The appended element.
+        """
+        self.stack[-1].append(element)
+        return element
+
+    def close(self) -> ET2.Element:
+        """Return the root element of the built tree.
+
+        Returns:
+            xml.etree.ElementTree.Element: Root element.
+        """
+        return self.root
+
+
+class SVGStreamWriter:
+    def __init__(
+        self,
+        fp,
+        namespaces: dict | None = None,
+        buffer_size: int = 1 << 16,
+    ):
+        """Render target serializing the document to a file-like object as it is emitted.
+
+        Nothing but the stack of open tag names and a bounded output buffer is kept
+        in memory. The output is identical to `ElementTree.tostring(root,
+        encoding="unicode")` of the same document.
+
+        Args:
+            fp: Object with a `write` method: text streams receive str, anything
+                else (binary files, io.BufferedWriter, socket.makefile('wb'), ...)
+                receives UTF-8 bytes.
+            namespaces (dict | None, optional): Namespace URI -> prefix ("" for the
+                default namespace), declared on the root element. Defaults to the SVG
+                (default) and xlink namespaces.
+            buffer_size (int, optional): Number of characters buffered before writing
+                to `fp`. Defaults to 65536.
+
+        Returns:
+            None
+        """
+        self.fp = fp
+        self.binary = not isinstance(fp, io.TextIOBase)
+        self.namespaces = (
+            namespaces if namespaces is not None else {SVG_NS: "", XLINK_NS: "xlink"}
+        )
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.stack = []
+        self.tag_open = False  # start tag written without its closing '>'
+        self.qnames = {}
+
+    # * helper function to convert qualified names to prefixed names
+    def qname(self, name: str) -> str:
+        """Return the serialized (prefixed) form of an ElementTree qualified name.
+
+        Args:
+            name (str): "{namespace}local" or plain name.
+
+        Returns:
+            str: "prefix:local", "local" for the default namespace, or the plain name.
+        """
+        qname = self.qnames.get(name)
+        if qname is None:
+            if name[:1] == "{":
+                uri, local = name[1:].split("}", 1)
+                prefix = self.namespaces.get(uri)
+                if prefix is None:
+                    raise ValueError(f"Undeclared namespace: {uri}")
+                qname = f"{prefix}:{local}" if prefix else local
+            else:
+                qname = name
+            self.qnames[name] = qname
+        return qname
+
+    def write(self, text: str) -> None:
+        """Buffer serialized text, flushing to `fp` when the buffer is full.
+
+        Args:
+            text (str): Serialized markup.
+
+        Returns:
+            None
+        """
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered text to `fp`.
+
+        Returns:
+            None
+        """
+        if self.buffer:
+            chunk = "".join(self.buffer)
+            self.fp.write(chunk.encode("utf-8") if self.binary else chunk)
+            self.buffer = []
+            self.buffered = 0
+
+    def start(self, tag: str, attrs: dict) -> None:
+        """Write the start tag of a new element.
+
+        Args:
+            tag (str): Qualified tag name.
+            attrs (dict): Qualified attribute names -> string values.
+
+        Returns:
+            None
+        """
+        if self.tag_open:
+            self.write(">")
+        parts = ["<", self.qname(tag)]
+        if not self.stack:
+            for uri, prefix in self.namespaces.items():
+                name = f"xmlns:{prefix}" if prefix else "xmlns"
+                parts.append(f' {name}="{escape_attribute(uri)}"')
+        for name, value in attrs.items():
+            parts.append(f' {self.qname(name)}="{escape_attribute(value)}"')
+        self.write("".join(parts))
+        self.stack.append(tag)
+        self.tag_open = True
+
+    def data(self, text: str) -> None:
+        """Write text content of the current element.
+
+        Args:
+            text (str): Text content.
+
+        Returns:
+            None
+        """
+        if not text:
+            return
+        if self.tag_open:
+            self.write(">")
+            self.tag_open = False
+        self.write(escape_text(text))
+
+    def end(self, tag: str) -> None:
+        """Write the end tag of the current element.
+
+        Args:
+            tag (str): Qualified tag name of the element to close.
+
+        Returns:
+            None
+        """
+        self.stack.pop()
+        if self.tag_open:
+            self.write(" />")
+            self.tag_open = False
+        else:
+            self.write(f"</{self.qname(tag)}>")
+        if not self.stack:
+            self.flush()
+
+    def element(self, element: ET2.Element) -> None:
+        """Write a complete element and its subtree.
+
+        Args:
+            element (Element): Element to serialize.
+
+        Returns:
+            None
+        """
+        self.start(element.tag, element.attrib)
+        if element.text:
+            self.data(element.text)
+        for child in element:
+            self.element(child)
+        self.end(element.tag)
+
+    def close(self) -> None:
+        """Flush the remaining buffered text.
+
+        Returns:
+            None
+        """
+        self.flush()
+
+
+class SVGCounter:
+    def __init__(self):
+        """Render target measuring the document without keeping it.
+
+        The document is serialized as by SVGStreamWriter, but only its size is
+        recorded.
+
+        Returns:
+            None
+        """
+        # number of elements and UTF-8 size of the serialized document
+        self.elements = 0
+        self.bytes = 0
+        self.writer = SVGStreamWriter(self)
+
+    def write(self, chunk: bytes) -> None:
+        """Count a chunk serialized by the underlying writer.
+
+        Args:
+            chunk (bytes): UTF-8 encoded markup.
+
+        Returns:
+            None
+        """
+        self.bytes += len(chunk)
+
+    def start(self, tag: str, attrs: dict) -> None:
+        """Count and serialize the start tag of a new element (see SVGStreamWriter.start).
+
+        Args:
+            tag (str): Qualified tag name.
+            attrs (dict): Qualified attribute names -> string values.
+
+        Returns:
+            None
+        """
+        self.elements += 1
+        self.writer.start(tag, attrs)
+
+    def data(self, text: str) -> None:
+        """Serialize text content of the current element.
+
+        Args:
+            text (str): Text content.
+
+        Returns:
+            None
+        """
+        self.writer.data(text)
+
+    def end(self, tag: str) -> None:
+        """Serialize the end tag of the current element.
+
+        Args:
+            tag (str): Qualified tag name of the element to close.
+
+        Returns:
+            None
+        """
+        self.writer.end(tag)
+
+    def element(self, element: ET2.Element) -> None:
+        """Count and serialize a complete element and its subtree.
+
+        Args:
+            element (Element): Element to serialize.
+
+        Returns:
+            None
+        """
+        self.elements += sum(1 for _ in element.iter())
+        self.writer.element(element)
+
+    def close(self) -> None:
+        """Flush the remaining buffered text.
+
+        Returns:
+            None
+        """
+        self.writer.close()
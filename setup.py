@@ -15,7 +15,6 @@ setup(
         "numpy<=2.1.0",
         "plotly<=5.24.1",
         "IPython<=8.30.0",
-        "beautifulsoup4<=4.12.2",
     ],
     python_requires=">=3.10",  # Minimum Python version requirement
     py_modules=[
@@ -0,0 +1,160 @@
+import json
+import random
+from xml.etree import ElementTree as ET2
+from circular_graph.modular_graph import modular_graph
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+# Lists of the sample graph (see make_graph)
+PISCINES = [f"piscine-{s}" for s in range(4)]
+CHECKPOINTS = ["central", "p1-1", "p2-2-s1"]
+MANDATORY = ["p0-1", "p3-4", "p1-2-s0", "m1-2"]
+
+
+def make_graph(n_slices: int = 4, per_arc: int = 6) -> tuple[str, list[str]]:
+    """Build a graph layout using every kind of section.
+
+    Each slice has an entry point, an inner arc (with one project holding
+    sub-contents) and two outer arcs; a line sits between the first slices and
+    the middle and outer circles are filled.
+
+    Args:
+        n_slices (int, optional): Number of slices. Defaults to 4.
+        per_arc (int, optional): Number of projects of each inner arc. Defaults to 6.
+
+    Returns:
+        tuple[str, list[str]]: (graph_json, names of every node)
+    """
+    names = ["central"]
+    inner = []
+    for s in range(n_slices):
+        contents = []
+        for c in range(per_arc):
+            name = f"p{s}-{c}"
+            names.append(name)
+            if c == 2:
+                subs = [f"{name}-s{k}" for k in range(3)]
+                names.extend(subs)
+                contents.append({name: subs})
+            else:
+                contents.append(name)
+        outer_arcs = []
+        for a in range(2):
+            outer_contents = [f"o{s}-{a}-{k}" for k in range(4)]
+            names.extend(outer_contents)
+            outer_arcs.append(
+                {"name": {"text": f"outer {s}-{a}"}, "contents": outer_contents}
+            )
+        names.append(f"piscine-{s}")
+        inner.append(
+            {
+                "type": "slice",
+                "name": {"text": f"Slice {s}"},
+                "entryPoint": f"piscine-{s}",
+                "innerArc": {"name": {"text": f"inner {s}"}, "contents": contents},
+                "outerArcs": outer_arcs,
+            }
+        )
+    line_contents = [f"l0-{k}" for k in range(4)]
+    names.extend(line_contents)
+    inner.insert(
+        1, {"type": "line", "name": {"text": "Line 0"}, "contents": line_contents}
+    )
+    circles = {}
+    for circle, prefix, count in (("middleCircle", "m", 3), ("outerCircle", "x", 2)):
+        sections = []
+        for m in range(count):
+            section_contents = [f"{prefix}{m}-{k}" for k in range(5)]
+            names.extend(section_contents)
+            sections.append(
+                {"name": {"text": f"{circle} {m}"}, "contents": section_contents}
+            )
+        circles[circle] = sections
+    graph = {"centralPoint": "central", "innerCircle": inner, **circles}
+    return json.dumps(graph), names
+
+
+def make_data(names: list[str], seed: int = 1) -> dict:
+    """Return a classic data map with a few null values.
+
+    Args:
+        names (list[str]): Names of the nodes.
+        seed (int, optional): Seed of the values. Defaults to 1.
+
+    Returns:
+        dict: {name: value}
+    """
+    rng = random.Random(seed)
+    data = {name: rng.randrange(100) for name in names}
+    data[names[1]] = 0
+    data[names[-1]] = 0
+    return data
+
+
+def make_custom_data(names: list[str], seed: int = 1) -> dict:
+    """Return a custom data map with 'completion' and 'quality' keys.
+
+    Args:
+        names (list[str]): Names of the nodes.
+        seed (int, optional): Seed of the values. Defaults to 1.
+
+    Returns:
+        dict: {name: {'completion': value, 'quality': value}}
+    """
+    rng = random.Random(seed)
+    return {
+        name: {"completion": rng.randrange(100), "quality": rng.randrange(100)}
+        for name in names
+    }
+
+
+# Sample graph shared by the tests
+GRAPH_JSON, NAMES = make_graph()
+
+
+def make_sample(data: dict | None = None, **options) -> modular_graph:
+    """Return a modular_graph of the sample graph.
+
+    Args:
+        data (dict | None, optional): Data map. Defaults to make_data (or
+            make_custom_data for custom graphs).
+        **options: Keyword arguments of modular_graph.
+
+    Returns:
+        modular_graph: Graph, not rendered yet.
+    """
+    if data is None:
+        data = (
+            make_custom_data(NAMES)
+            if options.get("kind") == "custom"
+            else make_data(NAMES)
+        )
+    return modular_graph(GRAPH_JSON, data, PISCINES, CHECKPOINTS, MANDATORY, **options)
+
+
+def canonical(svg_text: str) -> str:
+    """Return the document with piscine gradients inlined into the fills using them.
+
+    Patched documents may name (and order) their piscine gradients differently
+    from a fresh render: each `url(#id)` reference is replaced by the stops of
+    the gradient and the gradients are removed. Attributes set by a patch can
+    also come in another order, so the result is canonicalized (C14N).
+
+    Args:
+        svg_text (str): SVG document.
+
+    Returns:
+        str: Canonical form of the document.
+    """
+    root = ET2.fromstring(svg_text)
+    gradients = {}
+    for defs in root.iter(f"{SVG}defs"):
+        for gradient in list(defs.findall(f"{SVG}radialGradient")):
+            stops = ",".join(stop.get("stop-color") for stop in gradient)
+            gradients[f"url(#{gradient.get('id')})"] = f"gradient({stops})"
+            defs.remove(gradient)
+    for element in root.iter():
+        fill = element.get("fill")
+        if fill in gradients:
+            element.set("fill", gradients[fill])
+    return ET2.canonicalize(ET2.tostring(root, encoding="unicode"))
@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from circular_graph.batch import render_many
+from circular_graph.modular_graph import modular_graph
+from graphs import CHECKPOINTS, MANDATORY, PISCINES, make_data, make_graph
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+
+
+# * worker job returning the process that ran it
+def worker_pid(key, data):
+    return key, os.getpid()
+
+
+# * worker job finishing the first datasets last
+def slow_first(key, data):
+    time.sleep(0.05 * (6 - key))
+    return key, None
+
+
+# * worker job sleeping as long as its data says, returning when it ran
+def timed_job(key, data):
+    start = time.time()
+    time.sleep(data["sleep"])
+    return key, (os.getpid(), start, time.time())
+
+
+# * helper function to run a pool out of process
+def run_isolated(code: str, timeout: int = 120):
+    """Run code in a fresh interpreter and return what it prints as JSON.
+
+    A deadlocked pool then fails the test with TimeoutExpired instead of
+    hanging the test session.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT_DIR, TESTS_DIR]))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env=env,
+        cwd=ROOT_DIR,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_render_many_matches_modular_graph():
+    graph_json, names = make_graph()
+    data_maps = {f"learner-{i}": make_data(names, seed=i) for i in range(4)}
+    results = dict(
+        render_many(
+            graph_json,
+            data_maps,
+            PISCINES,
+            CHECKPOINTS,
+            MANDATORY,
+            max_workers=2,
+        )
+    )
+    assert results.keys() == data_maps.keys()
+    for key, data in data_maps.items():
+        expected = modular_graph(
+            graph_json, data, PISCINES, CHECKPOINTS, MANDATORY
+        ).graph_svg_text
+        assert results[key] == expected
+
+
+def test_render_many_recycles_workers():
+    code = """
+import json
+from circular_graph.batch import render_many
+from graphs import CHECKPOINTS, MANDATORY, PISCINES, make_data, make_graph
+from test_batch import worker_pid
+
+graph_json, names = make_graph()
+data = make_data(names)
+results = render_many(
+    graph_json, [data] * 6, PISCINES, CHECKPOINTS, MANDATORY,
+    max_workers=2, max_tasks_per_child=2, job=worker_pid,
+)
+print(json.dumps(dict(results)))
+"""
+    pids = {int(key): pid for key, pid in run_isolated(code).items()}
+    assert sorted(pids) == list(range(6))
+    # 2 workers x 2 jobs per generation: the last jobs run in new processes
+    assert {pids[4], pids[5]}.isdisjoint(pids[key] for key in range(4))
+
+
+def test_render_many_starts_the_next_pool_while_the_last_one_drains():
+    code = """
+import json
+from circular_graph.batch import render_many
+from graphs import CHECKPOINTS, MANDATORY, PISCINES, make_graph
+from test_batch import timed_job
+
+graph_json, names = make_graph()
+data_maps = [{"sleep": 1.0}] + [{"sleep": 0.0}] * 3
+results = render_many(
+    graph_json, data_maps, PISCINES, CHECKPOINTS, MANDATORY,
+    max_workers=2, max_tasks_per_child=1, job=timed_job,
+)
+print(json.dumps(dict(results)))
+"""
+    runs = {int(key): run for key, run in run_isolated(code).items()}
+    (pid, _, slow_end), (_, next_start, _) = runs[0], runs[2]
+    # the slow job of the first pool does not hold the jobs of the second one
+    assert runs[2][0] != pid
+    assert next_start < slow_end
+
+
+def test_render_many_ordered():
+    graph_json, names = make_graph()
+    results = render_many(
+        graph_json,
+        [{}] * 6,
+        PISCINES,
+        CHECKPOINTS,
+        MANDATORY,
+        max_workers=3,
+        max_pending=4,
+        ordered=True,
+        job=slow_first,
+    )
+    assert [key for key, _ in results] == list(range(6))
+
+
+def test_render_many_rejects_invalid_recycling():
+    graph_json, names = make_graph()
+    with pytest.raises(ValueError):
+        list(
+            render_many(
+                graph_json,
+                [make_data(names)],
+                PISCINES,
+                CHECKPOINTS,
+                MANDATORY,
+                max_tasks_per_child=0,
+            )
+        )
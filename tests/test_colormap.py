@@ -0,0 +1,79 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from circular_graph.color_tools.color_conversion import interpolate_color
+from circular_graph.color_tools.colormap import Colormap
+from graphs import NAMES, make_custom_data, make_data, make_sample
+
+GRADIENT = ["#FFD700", "#32CD32", "#1E90FF"]
+
+
+@pytest.mark.parametrize("max_value", [1, 3, 7, 100, 37.5, 5000])
+def test_colors_match_interpolate_color(max_value):
+    values = np.concatenate(
+        [
+            np.linspace(-1, max_value + 1, 997),
+            np.arange(0, max_value + 1),
+            [max_value / 2, max_value / 3],
+        ]
+    )
+    expected = [interpolate_color(value, max_value, *GRADIENT) for value in values]
+    assert Colormap(GRADIENT).to_hex(values, max_value).tolist() == expected
+
+
+def test_midpoint_is_the_middle_stop():
+    assert Colormap(GRADIENT).to_hex([50], 100)[0] == "#32cd32"
+
+
+def test_series_columns_and_packed_rgb():
+    colormap = Colormap(GRADIENT)
+    values = pd.Series([0, 25, 50, 100, np.nan])
+    assert colormap.to_hex(values, 100).tolist() == [
+        "#ffd700",
+        "#98d219",
+        "#32cd32",
+        "#1e90ff",
+        "#ffd700",
+    ]
+    packed = colormap.to_packed_rgb([[0, 10], [10, 20]], np.array([10, 20]))
+    assert packed.dtype == np.uint32
+    assert packed.tolist() == [[0xFFD700, 0x32CD32], [0x1E90FF, 0x1E90FF]]
+
+
+def test_more_than_three_stops():
+    colormap = Colormap(["#000000", "#ffffff", "#ff0000", "#0000ff"])
+    assert colormap.to_hex([0, 1, 2, 3], 3).tolist() == [
+        "#000000",
+        "#ffffff",
+        "#ff0000",
+        "#0000ff",
+    ]
+
+
+def test_invalid_colors():
+    with pytest.raises(ValueError):
+        Colormap(["#FFD700"])
+    with pytest.raises(ValueError):
+        Colormap(["#FFD700", "green"])
+
+
+@pytest.mark.parametrize("kind", ["classic", "custom"])
+def test_bind_data_reads_the_value_of_each_node(kind):
+    data = make_custom_data(NAMES) if kind == "custom" else make_data(NAMES)
+    graph = make_sample(data, kind=kind)
+    nodes = graph.layout.nodes
+    subset = nodes[::3]
+    for bound_nodes, bindings in (
+        (nodes, graph.bind_data()),
+        (subset, graph.bind_data(subset)),
+    ):
+        assert len(bindings) == len(bound_nodes)
+        for node, binding in zip(bound_nodes, bindings):
+            if kind == "custom":
+                data_value = data.get(node["name"], {})
+                assert binding["value"] == data_value.get("completion", 0)
+                assert json.loads(binding["tooltip"]) == data_value
+            else:
+                assert binding["value"] == data.get(node["name"], 0)
+                assert binding["tooltip"] == str(data.get(node["name"], 0))
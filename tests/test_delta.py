@@ -0,0 +1,75 @@
+import json
+import pandas as pd
+import pytest
+from circular_graph.delta import diff
+from graphs import NAMES, make_custom_data, make_data, make_sample
+
+
+def test_diff_round_trip():
+    data = make_data(NAMES, seed=1)
+    new_data = {**data, "p0-0": 40, "p1-1": 0, "piscine-2": 3, "m0-1": 77}
+    previous = make_sample(data)
+    new = make_sample(new_data)
+    delta = json.loads(json.dumps(diff(previous, new)))
+
+    # patching the previous fills and values gives the new ones
+    fills = dict(zip(previous.layout_frame()["id"], previous.layout_frame()["fill"]))
+    fills.update(delta["fills"])
+    assert fills == dict(zip(new.layout_frame()["id"], new.layout_frame()["fill"]))
+    # tooltips are sent as written in the document
+    values = {name: str(previous.data.get(name, 0)) for name in NAMES}
+    values.update(delta["tooltips"])
+    assert values == {name: str(new.data.get(name, 0)) for name in NAMES}
+    assert set(delta["tooltips"]) == {"p0-0", "p1-1", "piscine-2", "m0-1"}
+    assert "legend" not in delta
+
+
+def test_diff_reports_legend_changes():
+    data = make_data(NAMES)
+    new_data = {**data, "p0-0": 500}
+    delta = diff(make_sample(data), make_sample(new_data))
+    assert delta["legend"]["max"] == 500
+    # every gradient color is shifted by the new maximum
+    assert len(delta["fills"]) > 4
+
+
+def test_diff_of_identical_graphs_is_empty():
+    data = make_data(NAMES)
+    delta = diff(make_sample(data), make_sample(dict(data)))
+    assert delta["fills"] == {} and delta["tooltips"] == {}
+
+
+def test_diff_rejects_other_skeleton():
+    with pytest.raises(ValueError):
+        diff(make_sample(make_data(NAMES)), make_sample(make_data(NAMES), precision=1))
+
+
+def test_diff_tooltips_as_written_in_the_document():
+    data = make_data(NAMES)
+    delta = diff(make_sample(data), make_sample({**data, "p0-0": 5.0}))
+    assert delta["tooltips"] == {"p0-0": "5.0"}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"kind": "classic"},
+        {"kind": "custom", "tooltip_mode": "island", "event_mode": "delegated"},
+    ],
+)
+def test_diff_of_pandas_values(options):
+    if options["kind"] == "custom":
+        data = make_custom_data(NAMES)
+        new_data = {**data, "p0-0": {"completion": 500, "quality": 1}}
+        # DataFrame rows hold NumPy scalars
+        frame = pd.DataFrame.from_dict(new_data, orient="index")
+        pandas_data = {name: dict(row) for name, row in frame.iterrows()}
+    else:
+        data = make_data(NAMES)
+        new_data = {**data, "p0-0": 500}
+        pandas_data = dict(pd.Series(new_data))
+    previous = make_sample(data, **options)
+    delta = diff(previous, make_sample(pandas_data, **options))
+    assert json.dumps(delta) == json.dumps(
+        diff(previous, make_sample(new_data, **options))
+    )
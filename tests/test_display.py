@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from IPython.core.formatters import DisplayFormatter
+from circular_graph.tools.renderer_utils import lazy_panel_script
+from graphs import make_sample
+
+
+def test_display_stores_one_copy():
+    graph = make_sample()
+    data, _ = DisplayFormatter().format(graph)
+    assert set(data) == {"text/plain", "text/html"}
+    assert data["text/html"] == graph.graph_svg_text
+
+
+def test_display_by_reference(tmp_path):
+    graph = make_sample()
+    graph.DISPLAY_INLINE_LIMIT = 1024
+    graph.DISPLAY_DIRECTORY = str(tmp_path)
+    data, _ = DisplayFormatter().format(graph)
+    assert set(data) == {"text/plain", "text/html"}
+    assert len(data["text/html"]) < len(graph.graph_svg_text) // 10
+    (path,) = tmp_path.iterdir()
+    assert path.read_text() == graph.graph_svg_text
+    assert path.name in data["text/html"]
+
+
+@pytest.mark.parametrize(
+    "session, files_src",
+    [
+        ("work/graphs.ipynb", "files/work/vizard_graphs/"),
+        ("graphs.ipynb", "files/vizard_graphs/"),
+        (None, None),
+    ],
+)
+def test_reference_to_jupyter_files_route(tmp_path, monkeypatch, session, files_src):
+    monkeypatch.chdir(tmp_path)
+    if session is None:
+        monkeypatch.delenv("JPY_SESSION_NAME", raising=False)
+    else:
+        monkeypatch.setenv("JPY_SESSION_NAME", session)
+    graph = make_sample()
+    fragment = graph.reference_html()
+    name = os.listdir(tmp_path / "vizard_graphs")[0]
+    assert f'data-src="vizard_graphs/{name}"' in fragment
+    if files_src is None:
+        assert "data-files-src" not in fragment
+    else:
+        assert f'data-files-src="{files_src}{name}"' in fragment
+
+
+# Page loading a reference fragment: fetch answers `files` and, like JupyterLab,
+# its application page for any other URL
+LOADER_PAGE = """
+const files = %(files)s;
+const fetched = [];
+global.fetch = async (src) => {
+    fetched.push(src);
+    const found = src in files;
+    return {
+        ok: true,
+        headers: {get: (name) => name === "Content-Type"
+            ? (found ? "image/svg+xml" : "text/html; charset=UTF-8") : null},
+        text: async () => (found ? files[src] : "<html>JupyterLab</html>"),
+    };
+};
+const frame = {innerHTML: "", textContent: "", querySelectorAll: () => []};
+const panel = {
+    dataset: %(dataset)s,
+    removeAttribute(name) { delete this.dataset.src; },
+    querySelector: () => frame,
+};
+global.document = {
+    getElementById: (id) => id === "jupyter-config-data"
+        ? {textContent: JSON.stringify({baseUrl: "/user/me/"})} : null,
+    querySelectorAll: () => [panel],
+};
+global.IntersectionObserver = class {
+    constructor(callback) { this.callback = callback; }
+    observe(target) { this.callback([{isIntersecting: true, target}]); }
+    unobserve() {}
+};
+eval(%(script)s);
+setTimeout(() => console.log(JSON.stringify({fetched, frame})), 50);
+"""
+
+
+def run_loader(files: dict, dataset: dict) -> dict:
+    page = LOADER_PAGE % {
+        "files": json.dumps(files),
+        "dataset": json.dumps(dataset),
+        "script": json.dumps(lazy_panel_script()),
+    }
+    result = subprocess.run(
+        ["node", "-e", page], capture_output=True, text=True, timeout=30, check=True
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_loader_falls_back_to_jupyter_files_route():
+    dataset = {"src": "g/a.svg", "filesSrc": "files/work/g/a.svg"}
+    result = run_loader({"/user/me/files/work/g/a.svg": "<svg/>"}, dataset)
+    assert result["fetched"] == ["g/a.svg", "/user/me/files/work/g/a.svg"]
+    assert result["frame"]["innerHTML"] == "<svg/>"
+
+    # no HTML page is ever inserted as the graph
+    result = run_loader({}, dataset)
+    assert result["frame"]["innerHTML"] == ""
+    assert "not found" in result["frame"]["textContent"]
+
+    result = run_loader({"g/a.svg": "<svg/>"}, dataset)
+    assert result["fetched"] == ["g/a.svg"]
+    assert result["frame"]["innerHTML"] == "<svg/>"
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from circular_graph.layout import (
+    LAYOUT_RINGS,
+    NODE_ROLES,
+    CompiledLayout,
+    polar_to_cartesian,
+)
+from graphs import CHECKPOINTS, GRAPH_JSON, MANDATORY, PISCINES, make_sample
+
+
+def test_shared_layout_equals_parsed_layout():
+    layout = CompiledLayout(GRAPH_JSON, PISCINES, CHECKPOINTS, MANDATORY)
+    assert make_sample(layout=layout).graph_svg_text == make_sample().graph_svg_text
+
+
+def test_render_circular_map01_former_signature():
+    graph = make_sample()
+    _, svg_text = graph.render_circular_map01(graph.graph_dict)
+    assert svg_text == graph.render_circular_map01()[1] == graph.graph_svg_text
+    with pytest.raises(ValueError):
+        graph.render_circular_map01({"graph": {"centralPoint": "central"}})
+
+
+def test_layout_keeps_node_positions_as_arrays():
+    layout = CompiledLayout(GRAPH_JSON, PISCINES, CHECKPOINTS, MANDATORY)
+    assert len(layout.xs) == len(layout.formatted_x) == len(layout.nodes)
+    for node in layout.nodes:
+        position = polar_to_cartesian(
+            layout.center, layout.center, node["radius"], node["angle"]
+        )
+        index = node["index"]
+        assert layout.xs[index] == position["x"]
+        assert layout.ys[index] == position["y"]
+        assert np.isnan(layout.label_ys[index]) != node["has_label"]
+        assert (layout.transforms[index] is None) == (
+            node["icon"] not in ("checkpoint", "star")
+        )
+
+
+def test_layout_keeps_node_fields_as_arrays():
+    layout = CompiledLayout(GRAPH_JSON, PISCINES, CHECKPOINTS, MANDATORY)
+    assert len(layout.names) == len(layout.role_codes) == len(layout.nodes)
+    for node in layout.nodes:
+        index = node["index"]
+        assert layout.names[index] == node["name"]
+        assert layout.parents[index] == node["parent"]
+        assert layout.slices[index] == node["slice"]
+        assert layout.sections[index] == node["section"]
+        assert LAYOUT_RINGS[layout.ring_codes[index]] == node["ring"]
+        assert NODE_ROLES[layout.role_codes[index]] == node["role"]
+        assert layout.has_label[index] == node["has_label"]
@@ -0,0 +1,51 @@
+from xml.etree import ElementTree as ET2
+from circular_graph.modular_graph import LAYOUT_RINGS, NODE_ROLES
+from graphs import NAMES, SVG, make_sample
+
+LAYOUT_FRAME_DTYPES = {
+    "id": "string",
+    "display_name": "string",
+    "parent": "string",
+    "ring": "category",
+    "slice": "string",
+    "section": "string",
+    "role": "category",
+    "angle": "float64",
+    "radius": "float64",
+    "x": "float64",
+    "y": "float64",
+    "value": "float64",
+    "fill": "string",
+}
+
+
+def test_layout_frame_schema():
+    frame = make_sample().layout_frame()
+    assert frame.index.name == "node"
+    assert list(frame.index) == list(range(len(frame)))
+    assert {column: str(dtype) for column, dtype in frame.dtypes.items()} == (
+        LAYOUT_FRAME_DTYPES
+    )
+    assert list(frame["ring"].cat.categories) == list(LAYOUT_RINGS)
+    assert list(frame["role"].cat.categories) == list(NODE_ROLES)
+    assert set(frame["id"]) == set(NAMES)
+
+
+def test_layout_frame_matches_document():
+    graph = make_sample()
+    frame = graph.layout_frame().set_index("id")
+    root = ET2.fromstring(graph.graph_svg_text)
+    circles = [
+        circle
+        for circle in root.iter(f"{SVG}circle")
+        if circle.get("project-name") in frame.index
+    ]
+    assert len(circles) > len(frame) // 2
+    for circle in circles:
+        name = circle.get("project-name")
+        assert float(circle.get("cx")) == frame.loc[name, "x"]
+        assert float(circle.get("cy")) == frame.loc[name, "y"]
+        if not circle.get("fill", "").startswith("url("):
+            assert circle.get("fill") == frame.loc[name, "fill"]
+    assert frame.loc["p0-0", "value"] == 0
+    assert frame.loc["p0-0", "fill"] == graph.COLORS["neutral"]
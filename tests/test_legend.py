@@ -0,0 +1,107 @@
+import json
+import shutil
+import subprocess
+import pytest
+from xml.etree import ElementTree as ET2
+from circular_graph.tools.renderer_utils import metric_selector_script
+from graphs import NAMES, make_custom_data, make_sample
+
+# Page of two graphs displayed like show() does, in a minimal DOM: elements are
+# [tag, attributes, text, children] trees
+PAGE = """
+class Element {
+    constructor([tag, attributes, text, children], parent = null) {
+        this.tagName = tag;
+        this.attributes = attributes;
+        this.textContent = text;
+        this.parent = parent;
+        this.children = children.map((child) => new Element(child, this));
+        this.style = {};
+    }
+    getAttribute(name) { return name in this.attributes ? this.attributes[name] : null; }
+    setAttribute(name, value) { this.attributes[name] = String(value); }
+    hasAttribute(name) { return name in this.attributes; }
+    matches(selector) {
+        if (selector.startsWith("#")) return this.attributes.id === selector.slice(1);
+        if (selector.startsWith(".")) {
+            return (this.attributes.class || "").split(" ").includes(selector.slice(1));
+        }
+        if (selector.startsWith("[")) return this.hasAttribute(selector.slice(1, -1));
+        return this.tagName === selector;
+    }
+    *descendants() {
+        for (const child of this.children) { yield child; yield* child.descendants(); }
+    }
+    querySelectorAll(selector) {
+        return [...this.descendants()].filter((el) => el.matches(selector));
+    }
+    querySelector(selector) { return this.querySelectorAll(selector)[0] || null; }
+    closest(selector) {
+        for (let el = this; el; el = el.parent) if (el.matches(selector)) return el;
+        return null;
+    }
+}
+global.CSS = { escape: (id) => id };
+const page = new Element(%(page)s);
+global.document = { getElementById: (id) => page.querySelector("#" + id) };
+eval(%(script)s + "; global.selectGraphMetric = selectGraphMetric;");
+const [first, second] = page.querySelectorAll("#canevas");
+selectGraphMetric(second, "quality");
+const legend = (view) => Object.fromEntries(
+    ["gradient-bar", "start-value", "mid-value", "end-value"].map((id) => {
+        const el = view.querySelector("#" + id);
+        return [id, el.getAttribute("data-max") || el.textContent];
+    })
+);
+console.log(JSON.stringify(page.querySelectorAll(".graph-view").map(legend)));
+"""
+
+
+def to_tree(element: ET2.Element) -> list:
+    """Return an element as a [tag, attributes, text, children] tree."""
+    return [
+        element.tag.split("}")[-1],
+        dict(element.attrib),
+        element.text or "",
+        [to_tree(child) for child in element],
+    ]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_metric_selector_updates_the_legend_of_its_graph():
+    views = []
+    for seed in (1, 2):
+        data = make_custom_data(NAMES, seed=seed)
+        data["central"] = {"completion": 10, "quality": 150 * seed}
+        graph = make_sample(data, kind="custom", metrics=True)
+        view = ET2.Element("div", {"class": "graph-view"})
+        view.append(ET2.fromstring(graph.legend_svg()))
+        view.append(ET2.fromstring(graph.graph_svg_text))
+        views.append(to_tree(view))
+    page = ["body", {}, "", views]
+    page_script = PAGE % {
+        "page": json.dumps(page),
+        "script": json.dumps(metric_selector_script()),
+    }
+    result = subprocess.run(
+        ["node"],
+        input=page_script,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True,
+    )
+    first, second = json.loads(result.stdout)
+    # the legend of the first graph still shows its completion scale
+    assert first == {
+        "gradient-bar": "99",
+        "start-value": "0",
+        "mid-value": "49.50",
+        "end-value": "99",
+    }
+    assert second == {
+        "gradient-bar": "300",
+        "start-value": "0",
+        "mid-value": "150",
+        "end-value": "300",
+    }
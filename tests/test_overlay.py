@@ -0,0 +1,109 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from xml.etree import ElementTree as ET2
+from graphs import NAMES, make_custom_data, make_data, make_sample
+
+
+# * helper function mirroring applyGraphOverlay (see overlay_applier_script)
+def apply_overlay(skeleton: str, overlay: dict) -> ET2.Element:
+    """Color a skeleton like applyGraphOverlay does client-side."""
+    root = ET2.fromstring(skeleton)
+    assert root.get("data-layout") == overlay["layout"]
+    for element in root.iter():
+        index = element.get("data-node")
+        if index is None:
+            continue
+        fill = overlay["colors"][overlay["fills"][int(index)]]
+        if element.tag.endswith("radialGradient"):
+            for stop in element:
+                stop.set("stop-color", fill)
+            continue
+        current = element.get("fill")
+        if current and not current.startswith("url("):
+            element.set("fill", fill)
+        if element.get("data-tooltip") is not None:
+            value = overlay["tooltips"][int(index)]
+            element.set(
+                "data-tooltip",
+                json.dumps(value) if isinstance(value, dict) else str(value),
+            )
+    return root
+
+
+# * helper function reading the fill shown for each node of an overlaid skeleton
+def node_fills(root: ET2.Element) -> dict:
+    """Return {node index: fill} of the nodes and piscine gradients of a document."""
+    fills = {}
+    for element in root.iter():
+        index = element.get("data-node")
+        if index is None:
+            continue
+        if element.tag.endswith("radialGradient"):
+            fills[int(index)] = element[0].get("stop-color")
+        elif element.get("fill") and not element.get("fill").startswith("url("):
+            fills[int(index)] = element.get("fill")
+    return fills
+
+
+###############################################################################################
+###############################################################################################
+
+
+@pytest.mark.parametrize(
+    "kind, make",
+    [("classic", make_data), ("custom", make_custom_data)],
+)
+def test_overlay_round_trip(kind, make):
+    options = {"kind": kind}
+    graph = make_sample(make(NAMES, seed=1), **options)
+    other = make_sample(make(NAMES, seed=2), **options)
+    # the skeleton does not depend on the data
+    assert graph.to_skeleton() == other.to_skeleton()
+
+    root = apply_overlay(graph.to_skeleton(), json.loads(other.to_overlay()))
+    frame = other.layout_frame()
+    fills = node_fills(root)
+    assert fills
+    for index, fill in fills.items():
+        assert fill == frame.loc[index, "fill"]
+    tooltips = [
+        element
+        for element in root.iter()
+        if element.get("data-node") is not None and element.get("data-tooltip")
+    ]
+    assert tooltips
+    for element in tooltips:
+        value = other.data.get(element.get("id"), {} if kind == "custom" else 0)
+        expected = json.dumps(value) if kind == "custom" else str(value)
+        assert element.get("data-tooltip") == expected
+
+
+def test_overlay_rejects_other_skeleton():
+    graph = make_sample(make_data(NAMES))
+    overlay = json.loads(make_sample(make_data(NAMES), precision=1).to_overlay())
+    with pytest.raises(AssertionError):
+        apply_overlay(graph.to_skeleton(), overlay)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"kind": "classic"},
+        {"kind": "custom"},
+        {"kind": "custom", "tooltip_mode": "island", "event_mode": "delegated"},
+    ],
+)
+def test_overlay_of_pandas_values(options):
+    if options["kind"] == "custom":
+        data = make_custom_data(NAMES)
+        # DataFrame rows hold NumPy scalars
+        frame = pd.DataFrame.from_dict(data, orient="index")
+        pandas_data = {name: dict(row) for name, row in frame.iterrows()}
+    else:
+        data = make_data(NAMES)
+        pandas_data = dict(pd.Series(data))
+    assert isinstance(pandas_data["p0-0"], (np.generic, dict))
+    overlay = make_sample(pandas_data, **options).to_overlay()
+    assert overlay == make_sample(data, **options).to_overlay()
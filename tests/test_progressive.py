@@ -0,0 +1,25 @@
+import pytest
+from xml.etree import ElementTree as ET2
+from graphs import SVG, make_sample
+
+
+@pytest.mark.parametrize("options", [{}, {"event_mode": "delegated", "precision": 2}])
+def test_progressive_fragments_rebuild_the_document(options):
+    graph = make_sample(**options)
+    progressive = graph.to_progressive()
+    assert set(progressive["fragments"]) == {"middle-circle", "outer-circle"}
+    shell = ET2.fromstring(progressive["shell"])
+    parents = {child: parent for parent in shell.iter() for child in parent}
+    for placeholder in [g for g in shell.iter(f"{SVG}g") if g.get("data-ring-src")]:
+        ring = ET2.fromstring(progressive["fragments"][placeholder.get("id")])
+        parent = parents[placeholder]
+        position = list(parent).index(placeholder)
+        parent.remove(placeholder)
+        parent.insert(position, ring)
+    # the ring loader is the only addition of the shell
+    for script in shell.findall(f"{SVG}script"):
+        if "loadGraphRings" in (script.text or ""):
+            shell.remove(script)
+    assert ET2.canonicalize(ET2.tostring(shell, encoding="unicode")) == (
+        ET2.canonicalize(graph.graph_svg_text)
+    )
@@ -0,0 +1,28 @@
+import gzip
+import re
+from circular_graph.report import GRAPHS_DIRECTORY, build_report
+from graphs import CHECKPOINTS, MANDATORY, PISCINES, make_data, make_graph
+
+
+def test_report_panels_follow_input_order(tmp_path):
+    graph_json, names = make_graph()
+    titles = [f"learner {i}" for i in range(8)]
+    path = build_report(
+        str(tmp_path),
+        graph_json,
+        {title: make_data(names, seed=i) for i, title in enumerate(titles)},
+        PISCINES,
+        CHECKPOINTS,
+        MANDATORY,
+        max_value=100,
+        max_workers=3,
+    )
+    with open(path, encoding="utf-8") as fp:
+        page = fp.read()
+    assert re.findall(r"<figcaption>(.*?)</figcaption>", page) == titles
+    sources = re.findall(r'data-src="([^"]+)"', page)
+    assert len(sources) == len(titles)
+    for source in sources:
+        assert source.startswith(f"{GRAPHS_DIRECTORY}/")
+        svg_text = gzip.decompress((tmp_path / source).read_bytes()).decode()
+        assert svg_text.startswith("<svg")
@@ -0,0 +1,28 @@
+import pytest
+from graphs import canonical, make_sample
+
+
+@pytest.mark.parametrize("restyle", [False, True])
+def test_set_theme_matches_fresh_render(restyle):
+    graph = make_sample(restyle=restyle)
+    graph.graph_svg_text
+    graph.set_theme(neutral="#777777", teal="#00AAAA")
+    fresh = make_sample(restyle=restyle)
+    fresh.COLORS.update(neutral="#777777", teal="#00AAAA")
+    assert graph.graph_svg_text == fresh.graph_svg_text
+
+
+@pytest.mark.parametrize("restyle", [False, True])
+def test_set_gradient_colors_matches_fresh_render(restyle):
+    colors = ("#3B82F6", "#A855F7", "#EF4444")
+    graph = make_sample(restyle=restyle)
+    graph.graph_svg_text
+    graph.set_gradient_colors(*colors)
+    fresh = make_sample(restyle=restyle)
+    fresh.gradient_colors = list(colors)
+    assert canonical(graph.graph_svg_text) == canonical(fresh.graph_svg_text)
+
+
+def test_set_theme_rejects_unknown_color():
+    with pytest.raises(ValueError):
+        make_sample().set_theme(unknown="#000000")
@@ -0,0 +1,140 @@
+import json
+import pytest
+from xml.etree import ElementTree as ET2
+from circular_graph.modular_graph import modular_graph
+from circular_graph.tools.renderer_utils import (
+    SNAPSHOT_ISLAND_ID,
+    TOOLTIP_ISLAND_ID,
+    snapshot_player_script,
+)
+from graphs import (
+    CHECKPOINTS,
+    GRAPH_JSON,
+    MANDATORY,
+    NAMES,
+    PISCINES,
+    make_custom_data,
+    make_data,
+    make_sample,
+)
+
+
+# * helper function building snapshots sharing the color scale of a single graph
+def make_snapshots(kind: str, count: int = 3) -> dict:
+    """Return {timestamp: data} snapshots whose maximum is the same at every time."""
+    snapshots = {}
+    for time in range(count):
+        if kind == "custom":
+            data = make_custom_data(NAMES, seed=time + 1)
+            data["central"] = {"completion": 200, "quality": 200}
+        else:
+            data = make_data(NAMES, seed=time + 1)
+            data["central"] = 200
+        snapshots[f"t{time}"] = data
+    return snapshots
+
+
+# * helper function mirroring showGraphFrame (see snapshot_player_script)
+def show_frame(root: ET2.Element, index: int) -> dict | None:
+    """Apply the frames of a snapshot document up to index, like showGraphFrame.
+
+    Returns:
+        dict | None: Values of the tooltip data island, None without island.
+    """
+    snapshots = json.loads(root.find(f".//*[@id='{SNAPSHOT_ISLAND_ID}']").text)
+    island = root.find(f".//*[@id='{TOOLTIP_ISLAND_ID}']")
+    tooltips = json.loads(island.text) if island is not None else None
+    nodes = {}
+    for element in root.iter():
+        if element.get("data-node") is not None:
+            nodes.setdefault(int(element.get("data-node")), []).append(element)
+    for frame in snapshots["frames"][: index + 1]:
+        fills = frame["fills"]
+        for node, color in zip(fills[::2], fills[1::2]):
+            for element in nodes.get(node, []):
+                if element.tag.endswith("radialGradient"):
+                    for stop in element:
+                        stop.set("stop-color", snapshots["colors"][color])
+                elif not element.get("fill", "").startswith("url("):
+                    element.set("fill", snapshots["colors"][color])
+        for node, value in frame["tooltips"].items():
+            for element in nodes.get(int(node), []):
+                if element.get("project-name") is None:
+                    continue
+                if tooltips is not None:
+                    tooltips[element.get("id")] = value
+                else:
+                    element.set("data-tooltip", value)
+    return tooltips
+
+
+# * helper function reading the fill shown for each node of a document
+def node_fills(root: ET2.Element) -> dict:
+    """Return {node index: fill} of the nodes and piscine gradients of a document."""
+    fills = {}
+    for element in root.iter():
+        index = element.get("data-node")
+        if index is None:
+            continue
+        if element.tag.endswith("radialGradient"):
+            fills[int(index)] = element[0].get("stop-color")
+        elif element.get("fill") and not element.get("fill").startswith("url("):
+            fills[int(index)] = element.get("fill")
+    return fills
+
+
+###############################################################################################
+###############################################################################################
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"kind": "classic"},
+        {"kind": "custom"},
+        {"kind": "custom", "tooltip_mode": "island", "event_mode": "delegated"},
+    ],
+)
+def test_frames_match_fresh_renders(options):
+    snapshots = make_snapshots(options["kind"])
+    graph = modular_graph.from_snapshots(
+        GRAPH_JSON, snapshots, PISCINES, CHECKPOINTS, MANDATORY, **options
+    )
+    root = ET2.fromstring(graph.graph_svg_text)
+    for index, data in enumerate(snapshots.values()):
+        tooltips = show_frame(root, index)
+        fresh = make_sample(data, **options)
+        frame = fresh.layout_frame()
+        fills = node_fills(root)
+        assert fills
+        for node, fill in fills.items():
+            assert fill == frame.loc[node, "fill"]
+        if tooltips is not None:
+            # values of the nodes showing an info card
+            names = {
+                element.get("id")
+                for element in root.iter()
+                if element.get("project-name") is not None
+            }
+            assert names
+            assert {name: tooltips[name] for name in names} == {
+                name: data.get(name, {}) for name in names
+            }
+        else:
+            fresh_root = ET2.fromstring(fresh.graph_svg_text)
+            expected = {
+                element.get("id"): element.get("data-tooltip")
+                for element in fresh_root.iter()
+                if element.get("data-tooltip") is not None
+            }
+            assert expected
+            assert {
+                element.get("id"): element.get("data-tooltip")
+                for element in root.iter()
+                if element.get("data-tooltip") is not None
+            } == expected
+
+
+def test_player_refreshes_the_island_read_by_info_cards():
+    # info cards read the values parsed once (island.tooltips), not the text
+    assert "island.tooltips = tooltips" in snapshot_player_script()
@@ -0,0 +1,34 @@
+import io
+import pytest
+from graphs import make_sample
+
+# Rendering options whose output must not depend on the render target
+OPTIONS = [
+    {},
+    {"event_mode": "delegated"},
+    {"restyle": True},
+    {"css_classes": True},
+    {"precision": 2},
+    {"detail": "compact"},
+    {"detail": "overview"},
+    {"max_nodes": 150},
+    {"kind": "custom", "color_key": "quality"},
+    {"kind": "custom", "tooltip_mode": "island", "event_mode": "delegated"},
+    {"kind": "custom", "metrics": True},
+]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_streamed_output_equals_tree_output(options):
+    graph = make_sample(**options)
+    buffer = io.StringIO()
+    graph.write_svg(buffer)
+    assert buffer.getvalue() == graph.graph_svg_text
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_retain_false_equals_retained_output(options):
+    assert (
+        make_sample(retain=False, **options).to_svg()
+        == make_sample(**options).graph_svg_text
+    )
@@ -0,0 +1,46 @@
+import pytest
+from graphs import NAMES, canonical, make_custom_data, make_data, make_sample
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"restyle": True}, {"event_mode": "delegated", "css_classes": True}],
+)
+@pytest.mark.parametrize(
+    "changes",
+    [
+        # values below the maximum: only these nodes are patched
+        {"p0-0": 12, "p1-3": 0, "piscine-0": 55, "piscine-1": 55},
+        # new maximum: every node is recolored
+        {"p2-1": 250, "piscine-2": 10},
+        # the holder of the maximum decreases
+        "lower-max",
+    ],
+)
+def test_update_data_matches_fresh_render(options, changes):
+    data = make_data(NAMES)
+    if changes == "lower-max":
+        holder = max(data, key=data.get)
+        changes = {holder: 1}
+    graph = make_sample(data, **options)
+    graph.graph_svg_text
+    graph.update_data(changes)
+    fresh = make_sample({**data, **changes}, **options)
+    assert graph.max_value == fresh.max_value
+    assert canonical(graph.graph_svg_text) == canonical(fresh.graph_svg_text)
+
+
+def test_update_data_custom_island_matches_fresh_render():
+    options = {
+        "kind": "custom",
+        "color_key": "quality",
+        "tooltip_mode": "island",
+        "event_mode": "delegated",
+    }
+    data = make_custom_data(NAMES)
+    changes = {"p0-0": {"completion": 3, "quality": 99}}
+    graph = make_sample(data, **options)
+    graph.graph_svg_text
+    graph.update_data(changes)
+    fresh = make_sample({**data, **changes}, **options)
+    assert canonical(graph.graph_svg_text) == canonical(fresh.graph_svg_text)